@@ -4,14 +4,20 @@ Provides efficient storage and querying of Scryfall card data.
 All queries use parameterized statements for SQL injection prevention.
 """
 
-import json
 import logging
 import random
 import re
 import sqlite3
+import threading
+import zlib
+from contextlib import contextmanager
 from decimal import Decimal
+from functools import lru_cache
+from itertools import chain, islice
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
+
+import orjson
 
 from src.query_parser import ParsedQuery
 
@@ -45,6 +51,13 @@ VALID_CURRENCIES = frozenset({
     "usd", "usd_foil", "usd_etched", "eur", "eur_foil", "tix"
 })
 
+# Color symbols in WUBRG order
+ALL_COLORS = ("W", "U", "B", "R", "G")
+
+# WUBRG as bits 0-4 of the colors_mask / color_identity_mask columns
+COLOR_BITS = {color: 1 << i for i, color in enumerate(ALL_COLORS)}
+ALL_COLORS_MASK = (1 << len(ALL_COLORS)) - 1
+
 # Operator mapping for SQL comparisons (: is treated as = for Scryfall compatibility)
 OPERATOR_MAP = {
     "=": "=",
@@ -108,13 +121,296 @@ BLOCK_MAP = {
 }
 
 
-class DecimalEncoder(json.JSONEncoder):
-    """JSON encoder that handles Decimal objects from ijson streaming parser."""
+def _freeze(value: Any) -> Any:
+    """Convert nested filter dicts/lists into a hashable cache key."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return ("[", *(_freeze(v) for v in value))
+    return value
+
+
+def _json_default(obj: Any) -> Any:
+    """orjson fallback serializer for Decimal values from the ijson parser."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _dumps(value: Any) -> str:
+    """Serialize a value to a JSON string for storage in a TEXT column."""
+    return orjson.dumps(value, default=_json_default).decode()
+
+
+# FTS5 trigram tokenizer (SQLite 3.34+) enables index-backed substring LIKE
+_TRIGRAM_SUPPORTED = sqlite3.sqlite_version_info >= (3, 34, 0)
+
+# Maximum distinct filter dicts kept in the per-store conditions cache (LRU)
+CONDITIONS_CACHE_SIZE = 1024
+
+# Maximum cards kept by the per-store id/name lookup cache (LRU). Lookups are
+# heavily skewed towards a few popular cards, which then skip the query,
+# row conversion and JSON decoding.
+CARD_CACHE_SIZE = 4096
+# Card cache lookup sentinel (None is a cached "not found")
+_NOT_CACHED = object()
+
+# Prepared statements kept per connection. Filter literals are always bound
+# as parameters, so each filter shape maps to one SQL text and one plan.
+STATEMENT_CACHE_SIZE = 256
+
+# Bump whenever _create_tables changes the schema (columns, indexes, FTS, triggers)
+SCHEMA_VERSION = 11
+
+# Indexes a bulk import can drop and rebuild afterwards. Unique indexes
+# (including the primary key's autoindex, which has no SQL) back the upsert.
+SECONDARY_INDEXES_SQL = """
+    SELECT name, sql FROM sqlite_master
+    WHERE type = 'index' AND sql IS NOT NULL AND sql NOT LIKE 'CREATE UNIQUE%'
+"""
+
+# Upper bound for memory-mapped I/O (1 GiB covers the largest bulk data type)
+MMAP_SIZE = 1024 * 1024 * 1024
+
+# Page cache per connection in KiB (passed negated to PRAGMA cache_size)
+CACHE_SIZE_KIB = 64 * 1024
+# Page cache while a bulk_insert_transaction is open, so index and FTS pages
+# touched by a whole import stay in memory until the single commit
+BULK_CACHE_SIZE_KIB = 256 * 1024
+
+# STRICT tables (SQLite 3.37+) enforce declared column types on insert
+_STRICT_TABLE = " STRICT" if sqlite3.sqlite_version_info >= (3, 37, 0) else ""
+
+# Typed columns derived from JSON/text at write time, so year and price filters
+# compare plain values (and can use an index) instead of parsing every row.
+# Name -> (SQL type, expression); price columns are named price_<currency>.
+GENERATED_COLUMNS = {
+    "released_year": ("INTEGER", "CAST(substr(released_at, 1, 4) AS INTEGER)"),
+    # Numeric views of text stats; CAST keeps SQLite's leading-digits parse
+    # ("1+*" -> 1, "*" or "X" -> 0) that comparisons have always used
+    **{
+        f"{column}_num": ("INTEGER", f"CAST({column} AS INTEGER)")
+        for column in ("power", "toughness", "loyalty", "collector_number")
+    },
+    # WUBRG bitmasks of the JSON color arrays, so color filters are integer
+    # IN lists over an index instead of a LIKE scan per color
+    **{
+        f"{column}_mask": (
+            "INTEGER",
+            " | ".join(
+                f"((instr({column}, '\"{color}\"') > 0) << {bit.bit_length() - 1})"
+                for color, bit in COLOR_BITS.items()
+            ),
+        )
+        for column in ("colors", "color_identity")
+    },
+    **{
+        f"price_{currency}": ("REAL", f"CAST(json_extract(prices, '$.{currency}') AS REAL)")
+        for currency in sorted(VALID_CURRENCIES)
+    },
+}
+
+# Columns indexed in cards_fts that can serve LIKE filters via the trigram index
+FTS_COLUMNS = frozenset({"name", "oracle_text", "type_line"})
+
+# Condition for filters that can never match (unknown format/block, or
+# contradictory pairs like set:x -set:x); queries using it skip SQLite entirely
+IMPOSSIBLE_CONDITION = "1=0"
+
+# Exact-match filters whose positive and negated forms contradict each other
+# when given the same value
+EXCLUSIVE_FILTERS = ("set", "rarity", "layout", "watermark")
+
+# Relative per-row cost of a condition, matched by SQL fragment (first match
+# wins). SQLite evaluates the residual WHERE terms left to right, so cheap,
+# selective checks go first and the substring matching only runs on rows
+# that survive them.
+CONDITION_COSTS = (
+    ("(SELECT", 2),  # keyword and FTS subqueries resolve to rowid/id lookups
+    (" LIKE ", 5),
+    (" = ?", 0),
+    (" IN (", 0),
+)
+DEFAULT_CONDITION_COST = 1
+
+
+def _comparison(column: str, operator: str, negated: bool = False) -> str:
+    """Build a parameterized comparison condition for a filter operator.
+
+    Negated comparisons are the logical complement, so rows where the column
+    is NULL match them (as with the other negated filters). The operator is
+    flipped rather than wrapped in NOT so the comparison stays indexable.
+    """
+    if negated:
+        return f"({column} IS NULL OR {column} {INVERTED_OPERATOR_MAP.get(operator, '!=')} ?)"
+    return f"{column} {OPERATOR_MAP.get(operator, '=')} ?"
+
+
+def _color_mask(colors: list[str]) -> int:
+    """Convert a list of WUBRG letters to a color bitmask."""
+    mask = 0
+    for color in colors:
+        mask |= COLOR_BITS.get(color, 0)
+    return mask
+
+
+def _condition_cost(condition: str) -> int:
+    """Estimate the relative evaluation cost of a SQL condition."""
+    for fragment, cost in CONDITION_COSTS:
+        if fragment in condition:
+            return cost
+    return DEFAULT_CONDITION_COST
+
+
+def _order_conditions(
+    conditions: list[str], params: list[Any]
+) -> tuple[list[str], list[Any]]:
+    """Sort conditions cheapest first, keeping each one's bound params with it.
+
+    Params are assigned back to conditions by counting placeholders, which
+    holds because literal values are always bound rather than inlined.
+    """
+    groups = []
+    pos = 0
+    for condition in conditions:
+        count = condition.count("?")
+        groups.append((_condition_cost(condition), condition, params[pos : pos + count]))
+        pos += count
+    groups.sort(key=lambda group: group[0])
+
+    ordered_params: list[Any] = []
+    for _, _, group_params in groups:
+        ordered_params.extend(group_params)
+    return [condition for _, condition, _ in groups], ordered_params
+
+
+def _compress_raw(card: dict[str, Any]) -> bytes:
+    """Serialize card JSON to zlib-compressed JSON for the raw_data column."""
+    return zlib.compress(orjson.dumps(card, default=_json_default), RAW_DATA_COMPRESSION_LEVEL)
+
+
+def _decompress_raw(value: bytes | str | None) -> dict[str, Any] | None:
+    """Decode a raw_data value (compressed BLOB, or JSON text from older databases)."""
+    if value is None:
+        return None
+    if isinstance(value, bytes):
+        value = zlib.decompress(value)
+    return orjson.loads(value)
+
+
+# Columns returned to callers. raw_data (a zlib-compressed BLOB holding only
+# the card fields not stored in columns, see _raw_extras) is never part of the
+# output, so it is left out of the SELECT. Read it back with get_raw_card /
+# _decompress_raw; json_extract can't see inside the compressed BLOB.
+CARD_COLUMNS = (
+    "id", "oracle_id", "name", "mana_cost", "cmc", "type_line", "oracle_text",
+    "power", "toughness", "colors", "color_identity", "keywords", "set_code",
+    "set_name", "rarity", "artist", "released_at", "loyalty", "flavor_text",
+    "collector_number", "watermark", "produced_mana", "layout", "produces_tokens",
+    "image_uris", "legalities", "prices",
+)
+CARD_COLUMNS_SQL = ", ".join(CARD_COLUMNS)
+
+# Fixed statements for unfiltered queries, built once rather than per call
+SELECT_ALL_SQL = f"SELECT {CARD_COLUMNS_SQL} FROM cards LIMIT ? OFFSET ?"
+COUNT_ALL_SQL = "SELECT COUNT(*) FROM cards"
+MAX_ROWID_SQL = "SELECT MAX(rowid) FROM cards"
+# Single-card lookups by column (see CardStore._get_card_cached)
+CARD_LOOKUP_SQL = {
+    column: f"SELECT {CARD_COLUMNS_SQL} FROM cards WHERE {column} = ?"
+    for column in ("id", "name")
+}
+
+
+def _projection_sql(columns: list[str] | None) -> str:
+    """Build the SELECT column list for an optional caller-chosen projection.
+
+    Accepts output names ("set") as well as column names ("set_code").
+
+    Raises:
+        ValueError: If a column is not one of CARD_COLUMNS
+    """
+    if columns is None:
+        return CARD_COLUMNS_SQL
+    return _validated_projection_sql(tuple(columns))
+
+
+@lru_cache(maxsize=64)
+def _validated_projection_sql(columns: tuple[str, ...]) -> str:
+    """Validate and join a projection (see _projection_sql).
+
+    Memoized because callers tend to repeat the same projection; returning the
+    same SQL text also keeps hits in the connection's statement cache.
+    Invalid projections raise on every call since lru_cache skips errors.
+    """
+    selected = []
+    for column in columns:
+        column = "set_code" if column == "set" else column
+        if column not in CARD_COLUMNS:
+            raise ValueError(f"Unknown card column: {column}")
+        selected.append(column)
+    if not selected:
+        raise ValueError("At least one column must be selected")
+    return ", ".join(selected)
+
+
+# zlib level for raw_data: Scryfall JSON is highly repetitive, so even the
+# fastest level shrinks it ~4x, and raw_data dominates the database size
+RAW_DATA_COMPRESSION_LEVEL = 1
+
+# Parameters per card row in the insert statement (see _card_to_params)
+INSERT_COLUMN_COUNT = 28
+
+# Cards per multi-row INSERT in insert_cards. One statement per batch runs a
+# single VDBE program instead of one per row, roughly halving bulk load time;
+# capped further by the connection's bound-variable limit.
+INSERT_BATCH_ROWS = 100
+
+# Columns stored as JSON text that are decoded when rows are returned
+JSON_COLUMNS = (
+    "colors", "color_identity", "keywords", "produced_mana",
+    "produces_tokens", "image_uris", "legalities", "prices",
+)
+
+# Scryfall keys whose column holds an exact copy of the card's value (no
+# card_faces fallback or other derivation). raw_data leaves these out when
+# the value is non-empty and get_raw_card reads them back from the row, so
+# legalities, image_uris etc. are not stored twice. Key -> column.
+RAW_COLUMN_KEYS = {
+    "id": "id",
+    "oracle_id": "oracle_id",
+    "name": "name",
+    "cmc": "cmc",
+    "color_identity": "color_identity",
+    "keywords": "keywords",
+    "set": "set_code",
+    "set_name": "set_name",
+    "rarity": "rarity",
+    "artist": "artist",
+    "released_at": "released_at",
+    "collector_number": "collector_number",
+    "watermark": "watermark",
+    "produced_mana": "produced_mana",
+    "layout": "layout",
+    "image_uris": "image_uris",
+    "legalities": "legalities",
+    "prices": "prices",
+}
+RAW_CARD_SQL = f"SELECT raw_data, {', '.join(RAW_COLUMN_KEYS.values())} FROM cards WHERE id = ?"
+
+
+def _raw_extras(card: dict[str, Any]) -> dict[str, Any]:
+    """Return the part of a card that raw_data has to store (see RAW_COLUMN_KEYS).
 
-    def default(self, obj: Any) -> Any:
-        if isinstance(obj, Decimal):
-            return float(obj)
-        return super().default(obj)
+    Empty values stay in raw_data: an empty column can't tell an absent key
+    from an empty one.
+    """
+    # Copy-then-delete only visits the mapped keys, not all ~80 keys of a card
+    extras = card.copy()
+    for key in RAW_COLUMN_KEYS:
+        if extras.get(key):
+            del extras[key]
+    return extras
 
 
 # Layouts that store data in card_faces instead of at top level
@@ -193,23 +489,149 @@ def _extract_from_card_faces(card: dict[str, Any]) -> dict[str, Any]:
 class CardStore:
     """SQLite-based card storage with FTS5 text search."""
 
-    def __init__(self, db_path: Path):
+    def __init__(self, db_path: Path, readonly: bool = False):
         """Initialize card store.
 
         Args:
             db_path: Path to SQLite database file
+            readonly: Open an existing database read-only (see open_readonly)
         """
         self.db_path = db_path
-        self._conn = sqlite3.connect(db_path)
-        self._conn.row_factory = sqlite3.Row
-        # Enable WAL mode for better concurrent read performance during refresh
-        self._conn.execute("PRAGMA journal_mode=WAL")
-        self._create_tables()
+        self.readonly = readonly
+        # Read-only stores open one connection per thread on demand (see _conn)
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._writer = None if readonly else self._connect()
+        # Set while bulk_insert_transaction holds the write transaction open
+        self._bulk = False
+        if readonly:
+            self._check_schema_version()
+            cursor = self._conn.execute("SELECT sql FROM sqlite_master WHERE name = 'cards_fts'")
+            row = cursor.fetchone()
+            self._fts_trigram = bool(row) and "trigram" in row[0]
+        else:
+            self._create_tables()
+        # Memoized SQL conditions keyed by frozen filters (see _build_conditions_for_filters)
+        self._conditions_cache: dict[Any, tuple[tuple[str, ...], tuple[Any, ...]]] = {}
+        # Card rows (or None for misses) keyed by (lookup column, value); see _get_card_cached
+        self._card_cache: dict[tuple[str, str], sqlite3.Row | None] = {}
+        # Bumped on every card cache clear, so a lookup that raced a clear
+        # doesn't store a card read before it
+        self._card_cache_generation = 0
+        # Guards both caches: read-only stores serve several threads at once
+        self._cache_lock = threading.Lock()
+        # Row count at the last ANALYZE, used to refresh planner statistics
+        self._analyzed_count = self._get_analyzed_count()
+
+    @classmethod
+    def open_readonly(cls, db_path: Path) -> "CardStore":
+        """Open an existing database for queries only.
+
+        Skips schema creation/migration and opens the file with mode=ro, so
+        any number of readers can query in parallel without taking write
+        locks. Insert methods raise sqlite3.OperationalError.
+
+        The database must already be at the current SCHEMA_VERSION: open it
+        writable once (CardStore(db_path)) to migrate an older one.
+
+        Args:
+            db_path: Path to an existing SQLite database file
+
+        Returns:
+            Read-only CardStore
+
+        Raises:
+            sqlite3.OperationalError: If the database is missing or was
+                written by an older (or newer) schema version
+        """
+        return cls(db_path, readonly=True)
+
+    def _check_schema_version(self) -> None:
+        """Raise unless a read-only store's database has the current schema.
+
+        Read-only stores can't migrate, and on an older schema most filters
+        would fail later with errors like "no such column: colors_mask".
+        """
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self.close()
+            raise sqlite3.OperationalError(
+                f"{self.db_path} has schema version {version}, expected "
+                f"{SCHEMA_VERSION}; open it writable first to migrate it"
+            )
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """Connection for the calling thread.
+
+        A writable store has a single connection. A read-only store gives each
+        thread its own, so threads query in parallel (sqlite3 releases the GIL
+        while a statement runs) instead of queueing on one shared connection;
+        WAL lets all of them read while another process writes.
+        """
+        if self._writer is not None:
+            return self._writer
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open and configure a new connection to the database."""
+        if self.readonly:
+            # mode=ro never takes write locks or touches the schema. Any thread
+            # may close it (see close), so the same-thread check is off.
+            conn = sqlite3.connect(
+                f"{Path(self.db_path).resolve().as_uri()}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+                cached_statements=STATEMENT_CACHE_SIZE,
+            )
+        else:
+            conn = sqlite3.connect(self.db_path, cached_statements=STATEMENT_CACHE_SIZE)
+        conn.row_factory = sqlite3.Row
+        if not self.readonly:
+            # Larger pages suit memory-mapped reads; only takes effect on a new,
+            # empty database and must be set before switching to WAL
+            conn.execute("PRAGMA page_size=8192")
+            # Enable WAL mode for better concurrent read performance during refresh
+            conn.execute("PRAGMA journal_mode=WAL")
+            # WAL stays consistent with NORMAL; only the last commits before a
+            # power loss can roll back, and the data is re-importable anyway
+            conn.execute("PRAGMA synchronous=NORMAL")
+        else:
+            # Reject writes in SQLite itself too, not only at the file level
+            conn.execute("PRAGMA query_only=ON")
+        # Serve page reads straight from the OS page cache instead of copying
+        # them into SQLite's heap (the oracle_cards database is ~300 MB)
+        conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        # Keep hot index/table pages cached, and build sorter/temp b-trees
+        # (ORDER BY, IN-lists, GROUP BY) in memory rather than temp files
+        conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KIB}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
 
     def _create_tables(self) -> None:
-        """Create database tables and indexes."""
+        """Create database tables and indexes.
+
+        Databases stamped with the current SCHEMA_VERSION (via PRAGMA
+        user_version) skip the migration and DDL work entirely, so opening
+        an up-to-date store costs two metadata lookups.
+        """
         cursor = self._conn.cursor()
 
+        if cursor.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+            cursor.execute("SELECT sql FROM sqlite_master WHERE name = 'cards_fts'")
+            row = cursor.fetchone()
+            self._fts_trigram = bool(row) and "trigram" in row[0]
+            # Still rebuild if the FTS table predates trigram support in this SQLite
+            if self._fts_trigram or not _TRIGRAM_SUPPORTED:
+                return
+
         # Migration: Add columns if table exists but columns don't
         cursor.execute("""
             SELECT name FROM sqlite_master
@@ -252,16 +674,33 @@ class CardStore:
                             SET {col_name} = json_extract(raw_data, '{json_path}')
                             WHERE {col_name} IS NULL
                         """)
+
+            # Generated columns; ALTER TABLE can only add VIRTUAL ones (computed
+            # on read, but still indexable), new tables get STORED columns
+            cursor.execute("PRAGMA table_xinfo(cards)")
+            all_columns = {row[1] for row in cursor.fetchall()}
+            for col_name, (col_type, expr) in GENERATED_COLUMNS.items():
+                if col_name not in all_columns:
+                    cursor.execute(
+                        f"ALTER TABLE cards ADD COLUMN {col_name} {col_type} "
+                        f"GENERATED ALWAYS AS ({expr}) VIRTUAL"
+                    )
             self._conn.commit()
 
-        # Main cards table
-        cursor.execute("""
+        generated_columns_sql = "".join(
+            f",\n                {col_name} {col_type} GENERATED ALWAYS AS ({expr}) STORED"
+            for col_name, (col_type, expr) in GENERATED_COLUMNS.items()
+        )
+
+        # Main cards table. Kept as a rowid table (not WITHOUT ROWID) because
+        # cards_fts is an external-content table keyed on the integer rowid.
+        cursor.execute(f"""
             CREATE TABLE IF NOT EXISTS cards (
                 id TEXT PRIMARY KEY,
                 oracle_id TEXT,
                 name TEXT NOT NULL,
                 mana_cost TEXT,
-                cmc REAL,
+                cmc REAL,  -- Whole values are stored on disk as small integers; 0.5 stays exact
                 type_line TEXT,
                 oracle_text TEXT,
                 power TEXT,
@@ -284,66 +723,260 @@ class CardStore:
                 image_uris TEXT,  -- JSON object
                 legalities TEXT,  -- JSON object
                 prices TEXT,  -- JSON object
-                raw_data TEXT  -- Full JSON for any other fields
-            )
+                raw_data BLOB  -- Full JSON for any other fields (zlib-compressed)
+                {generated_columns_sql}
+            ){_STRICT_TABLE}
         """)
 
         # Create indexes for common queries
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_name ON cards(name)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_name_lower ON cards(LOWER(name))")
+        # No query filters on LOWER(name) (partial names go through cards_fts),
+        # so older schemas' idx_name_lower only cost space and insert time
+        cursor.execute("DROP INDEX IF EXISTS idx_name_lower")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_cmc ON cards(cmc)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_set ON cards(set_code)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_rarity ON cards(rarity)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_artist ON cards(artist)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_released_at ON cards(released_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_released_year ON cards(released_year)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_price_usd ON cards(price_usd)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_price_eur ON cards(price_eur)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_price_tix ON cards(price_tix)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_power_num ON cards(power_num)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_toughness_num ON cards(toughness_num)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_loyalty_num ON cards(loyalty_num)")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_collector_number_num ON cards(collector_number_num)"
+        )
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_oracle_id ON cards(oracle_id)")
-        # Color indexes help with exact matches (e.g., colorless = '[]')
-        # Note: LIKE '%"U"%' queries can't use B-tree indexes efficiently
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_colors ON cards(colors)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_color_identity ON cards(color_identity)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_layout ON cards(layout)")
+        # Color filters compare the bitmask columns; older schemas indexed the
+        # JSON text, which only ever served the colorless '[]' lookup
+        cursor.execute("DROP INDEX IF EXISTS idx_colors")
+        cursor.execute("DROP INDEX IF EXISTS idx_color_identity")
+        # Color is usually paired with a mana value (c:r cmc<=2, id<=wu cmc>=5):
+        # cmc second lets each mask in the IN list be a range seek, and the
+        # mask prefix still serves color-only filters
+        for index in ("idx_colors_mask", "idx_color_identity_mask"):
+            cursor.execute(f"DROP INDEX IF EXISTS {index}")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_colors_mask_cmc ON cards(colors_mask, cmc)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_color_identity_mask_cmc "
+            "ON cards(color_identity_mask, cmc)"
+        )
+        # Composite indexes for common filter pairs (e.g., set:neo cmc<=2, r:mythic cmc>=5).
+        # NOCASE matches the case-insensitive set/rarity/layout comparisons, so
+        # those filters are index seeks; they also cover set- or rarity-only
+        # lookups. Older schemas had BINARY versions of these plus single-column
+        # indexes.
+        for index in ("idx_set", "idx_rarity", "idx_set_cmc", "idx_rarity_cmc", "idx_layout"):
+            cursor.execute(f"DROP INDEX IF EXISTS {index}")
+        cursor.execute("CREATE INDEX idx_set_cmc ON cards(set_code COLLATE NOCASE, cmc)")
+        cursor.execute("CREATE INDEX idx_rarity_cmc ON cards(rarity COLLATE NOCASE, cmc)")
+        cursor.execute("CREATE INDEX idx_layout ON cards(layout COLLATE NOCASE)")
+        # Covers set+rarity searches (e.g., s:neo r:mythic) and their counts
+        # without visiting the wide cards rows; collector number orders a set
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_set_rarity_cn ON cards("
+            "set_code COLLATE NOCASE, rarity COLLATE NOCASE, collector_number_num)"
+        )
 
-        # FTS5 virtual table for oracle text search
-        cursor.execute("""
-            CREATE VIRTUAL TABLE IF NOT EXISTS cards_fts USING fts5(
-                id,
-                name,
-                oracle_text,
-                type_line,
-                content='cards',
-                content_rowid='rowid'
-            )
-        """)
+        # FTS5 virtual table for text search. The trigram tokenizer lets the
+        # index answer substring LIKE '%...%' patterns, so partial name, type
+        # and oracle text filters don't need a full table scan.
+        self._create_fts_table(cursor)
+
+        # Keywords normalized into one row per (card, keyword) so keyword filters
+        # are index seeks instead of LIKE scans over the JSON array column
+        self._create_keywords_table(cursor)
+
+        # Same for format legalities, so f:/banned: filters avoid json_extract
+        self._create_legalities_table(cursor)
 
         # Triggers to keep FTS in sync
         cursor.execute("""
             CREATE TRIGGER IF NOT EXISTS cards_ai AFTER INSERT ON cards BEGIN
-                INSERT INTO cards_fts(rowid, id, name, oracle_text, type_line)
-                VALUES (NEW.rowid, NEW.id, NEW.name, NEW.oracle_text, NEW.type_line);
+                INSERT INTO cards_fts(rowid, name, oracle_text, type_line)
+                VALUES (NEW.rowid, NEW.name, NEW.oracle_text, NEW.type_line);
             END
         """)
 
         cursor.execute("""
             CREATE TRIGGER IF NOT EXISTS cards_ad AFTER DELETE ON cards BEGIN
-                INSERT INTO cards_fts(cards_fts, rowid, id, name, oracle_text, type_line)
-                VALUES ('delete', OLD.rowid, OLD.id, OLD.name, OLD.oracle_text, OLD.type_line);
+                INSERT INTO cards_fts(cards_fts, rowid, name, oracle_text, type_line)
+                VALUES ('delete', OLD.rowid, OLD.name, OLD.oracle_text, OLD.type_line);
             END
         """)
 
         cursor.execute("""
             CREATE TRIGGER IF NOT EXISTS cards_au AFTER UPDATE ON cards BEGIN
-                INSERT INTO cards_fts(cards_fts, rowid, id, name, oracle_text, type_line)
-                VALUES ('delete', OLD.rowid, OLD.id, OLD.name, OLD.oracle_text, OLD.type_line);
-                INSERT INTO cards_fts(rowid, id, name, oracle_text, type_line)
-                VALUES (NEW.rowid, NEW.id, NEW.name, NEW.oracle_text, NEW.type_line);
+                INSERT INTO cards_fts(cards_fts, rowid, name, oracle_text, type_line)
+                VALUES ('delete', OLD.rowid, OLD.name, OLD.oracle_text, OLD.type_line);
+                INSERT INTO cards_fts(rowid, name, oracle_text, type_line)
+                VALUES (NEW.rowid, NEW.name, NEW.oracle_text, NEW.type_line);
             END
         """)
 
+        # PRAGMA doesn't accept bound parameters; SCHEMA_VERSION is a module constant
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
         self._conn.commit()
 
+    def _create_keywords_table(self, cursor: sqlite3.Cursor) -> None:
+        """Create the card_keywords table and the triggers that keep it in sync.
+
+        Existing databases are backfilled from the keywords JSON column the
+        first time the table is created.
+
+        Args:
+            cursor: Cursor on the store connection
+        """
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'card_keywords'")
+        exists = cursor.fetchone() is not None
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS card_keywords (
+                card_id TEXT NOT NULL,
+                keyword TEXT NOT NULL COLLATE NOCASE,
+                PRIMARY KEY (card_id, keyword)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_card_keywords_keyword ON card_keywords(keyword, card_id)"
+        )
+
+        if not exists:
+            cursor.execute("""
+                INSERT OR IGNORE INTO card_keywords (card_id, keyword)
+                SELECT cards.id, kw.value
+                FROM cards, json_each(cards.keywords) AS kw
+                WHERE json_valid(cards.keywords)
+            """)
+
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS cards_kw_ai AFTER INSERT ON cards BEGIN
+                INSERT OR IGNORE INTO card_keywords (card_id, keyword)
+                SELECT NEW.id, value FROM json_each(NEW.keywords);
+            END
+        """)
+
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS cards_kw_ad AFTER DELETE ON cards BEGIN
+                DELETE FROM card_keywords WHERE card_id = OLD.id;
+            END
+        """)
+
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS cards_kw_au AFTER UPDATE OF id, keywords ON cards BEGIN
+                DELETE FROM card_keywords WHERE card_id = OLD.id;
+                INSERT OR IGNORE INTO card_keywords (card_id, keyword)
+                SELECT NEW.id, value FROM json_each(NEW.keywords);
+            END
+        """)
+
+    def _create_legalities_table(self, cursor: sqlite3.Cursor) -> None:
+        """Create the card_legalities table and the triggers that keep it in sync.
+
+        Only formats where a card is legal, restricted or banned get a row;
+        "not_legal" is implied by absence. Existing databases are backfilled
+        from the legalities JSON column the first time the table is created.
+
+        Args:
+            cursor: Cursor on the store connection
+        """
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'card_legalities'")
+        exists = cursor.fetchone() is not None
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS card_legalities (
+                card_id TEXT NOT NULL,
+                format TEXT NOT NULL,
+                status TEXT NOT NULL,
+                PRIMARY KEY (card_id, format)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_card_legalities_format "
+            "ON card_legalities(format, status, card_id)"
+        )
+
+        if not exists:
+            cursor.execute("""
+                INSERT OR IGNORE INTO card_legalities (card_id, format, status)
+                SELECT cards.id, lg.key, lg.value
+                FROM cards, json_each(cards.legalities) AS lg
+                WHERE json_valid(cards.legalities) AND lg.value != 'not_legal'
+            """)
+
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS cards_lg_ai AFTER INSERT ON cards BEGIN
+                INSERT OR IGNORE INTO card_legalities (card_id, format, status)
+                SELECT NEW.id, key, value FROM json_each(NEW.legalities)
+                WHERE value != 'not_legal';
+            END
+        """)
+
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS cards_lg_ad AFTER DELETE ON cards BEGIN
+                DELETE FROM card_legalities WHERE card_id = OLD.id;
+            END
+        """)
+
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS cards_lg_au AFTER UPDATE OF id, legalities ON cards BEGIN
+                DELETE FROM card_legalities WHERE card_id = OLD.id;
+                INSERT OR IGNORE INTO card_legalities (card_id, format, status)
+                SELECT NEW.id, key, value FROM json_each(NEW.legalities)
+                WHERE value != 'not_legal';
+            END
+        """)
+
+    def _create_fts_table(self, cursor: sqlite3.Cursor) -> None:
+        """Create the cards_fts table, rebuilding it if it has an old layout.
+
+        Falls back to the default tokenizer when SQLite is too old for
+        trigram (< 3.34); text filters then use plain LIKE scans.
+
+        Args:
+            cursor: Cursor on the store connection
+        """
+        cursor.execute("SELECT sql FROM sqlite_master WHERE name = 'cards_fts'")
+        row = cursor.fetchone()
+        if row:
+            cursor.execute("PRAGMA table_info(cards_fts)")
+            fts_columns = {info[1] for info in cursor.fetchall()}
+            # Older databases used the unicode61 tokenizer and also indexed the
+            # card id (never searched, and ~34 trigrams per UUID) - recreate
+            if ("trigram" not in row[0] and _TRIGRAM_SUPPORTED) or "id" in fts_columns:
+                cursor.execute("DROP TABLE cards_fts")
+                for trigger in ("cards_ai", "cards_ad", "cards_au"):
+                    cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+                row = None
+
+        # No prefix= option: trigram tokens never answer 'ab*' prefix queries,
+        # and every text filter goes through LIKE, which prefix indexes don't
+        # serve - they would only add posting lists to maintain on ingest
+        if row is None:
+            tokenizer = ", tokenize='trigram'" if _TRIGRAM_SUPPORTED else ""
+            cursor.execute(f"""
+                CREATE VIRTUAL TABLE cards_fts USING fts5(
+                    name,
+                    oracle_text,
+                    type_line,
+                    content='cards',
+                    content_rowid='rowid'{tokenizer}
+                )
+            """)
+            cursor.execute("INSERT INTO cards_fts(cards_fts) VALUES('rebuild')")
+
+        self._fts_trigram = _TRIGRAM_SUPPORTED
+
     def close(self) -> None:
-        """Close database connection."""
-        self._conn.close()
+        """Close all database connections."""
+        if self._writer is not None:
+            self._writer.close()
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
 
     def __enter__(self) -> "CardStore":
         """Enter context manager."""
@@ -364,21 +997,21 @@ class CardStore:
 
     def get_card_count(self) -> int:
         """Get total number of cards in database."""
-        cursor = self._conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM cards")
-        return cursor.fetchone()[0]
+        return self._conn.execute(COUNT_ALL_SQL).fetchone()[0]
 
+    # One "(?, ...)" group per card; the template's {values} takes one or more
+    _INSERT_ROW_SQL = f"({', '.join('?' * INSERT_COLUMN_COUNT)})"
     # SQL for inserting/updating cards using UPSERT pattern
     # Uses ON CONFLICT DO UPDATE to preserve rowid, ensuring FTS5 triggers work correctly.
     # INSERT OR REPLACE would delete+insert, potentially changing rowid and causing
     # FTS index to become stale (delete trigger uses old rowid that no longer exists).
-    _INSERT_SQL = """
+    _INSERT_SQL_TEMPLATE = """
         INSERT INTO cards (
             id, oracle_id, name, mana_cost, cmc, type_line, oracle_text,
             power, toughness, colors, color_identity, keywords, set_code, set_name,
             rarity, artist, released_at, loyalty, flavor_text, collector_number,
             watermark, produced_mana, layout, produces_tokens, image_uris, legalities, prices, raw_data
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ) VALUES {values}
         ON CONFLICT(id) DO UPDATE SET
             oracle_id = excluded.oracle_id,
             name = excluded.name,
@@ -408,6 +1041,7 @@ class CardStore:
             prices = excluded.prices,
             raw_data = excluded.raw_data
     """
+    _INSERT_SQL = _INSERT_SQL_TEMPLATE.format(values=_INSERT_ROW_SQL)
 
     def _card_to_params(self, card: dict[str, Any]) -> tuple:
         """Extract card data as SQL parameters.
@@ -421,110 +1055,305 @@ class CardStore:
         Returns:
             Tuple of parameters for SQL insert
         """
+        # Direct calls through one bound get are the cheapest per-column access:
+        # operator.itemgetter raises on the many optional keys, and unpacking
+        # map(get, keys) groups into the tuple measured ~2.5x slower
+        get = card.get
+
         # Convert cmc from Decimal to float if needed (ijson returns Decimal)
-        cmc = card.get("cmc")
+        cmc = get("cmc")
         if isinstance(cmc, Decimal):
             cmc = float(cmc)
 
-        # For double-faced cards, extract data from card_faces when top-level is null
-        layout = card.get("layout", "")
-        face_data: dict[str, Any] = {}
-        if layout in DOUBLE_FACED_LAYOUTS and card.get("card_faces"):
+        mana_cost = get("mana_cost")
+        type_line = get("type_line")
+        oracle_text = get("oracle_text")
+        power = get("power")
+        toughness = get("toughness")
+        loyalty = get("loyalty")
+        flavor_text = get("flavor_text")
+        colors = get("colors")
+
+        # For double-faced cards, fall back to data from card_faces when top-level is null.
+        # Single-faced cards (the vast majority) skip this block entirely.
+        layout = get("layout", "")
+        if layout in DOUBLE_FACED_LAYOUTS and get("card_faces"):
             face_data = _extract_from_card_faces(card)
-
-        # Helper to get value from top-level or fall back to extracted face data
-        def get_field(field: str) -> Any:
-            value = card.get(field)
-            if value is None and field in face_data:
-                return face_data[field]
-            return value
-
-        # For colors, use face_data only if top-level colors is empty/missing
-        # (some DFCs have colors at top level too)
-        colors = card.get("colors")
-        if not colors and "colors" in face_data:
-            colors = face_data["colors"]
-        elif colors is None:
+            if mana_cost is None:
+                mana_cost = face_data.get("mana_cost")
+            if type_line is None:
+                type_line = face_data.get("type_line")
+            if oracle_text is None:
+                oracle_text = face_data.get("oracle_text")
+            if power is None:
+                power = face_data.get("power")
+            if toughness is None:
+                toughness = face_data.get("toughness")
+            if loyalty is None:
+                loyalty = face_data.get("loyalty")
+            if flavor_text is None:
+                flavor_text = face_data.get("flavor_text")
+            # For colors, use face data only if top-level colors is empty/missing
+            # (some DFCs have colors at top level too)
+            if not colors and "colors" in face_data:
+                colors = face_data["colors"]
+
+        if colors is None:
             colors = []
 
         # Extract token names from all_parts (for token-creating cards)
-        all_parts = card.get("all_parts", [])
-        token_names = [part["name"] for part in all_parts if part.get("component") == "token"]
-        produces_tokens = json.dumps(token_names, cls=DecimalEncoder) if token_names else None
+        all_parts = get("all_parts")
+        produces_tokens = None
+        if all_parts:
+            token_names = [part["name"] for part in all_parts if part.get("component") == "token"]
+            if token_names:
+                produces_tokens = _dumps(token_names)
 
         return (
-            card.get("id"),
-            card.get("oracle_id"),
-            card.get("name"),
-            get_field("mana_cost"),
+            get("id"),
+            get("oracle_id"),
+            get("name"),
+            mana_cost,
             cmc,
-            get_field("type_line"),
-            get_field("oracle_text"),
-            get_field("power"),
-            get_field("toughness"),
-            json.dumps(colors, cls=DecimalEncoder),
-            json.dumps(card.get("color_identity", []), cls=DecimalEncoder),
-            json.dumps(card.get("keywords", []), cls=DecimalEncoder),
-            card.get("set"),
-            card.get("set_name"),
-            card.get("rarity"),
-            card.get("artist"),
-            card.get("released_at"),
-            get_field("loyalty"),
-            get_field("flavor_text"),
-            card.get("collector_number"),
-            card.get("watermark"),
-            json.dumps(card.get("produced_mana", []), cls=DecimalEncoder),
+            type_line,
+            oracle_text,
+            power,
+            toughness,
+            _dumps(colors),
+            _dumps(get("color_identity", [])),
+            _dumps(get("keywords", [])),
+            get("set"),
+            get("set_name"),
+            get("rarity"),
+            get("artist"),
+            get("released_at"),
+            loyalty,
+            flavor_text,
+            get("collector_number"),
+            get("watermark"),
+            _dumps(get("produced_mana", [])),
             layout,  # Already extracted above for DFC handling
             produces_tokens,  # JSON array of token names from all_parts
-            json.dumps(card.get("image_uris", {}), cls=DecimalEncoder),
-            json.dumps(card.get("legalities", {}), cls=DecimalEncoder),
-            json.dumps(card.get("prices", {}), cls=DecimalEncoder),
-            json.dumps(card, cls=DecimalEncoder),
+            _dumps(get("image_uris", {})),
+            _dumps(get("legalities", {})),
+            _dumps(get("prices", {})),
+            _compress_raw(_raw_extras(card)),
         )
 
+    def _check_writable(self) -> None:
+        """Raise if this store was opened read-only."""
+        if self.readonly:
+            raise sqlite3.OperationalError(
+                f"CardStore for {self.db_path} was opened read-only"
+            )
+
     def insert_card(self, card: dict[str, Any]) -> None:
         """Insert a single card into the database.
 
         Args:
             card: Card data dictionary
         """
+        self._check_writable()
+        self._clear_card_cache()
         cursor = self._conn.cursor()
         cursor.execute(self._INSERT_SQL, self._card_to_params(card))
-        self._conn.commit()
+        if not self._bulk:
+            self._conn.commit()
+
+    def card_rows(self, cards: Iterable[dict[str, Any]]) -> list[tuple]:
+        """Convert cards to insert parameter rows for insert_card_rows.
+
+        Touches no database state, so an importer can prepare the next batch
+        on another thread while this store's connection inserts the current
+        one (sqlite3 releases the GIL while statements run).
+
+        Args:
+            cards: Card data dictionaries (any iterable, consumed once)
+
+        Returns:
+            One parameter tuple per card
+        """
+        return [self._card_to_params(card) for card in cards]
 
-    def insert_cards(self, cards: list[dict[str, Any]]) -> None:
+    def insert_cards(
+        self, cards: list[dict[str, Any]], rows_per_statement: int = INSERT_BATCH_ROWS
+    ) -> None:
         """Insert multiple cards into the database atomically.
 
         Uses explicit transaction to ensure all-or-nothing insert behavior.
-        If any card fails to insert, the entire batch is rolled back.
+        If any card fails to insert, the entire batch is rolled back. Inside
+        bulk_insert_transaction the batch joins the enclosing transaction
+        and a failure is only undone when the block rolls back.
 
         Args:
             cards: List of card data dictionaries
+            rows_per_statement: Cards bound into each multi-row INSERT; capped
+                by the connection's bound-variable limit
+
+        Raises:
+            ValueError: If rows_per_statement is less than 1
+            Exception: Re-raises any exception after rolling back the transaction
+        """
+        self.insert_card_rows(self.card_rows(cards), rows_per_statement)
+
+    def insert_card_rows(
+        self, rows: list[tuple], rows_per_statement: int = INSERT_BATCH_ROWS
+    ) -> None:
+        """Insert rows prepared by card_rows; see insert_cards.
+
+        Args:
+            rows: Parameter tuples returned by card_rows
+            rows_per_statement: Rows bound into each multi-row INSERT
 
         Raises:
+            ValueError: If rows_per_statement is less than 1
             Exception: Re-raises any exception after rolling back the transaction
         """
+        if rows_per_statement < 1:
+            raise ValueError(f"rows_per_statement must be at least 1, got {rows_per_statement}")
+        self._check_writable()
+        self._clear_card_cache()
+        batch_rows = max(1, min(
+            rows_per_statement,
+            self._conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER) // INSERT_COLUMN_COUNT,
+        ))
+        batch_sql = self._INSERT_SQL_TEMPLATE.format(
+            values=", ".join([self._INSERT_ROW_SQL] * batch_rows)
+        )
+        rows = iter(rows)
         cursor = self._conn.cursor()
-        cursor.execute("BEGIN TRANSACTION")
+        # No savepoint per batch inside a bulk transaction: SQLite would keep
+        # a sub-journal of every page the batch touches (in memory, given
+        # temp_store=MEMORY), which costs more than the inserts themselves
+        if not self._bulk:
+            # IMMEDIATE takes the write lock up front instead of upgrading mid-batch
+            cursor.execute("BEGIN IMMEDIATE")
         try:
-            for card in cards:
-                cursor.execute(self._INSERT_SQL, self._card_to_params(card))
-            self._conn.commit()
+            while batch := list(islice(rows, batch_rows)):
+                if len(batch) == batch_rows:
+                    cursor.execute(batch_sql, list(chain.from_iterable(batch)))
+                else:
+                    # Final partial batch
+                    cursor.executemany(self._INSERT_SQL, batch)
         except Exception:
-            self._conn.rollback()
+            if not self._bulk:
+                self._conn.rollback()
+            raise
+
+        if not self._bulk:
+            self._conn.commit()
+            self._maybe_analyze()
+
+    def drop_secondary_indexes(self) -> list[str]:
+        """Drop every non-unique index, returning the SQL to recreate them.
+
+        Unique indexes stay in place because the upsert in insert_cards
+        relies on them to detect conflicts.
+
+        Returns:
+            CREATE INDEX statements for recreate_secondary_indexes
+        """
+        self._check_writable()
+        indexes = self._conn.execute(SECONDARY_INDEXES_SQL).fetchall()
+        for name, _ in indexes:
+            self._conn.execute(f"DROP INDEX {name}")
+        return [sql for _, sql in indexes]
+
+    def recreate_secondary_indexes(self, statements: list[str]) -> None:
+        """Recreate indexes dropped by drop_secondary_indexes.
+
+        Args:
+            statements: CREATE INDEX statements returned by drop_secondary_indexes
+        """
+        self._check_writable()
+        for sql in statements:
+            self._conn.execute(sql)
+
+    @contextmanager
+    def bulk_insert_transaction(self, defer_indexes: bool = False) -> Iterator[None]:
+        """Run every insert inside the block as one write transaction.
+
+        Batches inserted with insert_cards normally commit one by one and
+        refresh planner statistics as the table grows. Inside this block
+        they share a single BEGIN IMMEDIATE ... COMMIT, ANALYZE runs once at
+        the end, and the page cache is raised to BULK_CACHE_SIZE_KIB. Any
+        exception escaping the block rolls back everything inserted in it.
+
+        Args:
+            defer_indexes: Drop secondary indexes for the duration of the
+                block and rebuild them just before the commit. Each index is
+                then built with one sort instead of a B-tree insert per row.
+                The drops are part of the transaction, so a rollback
+                restores them too.
+
+        Raises:
+            sqlite3.OperationalError: If the store is read-only
+            RuntimeError: If a bulk transaction is already open
+        """
+        self._check_writable()
+        if self._bulk:
+            raise RuntimeError("bulk_insert_transaction is already open")
+        conn = self._conn
+        conn.execute(f"PRAGMA cache_size=-{BULK_CACHE_SIZE_KIB}")
+        conn.execute("BEGIN IMMEDIATE")
+        self._bulk = True
+        try:
+            deferred = self.drop_secondary_indexes() if defer_indexes else []
+            yield
+            self.recreate_secondary_indexes(deferred)
+        except BaseException:
+            conn.rollback()
             raise
+        else:
+            conn.commit()
+        finally:
+            self._bulk = False
+            self._clear_card_cache()
+            conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KIB}")
+        self._maybe_analyze()
+
+    def _get_analyzed_count(self) -> int:
+        """Get the cards row count recorded by the last ANALYZE (0 if never run)."""
+        try:
+            row = self._conn.execute(
+                "SELECT MAX(CAST(stat AS INTEGER)) FROM sqlite_stat1 WHERE tbl = 'cards'"
+            ).fetchone()
+        except sqlite3.OperationalError:
+            # sqlite_stat1 doesn't exist until the first ANALYZE
+            return 0
+        return row[0] or 0
+
+    def _maybe_analyze(self) -> None:
+        """Refresh planner statistics when the table has grown by more than 10%.
+
+        Without sqlite_stat1, SQLite picks indexes heuristically and often
+        prefers a scan for compound filters. analysis_limit keeps each
+        ANALYZE cheap by sampling rather than reading every index entry.
+        """
+        count = self.get_card_count()
+        if count <= self._analyzed_count * 1.1:
+            return
+        self._conn.execute("PRAGMA analysis_limit=1000")
+        self._conn.execute("ANALYZE")
+        self._conn.commit()
+        self._analyzed_count = count
 
     def _row_to_dict(self, row: sqlite3.Row) -> dict[str, Any]:
-        """Convert database row to card dictionary."""
-        card = dict(row)
-        # Parse JSON fields
-        for field in ["colors", "color_identity", "keywords", "produced_mana",
-                      "produces_tokens", "image_uris", "legalities", "prices"]:
-            if card.get(field):
+        """Convert database row to card dictionary.
+
+        Only JSON columns present in the row are decoded, so queries that
+        project a subset of columns skip parsing the ones they did not select.
+        """
+        # dict(row) looks up every column by name (a case-insensitive scan
+        # of the description); zipping names with values is ~3x faster
+        card = dict(zip(row.keys(), row))
+        # Parse JSON fields (orjson is several times faster than stdlib json here)
+        for field in JSON_COLUMNS:
+            value = card.get(field)
+            if value:
                 try:
-                    card[field] = json.loads(card[field])
-                except json.JSONDecodeError as e:
+                    card[field] = orjson.loads(value)
+                except orjson.JSONDecodeError as e:
                     # Log parsing error but keep raw string as fallback
                     logger.debug(
                         "Failed to parse JSON field %s for card %s: %s",
@@ -533,8 +1362,6 @@ class CardStore:
         # Rename set_code to set for API compatibility
         if "set_code" in card:
             card["set"] = card.pop("set_code")
-        # Remove raw_data from output (too verbose)
-        card.pop("raw_data", None)
         return card
 
     def get_card_by_id(self, card_id: str) -> dict[str, Any] | None:
@@ -546,10 +1373,7 @@ class CardStore:
         Returns:
             Card dictionary or None if not found
         """
-        cursor = self._conn.cursor()
-        cursor.execute("SELECT * FROM cards WHERE id = ?", (card_id,))
-        row = cursor.fetchone()
-        return self._row_to_dict(row) if row else None
+        return self._get_card_cached("id", card_id)
 
     def get_card_by_name(self, name: str) -> dict[str, Any] | None:
         """Get card by exact name.
@@ -560,11 +1384,87 @@ class CardStore:
         Returns:
             Card dictionary or None if not found
         """
-        cursor = self._conn.cursor()
-        cursor.execute("SELECT * FROM cards WHERE name = ?", (name,))
-        row = cursor.fetchone()
+        return self._get_card_cached("name", name)
+
+    def _get_card_cached(self, column: str, value: str) -> dict[str, Any] | None:
+        """Look up one card by id or name through the LRU card cache.
+
+        The cache is cleared by this store's own inserts, and whenever
+        PRAGMA data_version shows another connection has committed. The
+        cache holds the immutable sqlite3.Row and decodes it on every hit, so
+        callers get a fresh dict and mutating it (even a nested list) can't
+        leak back into the cache.
+
+        Args:
+            column: Lookup column ("id" or "name")
+            value: Value to match exactly
+
+        Returns:
+            Card dictionary or None if not found
+        """
+        # data_version values are per connection, so track them per thread
+        version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != getattr(self._local, "card_cache_version", None):
+            self._clear_card_cache()
+            self._local.card_cache_version = version
+
+        key = (column, value)
+        cache = self._card_cache
+        with self._cache_lock:
+            row = cache.pop(key, _NOT_CACHED)
+            if row is not _NOT_CACHED:
+                # Reinsert at the end to mark as most recently used
+                cache[key] = row
+            else:
+                generation = self._card_cache_generation
+
+        if row is _NOT_CACHED:
+            # Query outside the lock so other threads' lookups aren't serialized
+            row = self._conn.execute(CARD_LOOKUP_SQL[column], (value,)).fetchone()
+            with self._cache_lock:
+                if generation == self._card_cache_generation:
+                    cache.pop(key, None)
+                    while len(cache) >= CARD_CACHE_SIZE:
+                        # Dicts keep insertion order, so the first key is least recently used
+                        del cache[next(iter(cache))]
+                    cache[key] = row
         return self._row_to_dict(row) if row else None
 
+    def _clear_card_cache(self) -> None:
+        """Empty the card cache and invalidate lookups still in flight."""
+        with self._cache_lock:
+            self._card_cache.clear()
+            self._card_cache_generation += 1
+
+    def get_raw_card(self, card_id: str) -> dict[str, Any] | None:
+        """Get the complete Scryfall JSON stored for a card.
+
+        Includes fields that are not promoted to columns (e.g., card_faces,
+        all_parts, purchase_uris).
+
+        Args:
+            card_id: Scryfall card ID
+
+        Returns:
+            Full card dictionary or None if not found
+        """
+        row = self._conn.execute(RAW_CARD_SQL, (card_id,)).fetchone()
+        if row is None:
+            return None
+
+        card = _decompress_raw(row["raw_data"]) or {}
+        # Restore the keys raw_data leaves to their columns (older databases
+        # stored full JSON, so nothing is missing there)
+        for key, column in RAW_COLUMN_KEYS.items():
+            if key in card:
+                continue
+            value = row[column]
+            if value and column in JSON_COLUMNS:
+                value = orjson.loads(value)
+            if value:
+                card[key] = value
+        return card
+
     # -------------------------------------------------------------------------
     # Filter Helper Methods
     # -------------------------------------------------------------------------
@@ -599,12 +1499,25 @@ class CardStore:
         values = filters[key]
         values = values if isinstance(values, list) else [values]
 
-        for val in values:
-            if negated:
-                conditions.append(f"({column} IS NULL OR LOWER({column}) NOT LIKE ?)")
-            else:
-                conditions.append(f"LOWER({column}) LIKE ?")
-            params.append(f"%{val.lower()}%")
+        # Positive matches on FTS-indexed columns resolve matching rowids from the
+        # trigram index, so SQLite only visits rows that contain the substring
+        # instead of scanning the whole table to fill the LIMIT. Needles shorter
+        # than one trigram can't use the index (FTS5 would scan every row), so
+        # those fall back to a plain LIKE within the same statement.
+        use_fts = not negated and self._fts_trigram and column in FTS_COLUMNS
+
+        # LIKE folds ASCII case on the column, same as LOWER() did, so only the
+        # needle is lowercased (in Python, which also folds non-ASCII letters)
+        params.extend(f"%{val.lower()}%" for val in values)
+        if negated:
+            conditions.extend([f"({column} IS NULL OR {column} NOT LIKE ?)"] * len(values))
+            return
+
+        fts_condition = f"rowid IN (SELECT rowid FROM cards_fts WHERE {column} LIKE ?)"
+        like_condition = f"{column} LIKE ?"
+        conditions.extend(
+            fts_condition if use_fts and len(val) >= 3 else like_condition for val in values
+        )
 
     def _add_json_array_filter(
         self,
@@ -615,7 +1528,7 @@ class CardStore:
         params: list[Any],
         negated: bool = False,
     ) -> None:
-        """Add LIKE conditions for JSON array filters (keywords, produces_tokens).
+        """Add LIKE conditions for JSON array filters (e.g., produces_tokens).
 
         Searches for quoted values within JSON arrays, e.g., '"Flying"' in '["Flying", "Trample"]'.
         Case-insensitive matching with NULL check for negated filters.
@@ -634,12 +1547,63 @@ class CardStore:
         values = filters[key]
         values = values if isinstance(values, list) else [values]
 
-        for val in values:
-            if negated:
-                conditions.append(f"({column} IS NULL OR LOWER({column}) NOT LIKE ?)")
-            else:
-                conditions.append(f"LOWER({column}) LIKE ?")
-            params.append(f'%"{val.lower()}"%')
+        if negated:
+            condition = f"({column} IS NULL OR {column} NOT LIKE ?)"
+        else:
+            condition = f"{column} LIKE ?"
+        conditions.extend([condition] * len(values))
+        params.extend(f'%"{val.lower()}"%' for val in values)
+
+    def _add_keyword_filter(
+        self,
+        filters: dict[str, Any],
+        key: str,
+        conditions: list[str],
+        params: list[Any],
+        negated: bool = False,
+    ) -> None:
+        """Add keyword conditions using the normalized card_keywords table.
+
+        Each value must be present (or absent, when negated) as a whole
+        keyword. Matching is case-insensitive via the NOCASE column.
+
+        Args:
+            filters: Filter dictionary
+            key: Key to look up in filters
+            conditions: List to append conditions to
+            params: List to append parameters to
+            negated: Whether this is a NOT filter
+        """
+        if key not in filters:
+            return
+
+        values = filters[key]
+        values = values if isinstance(values, list) else [values]
+        # Dedupe case-insensitively (matching the NOCASE column) so the
+        # HAVING count below equals the number of distinct keywords required
+        values = list({val.lower(): val for val in values}.values())
+
+        op = "NOT IN" if negated else "IN"
+        if len(values) == 1:
+            conditions.append(f"id {op} (SELECT card_id FROM card_keywords WHERE keyword = ?)")
+            params.append(values[0])
+            return
+
+        # Several keywords resolve in one index range scan: cards having all
+        # of them (AND) for positive filters, any of them for negated ones
+        placeholders = ", ".join("?" for _ in values)
+        if negated:
+            conditions.append(
+                f"id NOT IN (SELECT card_id FROM card_keywords WHERE keyword IN ({placeholders}))"
+            )
+            params.extend(values)
+        else:
+            conditions.append(
+                f"id IN (SELECT card_id FROM card_keywords WHERE keyword IN ({placeholders}) "
+                "GROUP BY card_id HAVING COUNT(*) = ?)"
+            )
+            params.extend(values)
+            params.append(len(values))
 
     def _add_exact_filter(
         self,
@@ -667,10 +1631,10 @@ class CardStore:
 
         value = filters[key]
         if negated:
-            conditions.append(f"({column} IS NULL OR LOWER({column}) != ?)")
+            conditions.append(f"({column} IS NULL OR {column} != ? COLLATE NOCASE)")
         else:
-            conditions.append(f"LOWER({column}) = ?")
-        params.append(value.lower())
+            conditions.append(f"{column} = ? COLLATE NOCASE")
+        params.append(value)
 
     def _add_numeric_filter(
         self,
@@ -686,7 +1650,7 @@ class CardStore:
         Args:
             filters: Filter dictionary
             key: Key to look up in filters
-            column_expr: SQL expression for the column (e.g., "cmc", "CAST(power AS INTEGER)")
+            column_expr: SQL expression for the column (e.g., "cmc", "loyalty_num")
             conditions: List to append conditions to
             params: List to append parameters to
             negated: Whether this is a NOT filter (inverts operator)
@@ -698,12 +1662,7 @@ class CardStore:
         value = filter_data.get("value", 0)
         operator = filter_data.get("operator", "=")
 
-        if negated:
-            sql_op = INVERTED_OPERATOR_MAP.get(operator, "!=")
-        else:
-            sql_op = OPERATOR_MAP.get(operator, "=")
-
-        conditions.append(f"{column_expr} {sql_op} ?")
+        conditions.append(_comparison(column_expr, operator, negated))
         params.append(value)
 
     def _add_stat_filter(
@@ -735,15 +1694,11 @@ class CardStore:
         if value == "*":
             # Special case: variable power/toughness
             if negated:
-                conditions.append(f"{column} != '*'")
+                conditions.append(f"({column} IS NULL OR {column} != '*')")
             else:
                 conditions.append(f"{column} = '*'")
         else:
-            if negated:
-                sql_op = INVERTED_OPERATOR_MAP.get(operator, "!=")
-            else:
-                sql_op = OPERATOR_MAP.get(operator, "=")
-            conditions.append(f"CAST({column} AS INTEGER) {sql_op} ?")
+            conditions.append(_comparison(f"{column}_num", operator, negated))
             params.append(value)
 
     def _add_color_filter(
@@ -756,7 +1711,9 @@ class CardStore:
     ) -> None:
         """Add color-based filter conditions with operator support.
 
-        Handles all color operators: =, :, >=, <=, >, <
+        Handles all color operators: =, :, >=, <=, >, <. There are only 32
+        possible color combinations, so each operator becomes the list of
+        matching masks, which the {column}_mask index answers directly.
 
         Args:
             filters: Filter dictionary
@@ -769,49 +1726,31 @@ class CardStore:
             return
 
         color_filter = filters[key]
-        colors = color_filter.get("value", [])
+        wanted = _color_mask(color_filter.get("value", []))
         operator = color_filter.get("operator", ":")
 
-        if not colors:
+        if not wanted:
             # Colorless
-            conditions.append(f"{column} = '[]'")
+            conditions.append(f"{column}_mask = 0")
             return
 
-        all_colors = {"W", "U", "B", "R", "G"}
-
+        masks = range(ALL_COLORS_MASK + 1)
         if operator in (":", "=", ">="):
             # Has at least these colors
-            for c in colors:
-                conditions.append(f"{column} LIKE ?")
-                params.append(f'%"{c}"%')
-
+            matching = [m for m in masks if m & wanted == wanted]
         elif operator == "<=":
             # Has at most these colors (subset)
-            disallowed = all_colors - set(colors)
-            for c in disallowed:
-                conditions.append(f"{column} NOT LIKE ?")
-                params.append(f'%"{c}"%')
-
+            matching = [m for m in masks if m & ~wanted == 0]
         elif operator == ">":
             # Strict superset: has all specified plus at least one more
-            for c in colors:
-                conditions.append(f"{column} LIKE ?")
-                params.append(f'%"{c}"%')
-            other_colors = all_colors - set(colors)
-            if other_colors:
-                or_conditions = " OR ".join(f"{column} LIKE '%\"{c}\"%'" for c in other_colors)
-                conditions.append(f"({or_conditions})")
-
+            matching = [m for m in masks if m & wanted == wanted and m != wanted]
         elif operator == "<":
             # Strict subset: fewer colors than specified
-            disallowed = all_colors - set(colors)
-            for c in disallowed:
-                conditions.append(f"{column} NOT LIKE ?")
-                params.append(f'%"{c}"%')
-            if len(colors) > 1:
-                # At least one specified color must be missing
-                not_all = " OR ".join(f"{column} NOT LIKE '%\"{c}\"%'" for c in colors)
-                conditions.append(f"({not_all})")
+            matching = [m for m in masks if m & ~wanted == 0 and m != wanted]
+        else:
+            return
+
+        self._add_color_mask_condition(column, matching, conditions)
 
     def _add_color_not_filter(
         self,
@@ -833,263 +1772,404 @@ class CardStore:
         if key not in filters:
             return
 
-        color_filter = filters[key]
-        colors = color_filter.get("value", [])
+        unwanted = _color_mask(filters[key].get("value", []))
 
-        if not colors:
+        if not unwanted:
             # -c:colorless means NOT colorless, i.e., has at least one color
-            conditions.append(f"{column} != '[]'")
+            conditions.append(f"{column}_mask > 0")
         else:
-            for c in colors:
-                conditions.append(f"{column} NOT LIKE ?")
-                params.append(f'%"{c}"%')
+            # None of the specified colors
+            matching = [m for m in range(ALL_COLORS_MASK + 1) if m & unwanted == 0]
+            self._add_color_mask_condition(column, matching, conditions)
+
+    @staticmethod
+    def _add_color_mask_condition(
+        column: str, matching: list[int], conditions: list[str]
+    ) -> None:
+        """Add a condition restricting {column}_mask to the given masks.
+
+        The masks are inlined rather than bound: they come from a fixed set of
+        32 integers, and literals let the planner estimate the IN list.
+
+        Args:
+            column: SQL column name (colors or color_identity)
+            matching: Masks that satisfy the filter
+            conditions: List to append conditions to
+        """
+        if not matching:
+            conditions.append(IMPOSSIBLE_CONDITION)
+        elif len(matching) <= ALL_COLORS_MASK:
+            conditions.append(f"{column}_mask IN ({', '.join(map(str, matching))})")
+        # else: every combination matches, so there is nothing to filter
 
     def _build_conditions_for_filters(
         self, filters: dict[str, Any]
     ) -> tuple[list[str], list[Any]]:
         """Convert a filters dict to SQL conditions and params.
 
+        Conditions are ordered cheapest first (see CONDITION_COSTS). Results
+        are memoized per distinct filters dict, so repeated queries (e.g.,
+        paging through the same search) skip rebuilding the SQL.
+
         Args:
             filters: Dictionary of filter key-value pairs
 
         Returns:
             Tuple of (conditions list, params list)
         """
-        conditions: list[str] = []
-        params: list[Any] = []
+        key = _freeze(filters)
+        cache = self._conditions_cache
+        with self._cache_lock:
+            cached = cache.pop(key, None)
+            if cached is not None:
+                # Reinsert at the end to mark as most recently used
+                cache[key] = cached
+        if cached is None:
+            conditions, params = _order_conditions(*self._compile_conditions(filters))
+            cached = (tuple(conditions), tuple(params))
+            with self._cache_lock:
+                cache.pop(key, None)
+                while len(cache) >= CONDITIONS_CACHE_SIZE:
+                    # Dicts keep insertion order, so the first key is least recently used
+                    del cache[next(iter(cache))]
+                cache[key] = cached
+        # Return fresh lists - callers extend params with LIMIT/OFFSET
+        return list(cached[0]), list(cached[1])
+
+    def _add_name_filter(
+        self,
+        filters: dict[str, Any],
+        key: str,
+        conditions: list[str],
+        params: list[Any],
+        strict: bool = False,
+    ) -> None:
+        """Add exact name conditions.
 
-        # Name filters
-        if "name_exact" in filters:
-            conditions.append("name = ?")
-            params.append(filters["name_exact"])
-        if "name_strict" in filters:
-            conditions.append("name = ? COLLATE BINARY")
-            params.append(filters["name_strict"])
-
-        # Partial name filters (LIKE matching)
-        self._add_like_filter(filters, "name_partial", "name", conditions, params)
-        self._add_like_filter(filters, "name_partial_not", "name", conditions, params, negated=True)
-        self._add_like_filter(filters, "name_contains", "name", conditions, params)
+        Args:
+            filters: Filter dictionary
+            key: Key to look up in filters
+            conditions: List to append conditions to
+            params: List to append parameters to
+            strict: Compare case-sensitively (COLLATE BINARY)
+        """
+        if key not in filters:
+            return
 
-        # Color filters
-        self._add_color_filter(filters, "colors", "colors", conditions, params)
-        self._add_color_not_filter(filters, "colors_not", "colors", conditions, params)
-        self._add_color_filter(filters, "color_identity", "color_identity", conditions, params)
-        self._add_color_not_filter(filters, "color_identity_not", "color_identity", conditions, params)
-
-        # CMC filter
-        self._add_numeric_filter(filters, "cmc", "cmc", conditions, params)
-        self._add_numeric_filter(filters, "cmc_not", "cmc", conditions, params, negated=True)
-
-        # Mana cost filter (e.g., m:{R}{R}, mana:{2}{U}{U})
-        if "mana" in filters:
-            mana_filter = filters["mana"]
-            mana_value = mana_filter.get("value", "")
-            operator = mana_filter.get("operator", ":")
-            if operator == "=":
-                conditions.append("mana_cost = ?")
-                params.append(mana_value)
-            else:
-                conditions.append("mana_cost LIKE ?")
-                params.append(f"%{mana_value}%")
+        conditions.append("name = ? COLLATE BINARY" if strict else "name = ?")
+        params.append(filters[key])
+
+    def _add_mana_filter(
+        self,
+        filters: dict[str, Any],
+        key: str,
+        conditions: list[str],
+        params: list[Any],
+        negated: bool = False,
+    ) -> None:
+        """Add mana cost conditions (e.g., m:{R}{R}, mana:{2}{U}{U}).
+
+        The = operator matches the whole cost; other operators match costs
+        containing the given symbols.
+
+        Args:
+            filters: Filter dictionary
+            key: Key to look up in filters
+            conditions: List to append conditions to
+            params: List to append parameters to
+            negated: Whether this is a NOT filter
+        """
+        if key not in filters:
+            return
 
-        if "mana_not" in filters:
-            mana_not_filter = filters["mana_not"]
-            mana_value = mana_not_filter.get("value", "")
-            operator = mana_not_filter.get("operator", ":")
-            if operator == "=":
+        mana_filter = filters[key]
+        mana_value = mana_filter.get("value", "")
+        operator = mana_filter.get("operator", ":")
+        if operator == "=":
+            if negated:
                 conditions.append("(mana_cost IS NULL OR mana_cost != ?)")
-                params.append(mana_value)
             else:
+                conditions.append("mana_cost = ?")
+            params.append(mana_value)
+        else:
+            if negated:
                 conditions.append("(mana_cost IS NULL OR mana_cost NOT LIKE ?)")
-                params.append(f"%{mana_value}%")
-
-        # Type filters
-        self._add_like_filter(filters, "type", "type_line", conditions, params)
-        self._add_like_filter(filters, "type_not", "type_line", conditions, params, negated=True)
-
-        # Oracle text filters
-        self._add_like_filter(filters, "oracle_text", "oracle_text", conditions, params)
-        self._add_like_filter(filters, "oracle_text_not", "oracle_text", conditions, params, negated=True)
-
-        # Flavor text filters
-        self._add_like_filter(filters, "flavor_text", "flavor_text", conditions, params)
-        self._add_like_filter(filters, "flavor_text_not", "flavor_text", conditions, params, negated=True)
-
-        # Set filters
-        self._add_exact_filter(filters, "set", "set_code", conditions, params)
-        self._add_exact_filter(filters, "set_not", "set_code", conditions, params, negated=True)
-
-        # Rarity filters
-        self._add_exact_filter(filters, "rarity", "rarity", conditions, params)
-        self._add_exact_filter(filters, "rarity_not", "rarity", conditions, params, negated=True)
-
-        # Format legality filter
-        if "format" in filters:
-            format_name = filters["format"].lower()
-            if format_name in VALID_FORMATS:
-                conditions.append(
-                    f"(json_extract(legalities, '$.{format_name}') = 'legal' "
-                    f"OR json_extract(legalities, '$.{format_name}') = 'restricted')"
-                )
             else:
-                conditions.append("1=0")
-
-        if "format_not" in filters:
-            format_name = filters["format_not"].lower()
-            if format_name in VALID_FORMATS:
-                conditions.append(
-                    f"(json_extract(legalities, '$.{format_name}') IS NULL "
-                    f"OR (json_extract(legalities, '$.{format_name}') != 'legal' "
-                    f"AND json_extract(legalities, '$.{format_name}') != 'restricted'))"
-                )
+                conditions.append("mana_cost LIKE ?")
+            params.append(f"%{mana_value}%")
 
-        # Power/Toughness filters (with special '*' handling)
-        self._add_stat_filter(filters, "power", "power", conditions, params)
-        self._add_stat_filter(filters, "power_not", "power", conditions, params, negated=True)
-        self._add_stat_filter(filters, "toughness", "toughness", conditions, params)
-        self._add_stat_filter(filters, "toughness_not", "toughness", conditions, params, negated=True)
-
-        # Loyalty filters
-        self._add_numeric_filter(filters, "loyalty", "CAST(loyalty AS INTEGER)", conditions, params)
-        self._add_numeric_filter(filters, "loyalty_not", "CAST(loyalty AS INTEGER)", conditions, params, negated=True)
-
-        # Collector number filter (special handling for alphanumeric values)
-        if "collector_number" in filters:
-            cn_filter = filters["collector_number"]
-            value = cn_filter.get("value")
-            operator = cn_filter.get("operator", "=")
-            if operator == "=":
-                conditions.append("collector_number = ?")
-                params.append(str(value))
-            else:
-                sql_op = OPERATOR_MAP.get(operator, "=")
-                numeric_value = _extract_numeric_prefix(str(value))
-                conditions.append(f"CAST(collector_number AS INTEGER) {sql_op} ?")
-                params.append(numeric_value)
-
-        if "collector_number_not" in filters:
-            cn_not_filter = filters["collector_number_not"]
-            value = cn_not_filter.get("value")
-            operator = cn_not_filter.get("operator", "=")
-            if operator == "=":
-                conditions.append("collector_number != ?")
-                params.append(str(value))
-            else:
-                sql_op = INVERTED_OPERATOR_MAP.get(operator, "!=")
-                numeric_value = _extract_numeric_prefix(str(value))
-                conditions.append(f"CAST(collector_number AS INTEGER) {sql_op} ?")
-                params.append(numeric_value)
-
-        # Price filter (JSON extraction with currency validation)
-        if "price" in filters:
-            price_filter = filters["price"]
-            currency = price_filter.get("currency", "usd").lower()
-            value = price_filter.get("value")
-            operator = price_filter.get("operator", "=")
-            if currency in VALID_CURRENCIES:
-                sql_op = OPERATOR_MAP.get(operator, "=")
-                conditions.append(
-                    f"CAST(json_extract(prices, '$.{currency}') AS REAL) {sql_op} ?"
-                )
-                params.append(value)
-
-        if "price_not" in filters:
-            price_not_filter = filters["price_not"]
-            currency = price_not_filter.get("currency", "usd").lower()
-            value = price_not_filter.get("value")
-            operator = price_not_filter.get("operator", "=")
-            if currency in VALID_CURRENCIES:
-                sql_op = INVERTED_OPERATOR_MAP.get(operator, "!=")
-                conditions.append(
-                    f"CAST(json_extract(prices, '$.{currency}') AS REAL) {sql_op} ?"
-                )
-                params.append(value)
+    def _add_legality_filter(
+        self,
+        filters: dict[str, Any],
+        key: str,
+        conditions: list[str],
+        params: list[Any],
+        statuses: str,
+        negated: bool = False,
+    ) -> None:
+        """Add format legality conditions using the card_legalities table.
+
+        Unknown formats match nothing (or, negated, add no condition).
 
-        # Keyword filters (JSON array search)
-        self._add_json_array_filter(filters, "keyword", "keywords", conditions, params)
-        self._add_json_array_filter(filters, "keyword_not", "keywords", conditions, params, negated=True)
+        Args:
+            filters: Filter dictionary
+            key: Key to look up in filters
+            conditions: List to append conditions to
+            params: List to append parameters to
+            statuses: SQL condition on status, e.g. "status = 'banned'"
+            negated: Whether this is a NOT filter
+        """
+        if key not in filters:
+            return
 
-        # Artist filters
-        self._add_like_filter(filters, "artist", "artist", conditions, params)
-        self._add_like_filter(filters, "artist_not", "artist", conditions, params, negated=True)
+        format_name = filters[key].lower()
+        if format_name not in VALID_FORMATS:
+            if not negated:
+                conditions.append(IMPOSSIBLE_CONDITION)
+            return
 
-        # Year filters
-        self._add_numeric_filter(
-            filters, "year", "CAST(substr(released_at, 1, 4) AS INTEGER)", conditions, params
-        )
-        self._add_numeric_filter(
-            filters, "year_not", "CAST(substr(released_at, 1, 4) AS INTEGER)", conditions, params, negated=True
+        op = "NOT IN" if negated else "IN"
+        conditions.append(
+            f"id {op} (SELECT card_id FROM card_legalities WHERE format = ? AND {statuses})"
         )
+        params.append(format_name)
 
-        # Banned in format filter
-        if "banned" in filters:
-            format_name = filters["banned"].lower()
-            if format_name in VALID_FORMATS:
-                conditions.append(f"json_extract(legalities, '$.{format_name}') = 'banned'")
-            else:
-                conditions.append("1=0")
-
-        if "banned_not" in filters:
-            format_name = filters["banned_not"].lower()
-            if format_name in VALID_FORMATS:
-                conditions.append(
-                    f"(json_extract(legalities, '$.{format_name}') IS NULL "
-                    f"OR json_extract(legalities, '$.{format_name}') != 'banned')"
-                )
+    def _add_collector_number_filter(
+        self,
+        filters: dict[str, Any],
+        key: str,
+        conditions: list[str],
+        params: list[Any],
+        negated: bool = False,
+    ) -> None:
+        """Add collector number conditions (special handling for alphanumeric values).
 
-        # Produces mana filter (color array with colorless handling)
-        if "produces" in filters:
-            produced_colors = filters["produces"]
-            if isinstance(produced_colors, list):
-                if len(produced_colors) == 0:
-                    conditions.append("produced_mana LIKE '%\"C\"%'")
-                else:
-                    for color in produced_colors:
-                        conditions.append("produced_mana LIKE ?")
-                        params.append(f'%"{color}"%')
-
-        if "produces_not" in filters:
-            produced_colors = filters["produces_not"]
-            if isinstance(produced_colors, list):
-                if len(produced_colors) == 0:
-                    conditions.append("(produced_mana IS NULL OR produced_mana NOT LIKE '%\"C\"%')")
-                else:
-                    for color in produced_colors:
-                        if color:
-                            conditions.append("(produced_mana IS NULL OR produced_mana NOT LIKE ?)")
-                            params.append(f'%"{color}"%')
-
-        # Watermark filters
-        self._add_exact_filter(filters, "watermark", "watermark", conditions, params)
-        self._add_exact_filter(filters, "watermark_not", "watermark", conditions, params, negated=True)
-
-        # Layout filters
-        self._add_exact_filter(filters, "layout", "layout", conditions, params)
-        self._add_exact_filter(filters, "layout_not", "layout", conditions, params, negated=True)
-
-        # Produces token filters (JSON array search)
-        self._add_json_array_filter(filters, "produces_token", "produces_tokens", conditions, params)
-        self._add_json_array_filter(filters, "produces_token_not", "produces_tokens", conditions, params, negated=True)
-
-        # Block filter (set code IN clause)
-        if "block" in filters:
-            block_name = filters["block"].lower()
-            block_sets = BLOCK_MAP.get(block_name, [])
-            if block_sets:
-                placeholders = ", ".join("?" for _ in block_sets)
-                conditions.append(f"LOWER(set_code) IN ({placeholders})")
-                params.extend(block_sets)
+        Equality compares the full text; range operators compare the
+        leading number (e.g., "123a" -> 123).
+
+        Args:
+            filters: Filter dictionary
+            key: Key to look up in filters
+            conditions: List to append conditions to
+            params: List to append parameters to
+            negated: Whether this is a NOT filter
+        """
+        if key not in filters:
+            return
+
+        cn_filter = filters[key]
+        value = cn_filter.get("value")
+        operator = cn_filter.get("operator", "=")
+        if operator == "=":
+            conditions.append(_comparison("collector_number", operator, negated))
+            params.append(str(value))
+        else:
+            conditions.append(_comparison("collector_number_num", operator, negated))
+            params.append(_extract_numeric_prefix(str(value)))
+
+    def _add_price_filter(
+        self,
+        filters: dict[str, Any],
+        key: str,
+        conditions: list[str],
+        params: list[Any],
+        negated: bool = False,
+    ) -> None:
+        """Add price conditions on the generated price_<currency> column.
+
+        Args:
+            filters: Filter dictionary
+            key: Key to look up in filters
+            conditions: List to append conditions to
+            params: List to append parameters to
+            negated: Whether this is a NOT filter (inverts operator)
+        """
+        if key not in filters:
+            return
+
+        price_filter = filters[key]
+        currency = price_filter.get("currency", "usd").lower()
+        if currency not in VALID_CURRENCIES:
+            return
+
+        operator = price_filter.get("operator", "=")
+        conditions.append(_comparison(f"price_{currency}", operator, negated))
+        params.append(price_filter.get("value"))
+
+    def _add_produces_filter(
+        self,
+        filters: dict[str, Any],
+        key: str,
+        conditions: list[str],
+        params: list[Any],
+        negated: bool = False,
+    ) -> None:
+        """Add produced mana conditions (an empty list means colorless).
+
+        Args:
+            filters: Filter dictionary
+            key: Key to look up in filters
+            conditions: List to append conditions to
+            params: List to append parameters to
+            negated: Whether this is a NOT filter
+        """
+        if key not in filters:
+            return
+
+        produced_colors = filters[key]
+        if not isinstance(produced_colors, list):
+            return
+
+        if not produced_colors:
+            if negated:
+                conditions.append("(produced_mana IS NULL OR produced_mana NOT LIKE '%\"C\"%')")
             else:
-                conditions.append("1=0")
+                conditions.append("produced_mana LIKE '%\"C\"%'")
+            return
 
-        if "block_not" in filters:
-            block_name = filters["block_not"].lower()
-            block_sets = BLOCK_MAP.get(block_name, [])
-            if block_sets:
-                placeholders = ", ".join("?" for _ in block_sets)
-                conditions.append(f"LOWER(set_code) NOT IN ({placeholders})")
-                params.extend(block_sets)
+        if negated:
+            produced_colors = [color for color in produced_colors if color]
+            condition = "(produced_mana IS NULL OR produced_mana NOT LIKE ?)"
+        else:
+            condition = "produced_mana LIKE ?"
+        conditions.extend([condition] * len(produced_colors))
+        params.extend(f'%"{color}"%' for color in produced_colors)
+
+    def _add_block_filter(
+        self,
+        filters: dict[str, Any],
+        key: str,
+        conditions: list[str],
+        params: list[Any],
+        negated: bool = False,
+    ) -> None:
+        """Add block conditions (set code IN the block's sets).
+
+        Unknown blocks match nothing (or, negated, add no condition).
+
+        Args:
+            filters: Filter dictionary
+            key: Key to look up in filters
+            conditions: List to append conditions to
+            params: List to append parameters to
+            negated: Whether this is a NOT filter
+        """
+        if key not in filters:
+            return
+
+        block_sets = BLOCK_MAP.get(filters[key].lower(), [])
+        if not block_sets:
+            if not negated:
+                conditions.append(IMPOSSIBLE_CONDITION)
+            return
+
+        op = "NOT IN" if negated else "IN"
+        placeholders = ", ".join("?" for _ in block_sets)
+        conditions.append(f"set_code COLLATE NOCASE {op} ({placeholders})")
+        params.extend(block_sets)
+
+    # Filter key -> (helper, extra keyword arguments). Compilation walks the
+    # filters actually present instead of probing every supported key.
+    _FILTER_HANDLERS = {
+        # Name filters
+        "name_exact": (_add_name_filter, {}),
+        "name_strict": (_add_name_filter, {"strict": True}),
+        "name_partial": (_add_like_filter, {"column": "name"}),
+        "name_partial_not": (_add_like_filter, {"column": "name", "negated": True}),
+        "name_contains": (_add_like_filter, {"column": "name"}),
+        # Color filters
+        "colors": (_add_color_filter, {"column": "colors"}),
+        "colors_not": (_add_color_not_filter, {"column": "colors"}),
+        "color_identity": (_add_color_filter, {"column": "color_identity"}),
+        "color_identity_not": (_add_color_not_filter, {"column": "color_identity"}),
+        # CMC and mana cost filters
+        "cmc": (_add_numeric_filter, {"column_expr": "cmc"}),
+        "cmc_not": (_add_numeric_filter, {"column_expr": "cmc", "negated": True}),
+        "mana": (_add_mana_filter, {}),
+        "mana_not": (_add_mana_filter, {"negated": True}),
+        # Text filters
+        "type": (_add_like_filter, {"column": "type_line"}),
+        "type_not": (_add_like_filter, {"column": "type_line", "negated": True}),
+        "oracle_text": (_add_like_filter, {"column": "oracle_text"}),
+        "oracle_text_not": (_add_like_filter, {"column": "oracle_text", "negated": True}),
+        "flavor_text": (_add_like_filter, {"column": "flavor_text"}),
+        "flavor_text_not": (_add_like_filter, {"column": "flavor_text", "negated": True}),
+        "artist": (_add_like_filter, {"column": "artist"}),
+        "artist_not": (_add_like_filter, {"column": "artist", "negated": True}),
+        # Set, rarity, watermark and layout filters
+        "set": (_add_exact_filter, {"column": "set_code"}),
+        "set_not": (_add_exact_filter, {"column": "set_code", "negated": True}),
+        "block": (_add_block_filter, {}),
+        "block_not": (_add_block_filter, {"negated": True}),
+        "rarity": (_add_exact_filter, {"column": "rarity"}),
+        "rarity_not": (_add_exact_filter, {"column": "rarity", "negated": True}),
+        "watermark": (_add_exact_filter, {"column": "watermark"}),
+        "watermark_not": (_add_exact_filter, {"column": "watermark", "negated": True}),
+        "layout": (_add_exact_filter, {"column": "layout"}),
+        "layout_not": (_add_exact_filter, {"column": "layout", "negated": True}),
+        # Legality filters
+        "format": (_add_legality_filter, {"statuses": "status IN ('legal', 'restricted')"}),
+        "format_not": (
+            _add_legality_filter,
+            {"statuses": "status IN ('legal', 'restricted')", "negated": True},
+        ),
+        "banned": (_add_legality_filter, {"statuses": "status = 'banned'"}),
+        "banned_not": (_add_legality_filter, {"statuses": "status = 'banned'", "negated": True}),
+        # Power/Toughness filters (with special '*' handling), loyalty
+        "power": (_add_stat_filter, {"column": "power"}),
+        "power_not": (_add_stat_filter, {"column": "power", "negated": True}),
+        "toughness": (_add_stat_filter, {"column": "toughness"}),
+        "toughness_not": (_add_stat_filter, {"column": "toughness", "negated": True}),
+        "loyalty": (_add_numeric_filter, {"column_expr": "loyalty_num"}),
+        "loyalty_not": (_add_numeric_filter, {"column_expr": "loyalty_num", "negated": True}),
+        # Collector number, price and year filters
+        "collector_number": (_add_collector_number_filter, {}),
+        "collector_number_not": (_add_collector_number_filter, {"negated": True}),
+        "price": (_add_price_filter, {}),
+        "price_not": (_add_price_filter, {"negated": True}),
+        "year": (_add_numeric_filter, {"column_expr": "released_year"}),
+        "year_not": (_add_numeric_filter, {"column_expr": "released_year", "negated": True}),
+        # Keyword, produced mana and token filters
+        "keyword": (_add_keyword_filter, {}),
+        "keyword_not": (_add_keyword_filter, {"negated": True}),
+        "produces": (_add_produces_filter, {}),
+        "produces_not": (_add_produces_filter, {"negated": True}),
+        "produces_token": (_add_json_array_filter, {"column": "produces_tokens"}),
+        "produces_token_not": (
+            _add_json_array_filter,
+            {"column": "produces_tokens", "negated": True},
+        ),
+    }
+
+    def _compile_conditions(
+        self, filters: dict[str, Any]
+    ) -> tuple[list[str], list[Any]]:
+        """Build SQL conditions and params for a filters dict (uncached).
+
+        Unknown filter keys are ignored.
+
+        Args:
+            filters: Dictionary of filter key-value pairs
+
+        Returns:
+            Tuple of (conditions list, params list)
+        """
+        conditions: list[str] = []
+        params: list[Any] = []
+
+        for key in filters:
+            handler = self._FILTER_HANDLERS.get(key)
+            if handler is not None:
+                add_filter, kwargs = handler
+                add_filter(self, filters, key, conditions=conditions, params=params, **kwargs)
+
+        # Nothing else matters once one condition can't match
+        if IMPOSSIBLE_CONDITION in conditions:
+            return [IMPOSSIBLE_CONDITION], []
+        for key in EXCLUSIVE_FILTERS:
+            value, not_value = filters.get(key), filters.get(f"{key}_not")
+            if isinstance(value, str) and isinstance(not_value, str) and value.lower() == not_value.lower():
+                return [IMPOSSIBLE_CONDITION], []
 
         return conditions, params
 
@@ -1102,7 +2182,8 @@ class CardStore:
             parsed: ParsedQuery object with filters
 
         Returns:
-            Tuple of (where_clause, params) where where_clause is None if no filters
+            Tuple of (where_clause, params) where where_clause is None if no
+            filters and IMPOSSIBLE_CONDITION if the query can't match anything
         """
         # No filters
         if parsed.is_empty and not parsed.has_or_clause:
@@ -1113,22 +2194,26 @@ class CardStore:
             group_clauses = []
             all_params: list[Any] = []
 
-            for group_filters in parsed.or_groups:
-                # Merge list of filter dicts into one
-                merged: dict[str, Any] = {}
-                for f in group_filters:
-                    merged.update(f)
-
+            for merged in parsed.or_merged_groups:
                 conditions, params = self._build_conditions_for_filters(merged)
-                if conditions:
-                    group_clauses.append(f"({' AND '.join(conditions)})")
+                # Groups that can't match contribute nothing to the union
+                if conditions and conditions != [IMPOSSIBLE_CONDITION]:
+                    group_clauses.append(" AND ".join(conditions))
                     all_params.extend(params)
 
-            if group_clauses:
-                return " OR ".join(group_clauses), all_params
-            else:
+            if not group_clauses:
                 # No valid conditions - return impossible condition
-                return "1=0", []
+                return IMPOSSIBLE_CONDITION, []
+            if len(group_clauses) == 1:
+                return group_clauses[0], all_params
+
+            # One subquery per group instead of "(g1) OR (g2)": the planner
+            # picks an index for each group independently, where a single
+            # OR'd WHERE often falls back to a full scan. UNION dedups rowids.
+            union = " UNION ".join(
+                f"SELECT rowid FROM cards WHERE {clause}" for clause in group_clauses
+            )
+            return f"rowid IN ({union})", all_params
 
         # Standard AND query (no OR)
         conditions, params = self._build_conditions_for_filters(parsed.filters)
@@ -1143,6 +2228,7 @@ class CardStore:
         parsed: ParsedQuery,
         limit: int = 20,
         offset: int = 0,
+        columns: list[str] | None = None,
     ) -> list[dict[str, Any]]:
         """Execute a parsed query.
 
@@ -1150,22 +2236,115 @@ class CardStore:
             parsed: ParsedQuery object with filters
             limit: Maximum results to return
             offset: Number of results to skip (for pagination)
+            columns: Optional subset of CARD_COLUMNS to return (default: all)
 
         Returns:
             List of matching card dictionaries
         """
+        return list(self.iter_execute_query(parsed, limit=limit, offset=offset, columns=columns))
+
+    def iter_execute_query(
+        self,
+        parsed: ParsedQuery,
+        limit: int = 20,
+        offset: int = 0,
+        columns: list[str] | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Execute a parsed query, yielding cards as rows are read.
+
+        Avoids materializing the full row list plus the converted dict list
+        for large limits. The query runs when iteration starts, and its read
+        transaction stays open until the iterator is exhausted or closed;
+        until then, WAL checkpoints can't reclaim the log.
+
+        Args:
+            parsed: ParsedQuery object with filters
+            limit: Maximum results to return
+            offset: Number of results to skip (for pagination)
+            columns: Optional subset of CARD_COLUMNS to return (default: all)
+
+        Yields:
+            Matching card dictionaries
+
+        Raises:
+            ValueError: If columns contains an unknown column
+        """
+        select_sql = _projection_sql(columns)
         where_clause, params = self._build_where_clause(parsed)
+        if where_clause == IMPOSSIBLE_CONDITION:
+            return
 
         if where_clause:
-            query = f"SELECT * FROM cards WHERE {where_clause} LIMIT ? OFFSET ?"
+            query = f"SELECT {select_sql} FROM cards WHERE {where_clause} LIMIT ? OFFSET ?"
             params.extend([limit, offset])
         else:
-            query = "SELECT * FROM cards LIMIT ? OFFSET ?"
+            if columns is None:
+                query = SELECT_ALL_SQL
+            else:
+                query = f"SELECT {select_sql} FROM cards LIMIT ? OFFSET ?"
             params = [limit, offset]
 
+        # Iterating the cursor steps SQLite one row at a time, so neither the
+        # full row list nor the full dict list is ever held in memory
+        cursor = self._conn.execute(query, params)
+        try:
+            yield from map(self._row_to_dict, cursor)
+        finally:
+            # Reset the statement now rather than whenever the generator is
+            # garbage collected, ending the read transaction
+            cursor.close()
+
+    def execute_query_with_count(
+        self,
+        parsed: ParsedQuery,
+        limit: int = 20,
+        offset: int = 0,
+        columns: list[str] | None = None,
+    ) -> tuple[list[dict[str, Any]], int]:
+        """Execute a parsed query and count all its matches in one statement.
+
+        The filter is evaluated once: a window COUNT over the matching rowids
+        gives the total while only the requested page is read from cards.
+
+        Args:
+            parsed: ParsedQuery object with filters
+            limit: Maximum results to return
+            offset: Number of results to skip (for pagination)
+            columns: Optional subset of CARD_COLUMNS to return (default: all)
+
+        Returns:
+            Tuple of (matching card dictionaries, total match count)
+
+        Raises:
+            ValueError: If columns contains an unknown column
+        """
+        select_sql = _projection_sql(columns)
+        where_clause, params = self._build_where_clause(parsed)
+        if where_clause == IMPOSSIBLE_CONDITION:
+            return [], 0
+        where_sql = f" WHERE {where_clause}" if where_clause else ""
+
+        query = (
+            f"SELECT {select_sql}, page.total FROM ("
+            f"SELECT rowid AS card_rowid, COUNT(*) OVER () AS total FROM cards{where_sql} "
+            "LIMIT ? OFFSET ?"
+            ") AS page JOIN cards ON cards.rowid = page.card_rowid"
+        )
+        params.extend([limit, offset])
+
         cursor = self._conn.cursor()
         cursor.execute(query, params)
-        return [self._row_to_dict(row) for row in cursor.fetchall()]
+        cards = []
+        total = 0
+        for row in cursor:
+            card = self._row_to_dict(row)
+            total = card.pop("total")
+            cards.append(card)
+
+        # A page past the end has no rows to carry the total
+        if not cards and offset > 0:
+            total = self.count_matches(parsed)
+        return cards, total
 
     def count_matches(self, parsed: ParsedQuery) -> int:
         """Count total matching cards for a query (without pagination).
@@ -1177,42 +2356,65 @@ class CardStore:
             Total count of matching cards
         """
         where_clause, params = self._build_where_clause(parsed)
+        if where_clause == IMPOSSIBLE_CONDITION:
+            return 0
 
         if where_clause:
-            query = f"SELECT COUNT(*) FROM cards WHERE {where_clause}"
+            query = f"{COUNT_ALL_SQL} WHERE {where_clause}"
         else:
-            query = "SELECT COUNT(*) FROM cards"
+            query = COUNT_ALL_SQL
 
-        cursor = self._conn.cursor()
-        cursor.execute(query, params)
-        return cursor.fetchone()[0]
+        return self._conn.execute(query, params).fetchone()[0]
 
-    def get_random_card(self, parsed: ParsedQuery | None = None) -> dict[str, Any] | None:
+    def get_random_card(
+        self,
+        parsed: ParsedQuery | None = None,
+        columns: list[str] | None = None,
+    ) -> dict[str, Any] | None:
         """Get a random card, optionally filtered.
 
         Args:
             parsed: Optional ParsedQuery for filtering
+            columns: Optional subset of CARD_COLUMNS to return (default: all)
 
         Returns:
             Random card dictionary or None if no matches
+
+        Raises:
+            ValueError: If columns contains an unknown column
         """
+        select_sql = _projection_sql(columns)
         cursor = self._conn.cursor()
 
-        # No filter - random from all cards
-        if not parsed or (parsed.is_empty and not parsed.has_or_clause):
-            cursor.execute("SELECT * FROM cards ORDER BY RANDOM() LIMIT 1")
-            row = cursor.fetchone()
-            return self._row_to_dict(row) if row else None
-
-        # Use shared WHERE clause builder for filtered queries
-        where_clause, params = self._build_where_clause(parsed)
-
-        if where_clause:
-            query = f"SELECT * FROM cards WHERE {where_clause} ORDER BY RANDOM() LIMIT 1"
+        where_clause = None
+        params: list[Any] = []
+        if parsed and not (parsed.is_empty and not parsed.has_or_clause):
+            # Use shared WHERE clause builder for filtered queries
+            where_clause, params = self._build_where_clause(parsed)
+            if where_clause == IMPOSSIBLE_CONDITION:
+                return None
+
+        if where_clause is None:
+            # No filter - seek to a random rowid instead of sorting every row
+            # by RANDOM(). Taking the next row at or after the pick skips holes
+            # left by deleted rows.
+            max_rowid = cursor.execute(MAX_ROWID_SQL).fetchone()[0]
+            if max_rowid is None:
+                return None
+            cursor.execute(
+                f"SELECT {select_sql} FROM cards WHERE rowid >= ? ORDER BY rowid LIMIT 1",
+                [random.randint(1, max_rowid)],
+            )
         else:
-            query = "SELECT * FROM cards ORDER BY RANDOM() LIMIT 1"
-            params = []
+            # Filtered - pick a random matching rowid in one pass (SQLite keeps
+            # just the best row for ORDER BY ... LIMIT 1, no full sort), then
+            # read only that row. Counting first and skipping to a random
+            # OFFSET walked the matches about 1.5 times on average.
+            cursor.execute(
+                f"SELECT {select_sql} FROM cards WHERE rowid = ("
+                f"SELECT rowid FROM cards WHERE {where_clause} ORDER BY random() LIMIT 1)",
+                params,
+            )
 
-        cursor.execute(query, params)
         row = cursor.fetchone()
         return self._row_to_dict(row) if row else None
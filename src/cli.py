@@ -7,7 +7,20 @@ from pathlib import Path
 
 from src.data_manager import DataManager
 from src.card_store import CardStore
-from src.import_utils import import_cards_streaming
+from src.import_utils import (
+    DOWNLOAD_ERRORS,
+    IMPORT_BATCH_SIZE,
+    download_and_import,
+    import_cards_streaming,
+)
+
+
+PROGRESS_BAR_LENGTH = 40
+# Every bar print_progress_bar can draw, indexed by filled cells
+_PROGRESS_BARS = [
+    "█" * filled + "░" * (PROGRESS_BAR_LENGTH - filled)
+    for filled in range(PROGRESS_BAR_LENGTH + 1)
+]
 
 
 def format_size(bytes_size: int) -> str:
@@ -25,7 +38,6 @@ def print_progress_bar(downloaded: int, total: int) -> None:
     Matches the Callable[[int, int], None] signature expected by
     DataManager.download_bulk_data progress_callback parameter.
     """
-    bar_length = 40
     if total is None or total <= 0:
         # Unknown or invalid total - show indeterminate progress only if we have data
         if downloaded > 0:
@@ -35,8 +47,8 @@ def print_progress_bar(downloaded: int, total: int) -> None:
         return
 
     percent = downloaded / total
-    filled = int(bar_length * percent)
-    bar = "█" * filled + "░" * (bar_length - filled)
+    # Clamp in case the server sends more bytes than its Content-Length
+    bar = _PROGRESS_BARS[min(int(PROGRESS_BAR_LENGTH * percent), PROGRESS_BAR_LENGTH)]
 
     downloaded_str = format_size(downloaded)
     total_str = format_size(total)
@@ -45,10 +57,26 @@ def print_progress_bar(downloaded: int, total: int) -> None:
     sys.stdout.flush()
 
 
+def positive_int(value: str) -> int:
+    """Parse a strictly positive integer command-line argument."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
 async def download_data(
-    data_dir: Path, data_type: str = "all_cards", force: bool = False
+    data_dir: Path,
+    data_type: str = "all_cards",
+    force: bool = False,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    keep_json: bool = True,
 ) -> None:
-    """Download bulk data with progress bar."""
+    """Download bulk data with progress bar.
+
+    With keep_json=False the JSON is streamed straight into the database and
+    not left in the data directory.
+    """
     manager = DataManager(data_dir)
 
     print("Checking for updates...")
@@ -78,27 +106,53 @@ async def download_data(
         print(f"  Updated: {info.get('updated_at', 'unknown')}")
         print()
 
-        # Download with progress
-        file_path = await manager.download_bulk_data(
-            data_type,
-            progress_callback=print_progress_bar,
-        )
+        db_path = data_dir / "cards.db"
 
-        print()  # New line after progress bar
-        print(f"Downloaded to: {file_path}")
+        # Import while the file downloads; if the download fails, fall back
+        # to a separate download (with retries) and import. Import errors
+        # propagate: downloading again would only repeat them.
+        try:
+            file_path, total_cards = await download_and_import(
+                manager,
+                data_type,
+                db_path,
+                batch_size,
+                keep_json,
+                progress_callback=print_progress_bar,
+            )
+            print()  # New line after progress bar
+            if file_path:
+                print(f"Downloaded to: {file_path}")
+        except DOWNLOAD_ERRORS as e:
+            print()
+            print(f"Streaming download failed ({e}); downloading again before importing.")
+            print()
 
-        # Import into database using streaming parser
-        print()
-        print("Importing cards into database...")
+            # Download with progress
+            file_path = await manager.download_bulk_data(
+                data_type,
+                progress_callback=print_progress_bar,
+                defer_metadata=True,
+            )
 
-        db_path = data_dir / "cards.db"
+            print()  # New line after progress bar
+            print(f"Downloaded to: {file_path}")
 
-        def import_progress(imported: int) -> None:
-            sys.stdout.write(f"\r  Importing... {imported:,} cards")
-            sys.stdout.flush()
+            # Import into database using streaming parser
+            print()
+            print("Importing cards into database...")
 
-        with CardStore(db_path) as store:
-            total_cards = import_cards_streaming(file_path, store, progress_callback=import_progress)
+            def import_progress(imported: int) -> None:
+                sys.stdout.write(f"\r  Importing... {imported:,} cards")
+                sys.stdout.flush()
+
+            with CardStore(db_path) as store:
+                total_cards = import_cards_streaming(
+                    file_path, store, batch_size=batch_size, progress_callback=import_progress
+                )
+
+            if not keep_json:
+                file_path.unlink(missing_ok=True)
 
         print()
         print(f"Import complete! {total_cards:,} cards imported.")
@@ -143,14 +197,16 @@ async def show_status(data_dir: Path) -> None:
         await manager.close()
 
 
-async def import_data(data_dir: Path, json_file: Path | None = None) -> None:
+async def import_data(
+    data_dir: Path, json_file: Path | None = None, batch_size: int = IMPORT_BATCH_SIZE
+) -> None:
     """Import cards from JSON file into database."""
     manager = DataManager(data_dir)
 
     try:
         # Find JSON file if not specified
         if json_file is None:
-            json_files = list(data_dir.glob("*.json"))
+            json_files = [*data_dir.glob("*.json"), *data_dir.glob("*.json.gz")]
             json_files = [f for f in json_files if f.name != "metadata.json"]
 
             if not json_files:
@@ -185,7 +241,9 @@ async def import_data(data_dir: Path, json_file: Path | None = None) -> None:
 
         # Use context manager to ensure store is closed even on error
         with CardStore(db_path) as store:
-            total_cards = import_cards_streaming(json_file, store, progress_callback=import_progress)
+            total_cards = import_cards_streaming(
+                json_file, store, batch_size=batch_size, progress_callback=import_progress
+            )
 
         print()
         print()
@@ -229,6 +287,18 @@ def main() -> None:
         action="store_true",
         help="Force re-download even if data is current",
     )
+    download_parser.add_argument(
+        "--batch-size",
+        type=positive_int,
+        default=IMPORT_BATCH_SIZE,
+        help=f"Cards parsed per insert batch (default: {IMPORT_BATCH_SIZE})",
+    )
+    download_parser.add_argument(
+        "--no-keep-json",
+        dest="keep_json",
+        action="store_false",
+        help="Import while streaming without saving the JSON file to disk",
+    )
 
     # Import command
     import_parser = subparsers.add_parser(
@@ -240,6 +310,12 @@ def main() -> None:
         type=Path,
         help="JSON file to import (auto-detects if not specified)",
     )
+    import_parser.add_argument(
+        "--batch-size",
+        type=positive_int,
+        default=IMPORT_BATCH_SIZE,
+        help=f"Cards parsed per insert batch (default: {IMPORT_BATCH_SIZE})",
+    )
 
     # Status command
     subparsers.add_parser(
@@ -253,9 +329,11 @@ def main() -> None:
     args.data_dir.mkdir(parents=True, exist_ok=True)
 
     if args.command == "download":
-        asyncio.run(download_data(args.data_dir, args.type, args.force))
+        asyncio.run(
+            download_data(args.data_dir, args.type, args.force, args.batch_size, args.keep_json)
+        )
     elif args.command == "import":
-        asyncio.run(import_data(args.data_dir, getattr(args, "file", None)))
+        asyncio.run(import_data(args.data_dir, getattr(args, "file", None), args.batch_size))
     elif args.command == "status":
         asyncio.run(show_status(args.data_dir))
     else:
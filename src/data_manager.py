@@ -4,16 +4,20 @@ Handles downloading, caching, and freshness checking of Scryfall bulk data.
 Implements security measures for URL validation and path traversal prevention.
 """
 
-import json
 import logging
+import os
 import re
+import time
+import zlib
+from contextlib import nullcontext
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, Awaitable, Callable
 from urllib.parse import urlparse
 
 import httpx
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -23,10 +27,58 @@ ALLOWED_DOMAINS = [
     "api.scryfall.com",
     "data.scryfall.io",
 ]
+_ALLOWED_DOMAIN_SET = frozenset(ALLOWED_DOMAINS)
+# A URL starting with one of these has an allowed https netloc, so
+# is_valid_download_url can accept it without parsing
+_ALLOWED_URL_PREFIXES = tuple(f"https://{domain}/" for domain in ALLOWED_DOMAINS)
+
+# Characters allowed in a downloaded file's name (matched against the whole name)
+SAFE_FILENAME_RE = re.compile(r"[a-zA-Z0-9_.-]+")
+
+# Longest file name most filesystems accept
+MAX_FILENAME_LENGTH = 255
 
 # API endpoints
 BULK_DATA_ENDPOINT = "https://api.scryfall.com/bulk-data"
 
+# Seconds an idle HTTP connection is kept open for reuse
+HTTP_KEEPALIVE_EXPIRY = 60.0
+
+# Seconds a fetched bulk-data catalog is reused. One CLI command checks
+# staleness, then looks up the download and status, all within a second.
+CATALOG_CACHE_TTL = 60.0
+
+# Bounds for the streamed download read size. Bulk files run to several GB,
+# where 8 KiB reads meant hundreds of thousands of event-loop iterations.
+DOWNLOAD_CHUNK_MIN = 64 * 1024
+DOWNLOAD_CHUNK_MAX = 1024 * 1024
+# Write buffer for the downloaded file, so small chunks are coalesced into
+# a few large write() calls instead of one syscall per chunk
+DOWNLOAD_WRITE_BUFFER_SIZE = 8 * 1024 * 1024
+
+# Ask for gzip only: it is stored on disk as received (see
+# download_bulk_data) and read back with the standard library, whereas
+# br/zstd, which httpx advertises when brotli/zstandard are installed,
+# would be decoded and stored uncompressed
+DOWNLOAD_HEADERS = {"Accept-Encoding": "gzip"}
+
+# download_bulk_data reports progress about this many times per file, and at
+# most once per PROGRESS_MIN_BYTES, so the callback's terminal I/O stays cheap
+PROGRESS_UPDATES = 200
+PROGRESS_MIN_BYTES = 1024 * 1024
+
+
+def download_chunk_size(total_size: int) -> int:
+    """Pick a read size of roughly 1/1024 of the file, within the bounds.
+
+    Args:
+        total_size: Content-Length of the download (0 if unknown)
+
+    Returns:
+        Chunk size in bytes for response.aiter_bytes
+    """
+    return max(DOWNLOAD_CHUNK_MIN, min(DOWNLOAD_CHUNK_MAX, total_size // 1024))
+
 
 @dataclass
 class DataStatus:
@@ -50,17 +102,36 @@ class DataStatus:
 class DataManager:
     """Manages downloading and caching of Scryfall bulk data."""
 
-    def __init__(self, data_dir: Path):
+    def __init__(self, data_dir: Path, chunk_size: int | None = None):
         """Initialize data manager.
 
         Args:
             data_dir: Directory for storing downloaded data
+            chunk_size: Fixed read size in bytes for bulk downloads; by
+                default download_chunk_size picks one from the file size
+
+        Raises:
+            ValueError: If chunk_size is less than 1
         """
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+        self.chunk_size = chunk_size
         self.data_dir = data_dir
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
         self._metadata_path = data_dir / "metadata.json"
         self._http_client: httpx.AsyncClient | None = None
+        # (time.monotonic() at fetch, catalog, catalog entries by type) for
+        # fetch_catalog and get_bulk_data_info
+        self._catalog_cache: (
+            tuple[float, dict[str, Any], dict[str, dict[str, Any]]] | None
+        ) = None
+        # ETag/Last-Modified of the last catalog fetched, saved with a
+        # download so a later staleness check can make a conditional request
+        self._catalog_validators: dict[str, str] = {}
+        # Metadata of a download made with defer_metadata, written by
+        # update_card_count once the import has succeeded
+        self._pending_metadata: dict[str, Any] | None = None
 
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client."""
@@ -69,17 +140,22 @@ class DataManager:
                 timeout=httpx.Timeout(30.0, read=300.0),
                 # Don't follow redirects automatically - we validate redirect URLs
                 follow_redirects=False,
+                # Keep idle connections longer than httpx's 5s default so a
+                # long-running server's periodic catalog checks reuse the
+                # TLS connection instead of handshaking again
+                limits=httpx.Limits(keepalive_expiry=HTTP_KEEPALIVE_EXPIRY),
             )
         return self._http_client
 
     async def _validated_get(
-        self, url: str, stream: bool = False
+        self, url: str, stream: bool = False, headers: dict[str, str] | None = None
     ) -> httpx.Response:
         """Perform GET request with redirect URL validation.
 
         Args:
             url: URL to fetch
             stream: Whether to stream the response
+            headers: Optional extra request headers
 
         Returns:
             Response object
@@ -93,13 +169,14 @@ class DataManager:
         for _ in range(max_redirects):
             if stream:
                 response = await client.send(
-                    client.build_request("GET", url),
+                    client.build_request("GET", url, headers=headers),
                     stream=True,
                 )
             else:
-                response = await client.get(url)
+                response = await client.get(url, headers=headers)
 
-            if response.is_redirect:
+            # is_redirect covers every 3xx; a 304 answers a conditional request
+            if response.is_redirect and response.status_code != httpx.codes.NOT_MODIFIED:
                 redirect_url = response.headers.get("location")
                 if not redirect_url:
                     raise ValueError("Redirect response missing location header")
@@ -154,6 +231,9 @@ class DataManager:
         if not url:
             return False
 
+        if url.startswith(_ALLOWED_URL_PREFIXES):
+            return True
+
         try:
             parsed = urlparse(url)
         except Exception:
@@ -164,7 +244,7 @@ class DataManager:
             return False
 
         # Must be from allowed domain
-        if parsed.netloc not in ALLOWED_DOMAINS:
+        if parsed.netloc not in _ALLOWED_DOMAIN_SET:
             return False
 
         return True
@@ -178,7 +258,7 @@ class DataManager:
         Returns:
             True if filename is safe
         """
-        if not filename:
+        if not filename or len(filename) > MAX_FILENAME_LENGTH:
             return False
 
         # Check for path traversal patterns
@@ -188,8 +268,9 @@ class DataManager:
         if filename.startswith("/") or filename.startswith("\\"):
             return False
 
-        # Only allow alphanumeric, dash, underscore, dot
-        if not re.match(r"^[a-zA-Z0-9_.-]+$", filename):
+        # Only allow alphanumeric, dash, underscore, dot. fullmatch, unlike
+        # "^...$", also rejects a trailing newline.
+        if not SAFE_FILENAME_RE.fullmatch(filename):
             return False
 
         return True
@@ -197,12 +278,83 @@ class DataManager:
     async def fetch_catalog(self) -> dict[str, Any]:
         """Fetch bulk data catalog from Scryfall.
 
+        A catalog fetched within the last CATALOG_CACHE_TTL seconds is
+        reused, so a staleness check followed by a download lookup makes
+        one request instead of two.
+
         Returns:
             Catalog dictionary with available bulk data types
         """
+        if self._catalog_cache is not None:
+            fetched_at, catalog, _ = self._catalog_cache
+            if time.monotonic() - fetched_at < CATALOG_CACHE_TTL:
+                return catalog
+
         response = await self._validated_get(BULK_DATA_ENDPOINT)
         response.raise_for_status()
-        return response.json()
+        return self._cache_catalog(response)
+
+    def _cache_catalog(self, response: httpx.Response) -> dict[str, Any]:
+        """Parse a 200 catalog response into the cache and record its validators.
+
+        Args:
+            response: Successful response from BULK_DATA_ENDPOINT
+
+        Returns:
+            The parsed catalog
+        """
+        catalog = orjson.loads(response.content)
+        by_type: dict[str, dict[str, Any]] = {}
+        for item in catalog.get("data", []):
+            # First entry wins, as the old linear scan did
+            by_type.setdefault(item.get("type"), item)
+        self._catalog_cache = (time.monotonic(), catalog, by_type)
+        self._catalog_validators = {
+            key: value
+            for key, value in (
+                ("catalog_etag", response.headers.get("ETag")),
+                ("catalog_last_modified", response.headers.get("Last-Modified")),
+            )
+            if value
+        }
+        return catalog
+
+    async def _catalog_not_modified(self, metadata: dict[str, Any]) -> bool:
+        """Ask the server whether the catalog changed since the local download.
+
+        Sends a conditional request with the validators saved in metadata.
+        A 200 response is cached like fetch_catalog's, so the caller's
+        catalog lookup that follows costs no second request.
+
+        Args:
+            metadata: Local metadata, possibly holding catalog validators
+
+        Returns:
+            True if the server answered 304 Not Modified; False if it sent
+            the catalog, or if there is nothing to validate against or a
+            fresh catalog is already cached
+
+        Raises:
+            httpx.HTTPError: If the request fails
+        """
+        if self._catalog_cache is not None:
+            if time.monotonic() - self._catalog_cache[0] < CATALOG_CACHE_TTL:
+                return False
+
+        headers = {}
+        if etag := metadata.get("catalog_etag"):
+            headers["If-None-Match"] = etag
+        if last_modified := metadata.get("catalog_last_modified"):
+            headers["If-Modified-Since"] = last_modified
+        if not headers:
+            return False
+
+        response = await self._validated_get(BULK_DATA_ENDPOINT, headers=headers)
+        if response.status_code == 304:
+            return True
+        response.raise_for_status()
+        self._cache_catalog(response)
+        return False
 
     async def get_bulk_data_info(self, data_type: str) -> dict[str, Any] | None:
         """Get info for specific bulk data type.
@@ -213,36 +365,54 @@ class DataManager:
         Returns:
             Bulk data info dictionary or None if not found
         """
-        catalog = await self.fetch_catalog()
-
-        for item in catalog.get("data", []):
-            if item.get("type") == data_type:
-                return item
-
-        return None
+        await self.fetch_catalog()
+        # fetch_catalog always leaves a fresh cache, including the type index
+        return self._catalog_cache[2].get(data_type)
 
     async def download_bulk_data(
         self,
         data_type: str = "oracle_cards",
         progress_callback: Callable[[int, int], None] | None = None,
         max_retries: int = 3,
-    ) -> Path:
+        chunk_callback: Callable[[bytes], Awaitable[None]] | None = None,
+        keep_file: bool = True,
+        defer_metadata: bool = False,
+    ) -> Path | None:
         """Download bulk data file with retry support.
 
         Args:
             data_type: Type of bulk data to download
             progress_callback: Optional callback for progress updates (downloaded, total)
             max_retries: Maximum number of retry attempts (default 3)
+            chunk_callback: Optional coroutine awaited with each chunk after it
+                is written, to process the data while it downloads. Chunks
+                are always decoded JSON, even when the file is kept
+                gzip-compressed. A retry replays the file from the start, so
+                streaming consumers should pass max_retries=0.
+            keep_file: Write the data to the cache directory (default True).
+                With False the data only goes to chunk_callback, which is
+                then required; metadata is still recorded.
+            defer_metadata: Hold the new metadata until update_card_count
+                instead of writing it now, for callers that import the data
+                next. A failed import then leaves the old metadata, and the
+                data still reads as stale.
 
         Returns:
-            Path to downloaded file
+            Path to downloaded file, or None if keep_file is False. When the
+            server sends the body gzip-encoded (as Scryfall does), the
+            compressed bytes are stored as received and the path gets a
+            ".gz" suffix.
 
         Raises:
-            ValueError: If data type is unknown or URL is invalid
+            ValueError: If data type is unknown or URL is invalid, or if
+                keep_file is False without a chunk_callback
             httpx.HTTPError: If download fails after all retries
         """
         import asyncio
 
+        if not keep_file and chunk_callback is None:
+            raise ValueError("keep_file=False requires a chunk_callback")
+
         # Get download info
         info = await self.get_bulk_data_info(data_type)
         if not info:
@@ -278,20 +448,65 @@ class DataManager:
 
             try:
                 # Download file with validated redirects
-                response = await self._validated_get(download_url, stream=True)
+                response = await self._validated_get(
+                    download_url, stream=True, headers=DOWNLOAD_HEADERS
+                )
                 try:
                     response.raise_for_status()
 
+                    # Keep a gzip-encoded body compressed on disk: bulk JSON
+                    # shrinks several-fold and no decode pass is spent on the
+                    # write path. import_cards_streaming reads ".gz" files.
+                    encoding = response.headers.get("Content-Encoding", "")
+                    stored_gzip = keep_file and encoding.strip().lower() == "gzip"
+                    if stored_gzip:
+                        output_path = self.data_dir / f"{filename}.gz"
+                    else:
+                        output_path = self.data_dir / filename
+                    decoder = (
+                        zlib.decompressobj(zlib.MAX_WBITS | 16)
+                        if stored_gzip and chunk_callback
+                        else None
+                    )
+
                     total_size = int(response.headers.get("Content-Length", 0))
                     downloaded = 0
-
-                    with open(output_path, "wb") as f:
-                        async for chunk in response.aiter_bytes(chunk_size=8192):
-                            f.write(chunk)
+                    chunk_size = self.chunk_size or download_chunk_size(total_size)
+                    progress_step = max(total_size // PROGRESS_UPDATES, PROGRESS_MIN_BYTES)
+                    reported = 0
+
+                    if keep_file:
+                        sink = open(output_path, "wb", buffering=DOWNLOAD_WRITE_BUFFER_SIZE)
+                    else:
+                        sink = nullcontext()
+                    with sink as f:
+                        if stored_gzip:
+                            chunks = response.aiter_raw(chunk_size=chunk_size)
+                        else:
+                            chunks = response.aiter_bytes(chunk_size=chunk_size)
+                        async for chunk in chunks:
+                            if f:
+                                f.write(chunk)
                             downloaded += len(chunk)
+                            if chunk_callback:
+                                await chunk_callback(
+                                    decoder.decompress(chunk) if decoder else chunk
+                                )
 
-                            if progress_callback:
+                            if progress_callback and downloaded - reported >= progress_step:
                                 progress_callback(downloaded, total_size)
+                                reported = downloaded
+
+                    if decoder:
+                        await chunk_callback(decoder.flush())
+                        # The gzip trailer's CRC32 and length are checked as
+                        # it is decoded; a body cut short never reaches it
+                        if not decoder.eof:
+                            raise zlib.error("gzip stream ended before its trailer")
+
+                    # Always report the final size so progress ends at 100%
+                    if progress_callback and downloaded != reported:
+                        progress_callback(downloaded, total_size)
 
                     # Download successful - save metadata and return
                     if attempt > 0:
@@ -301,19 +516,23 @@ class DataManager:
                         "downloaded_at": datetime.now(timezone.utc).isoformat(),
                         "updated_at": info.get("updated_at"),
                         "card_count": 0,  # Will be updated after import
-                        "filename": filename,
+                        "filename": output_path.name if keep_file else None,
+                        **self._catalog_validators,
                     }
 
-                    self._write_metadata_atomic(metadata)
-                    return output_path
+                    if defer_metadata:
+                        self._pending_metadata = metadata
+                    else:
+                        self._write_metadata_atomic(metadata)
+                    return output_path if keep_file else None
 
                 finally:
                     await response.aclose()
 
-            except (httpx.HTTPError, OSError) as e:
+            except (httpx.HTTPError, OSError, zlib.error) as e:
                 last_error = e
                 # Remove partial download on error
-                if output_path.exists():
+                if keep_file and output_path.exists():
                     try:
                         output_path.unlink()
                     except OSError:
@@ -333,15 +552,16 @@ class DataManager:
             return None
 
         try:
-            with open(self._metadata_path) as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
+            return orjson.loads(self._metadata_path.read_bytes())
+        except (orjson.JSONDecodeError, OSError):
             return None
 
     def _write_metadata_atomic(self, metadata: dict[str, Any]) -> None:
         """Write metadata file atomically using write-to-temp-then-rename.
 
-        This prevents corruption if the process crashes mid-write.
+        This prevents corruption if the process crashes mid-write. The temp
+        file is fsynced before the rename, so after a crash the metadata is
+        either the old or the new version, never a truncated file.
 
         Args:
             metadata: Metadata dictionary to write
@@ -355,8 +575,16 @@ class DataManager:
             suffix=".tmp"
         )
         try:
-            with open(temp_fd, "w") as f:
-                json.dump(metadata, f)
+            try:
+                f = os.fdopen(temp_fd, "wb")
+            except Exception:
+                # fdopen did not take ownership of the descriptor
+                os.close(temp_fd)
+                raise
+            with f:
+                f.write(orjson.dumps(metadata))
+                f.flush()
+                os.fsync(f.fileno())
             # Atomic rename (on POSIX systems)
             Path(temp_path).replace(self._metadata_path)
         except Exception:
@@ -373,31 +601,49 @@ class DataManager:
         Returns:
             True if cache is stale or doesn't exist
         """
-        metadata = self._load_metadata()
+        return await self._is_stale(self._load_metadata())
 
-        if not metadata:
-            return True
+    async def _is_stale(self, metadata: dict[str, Any] | None) -> bool:
+        """Check already-loaded metadata against the (cached) server catalog.
 
-        local_updated = metadata.get("updated_at")
-        if not local_updated:
+        Args:
+            metadata: Local metadata, or None if there is none
+
+        Returns:
+            True if the data is stale or staleness cannot be determined
+        """
+        if not metadata or not metadata.get("updated_at"):
             return True
 
-        # Fetch server info
         try:
+            # The catalog is unchanged since the download, so is its updated_at
+            if await self._catalog_not_modified(metadata):
+                return False
             info = await self.get_bulk_data_info(metadata.get("type", "all_cards"))
-            if not info:
-                return True
+        except Exception:
+            # If we can't check, assume stale
+            return True
 
-            server_updated = info.get("updated_at")
-            if not server_updated:
-                return True
+        return self._is_stale_from_info(metadata, info)
 
-            # Compare timestamps
-            return local_updated != server_updated
+    @staticmethod
+    def _is_stale_from_info(
+        metadata: dict[str, Any], info: dict[str, Any] | None
+    ) -> bool:
+        """Compare local metadata with a bulk data catalog entry.
 
-        except Exception:
-            # If we can't check, assume stale
+        Args:
+            metadata: Local metadata dictionary
+            info: Catalog entry for the metadata's data type, or None
+
+        Returns:
+            True unless both sides have the same updated_at timestamp
+        """
+        local_updated = metadata.get("updated_at")
+        server_updated = info.get("updated_at") if info else None
+        if not local_updated or not server_updated:
             return True
+        return local_updated != server_updated
 
     async def get_status(self) -> DataStatus:
         """Get status of local data cache.
@@ -424,11 +670,8 @@ class DataManager:
             except ValueError:
                 pass
 
-        # Check staleness
-        try:
-            is_stale = await self.is_cache_stale()
-        except Exception:
-            is_stale = True
+        # Check staleness against the metadata already loaded
+        is_stale = await self._is_stale(metadata)
 
         return DataStatus(
             last_updated=last_updated,
@@ -440,9 +683,13 @@ class DataManager:
     def update_card_count(self, count: int) -> None:
         """Update card count in metadata.
 
+        Metadata held back by download_bulk_data(defer_metadata=True) is
+        written here along with the count, in a single write.
+
         Args:
             count: Number of cards imported
         """
-        metadata = self._load_metadata() or {}
+        metadata = self._pending_metadata or self._load_metadata() or {}
+        self._pending_metadata = None
         metadata["card_count"] = count
         self._write_metadata_atomic(metadata)
@@ -8,6 +8,7 @@ Boolean operators: implicit AND, explicit OR, negation (-).
 import logging
 import re
 from dataclasses import dataclass, field
+from functools import cached_property
 from typing import Any
 
 logger = logging.getLogger(__name__)
@@ -99,6 +100,14 @@ IDENTITY_MAP = {
     "wubrg": ["W", "U", "B", "R", "G"], "fivecolor": ["W", "U", "B", "R", "G"],
 }
 
+# Filter types that can repeat (e.g., keyword:flying keyword:trample); their
+# values are always lists, and repeated values are ANDed together
+MULTI_VALUE_FILTERS = frozenset({
+    "keyword", "keyword_not", "type", "type_not", "oracle_text", "oracle_text_not",
+    "flavor_text", "flavor_text_not", "produces_token", "produces_token_not",
+    "name_partial", "name_partial_not",
+})
+
 
 class QueryError(Exception):
     """Error parsing a query with helpful hints."""
@@ -137,6 +146,26 @@ class ParsedQuery:
         """Count total number of filters."""
         return len(self.filters)
 
+    @cached_property
+    def or_merged_groups(self) -> list[dict[str, Any]]:
+        """OR groups with each group's filter dicts merged into one.
+
+        Repeated multi-value filters (lists) accumulate, so e.g. t:elf
+        t:warrior keeps both. Computed once per query, so paging through the
+        same ParsedQuery doesn't redo the merge.
+        """
+        merged_groups = []
+        for group_filters in self.or_groups:
+            merged: dict[str, Any] = {}
+            for f in group_filters:
+                for key, value in f.items():
+                    if isinstance(value, list) and isinstance(merged.get(key), list):
+                        merged[key] = merged[key] + value
+                    else:
+                        merged[key] = value
+            merged_groups.append(merged)
+        return merged_groups
+
     def __str__(self) -> str:
         """Human-readable representation."""
         parts = []
@@ -442,17 +471,12 @@ class QueryParser:
 
             if filter_key and filter_value is not None:
                 # Handle multiple values for same filter type (e.g., keyword:flying keyword:trample)
-                # These filter types can have multiple values that should be ANDed together
-                multi_value_filters = {'keyword', 'keyword_not', 'type', 'type_not', 'oracle_text', 'oracle_text_not', 'flavor_text', 'flavor_text_not', 'produces_token', 'produces_token_not', 'name_partial', 'name_partial_not'}
-
-                if filter_key in multi_value_filters:
-                    if filter_key not in filters:
-                        filters[filter_key] = [filter_value]
-                    else:
-                        filters[filter_key].append(filter_value)
+                if filter_key in MULTI_VALUE_FILTERS:
+                    filters.setdefault(filter_key, []).append(filter_value)
+                    current_group.append({filter_key: [filter_value]})
                 else:
                     filters[filter_key] = filter_value
-                current_group.append({filter_key: filter_value})
+                    current_group.append({filter_key: filter_value})
 
             negated = False
             i += 1
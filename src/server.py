@@ -5,7 +5,6 @@ Scryfall bulk data. Uses the low-level MCP Server class for educational purposes
 """
 
 import asyncio
-import json
 import time
 from dataclasses import dataclass
 from pathlib import Path
@@ -15,16 +14,20 @@ import mcp.types as types
 from mcp.server.lowlevel import Server, NotificationOptions
 from mcp.server.models import InitializationOptions
 import mcp.server.stdio
+import orjson
 
 from src import __version__
-from src.card_store import CardStore
+from src.card_store import CARD_COLUMNS, CardStore
 from src.data_manager import DataManager
-from src.import_utils import import_cards_streaming
+from src.import_utils import DOWNLOAD_ERRORS, download_and_import, import_cards_streaming
 from src.query_parser import QueryParser, QueryError, SUPPORTED_SYNTAX, SYNTAX_SUMMARY
 
 # Server name constant - used in multiple places
 SERVER_NAME = "scryfall-local"
 
+# Card fields search_cards can project to (cards expose set_code as "set")
+CARD_FIELDS = tuple("set" if column == "set_code" else column for column in CARD_COLUMNS)
+
 
 @dataclass
 class Tool:
@@ -151,6 +154,12 @@ class ScryfallServer:
                             "default": 0,
                             "minimum": 0,
                         },
+                        "fields": {
+                            "type": "array",
+                            "items": {"type": "string", "enum": list(CARD_FIELDS)},
+                            "description": "Only return these card fields (default: all). "
+                            "Smaller, faster results, e.g. ['name', 'mana_cost', 'type_line']",
+                        },
                     },
                     "required": ["query"],
                 },
@@ -254,7 +263,7 @@ class ScryfallServer:
         """Search for cards.
 
         Args:
-            arguments: {"query": str, "limit": int, "offset": int}
+            arguments: {"query": str, "limit": int, "offset": int, "fields": [...]}
 
         Returns:
             {"cards": [...], "total_count": int, "query_time_ms": int, "offset": int}
@@ -262,6 +271,8 @@ class ScryfallServer:
         query = arguments.get("query", "")
         limit = max(1, min(arguments.get("limit", 20), 100))
         offset = max(0, arguments.get("offset", 0))
+        # Projecting columns also skips decoding the JSON ones nobody asked for
+        fields = arguments.get("fields") or None
 
         start_time = time.time()
 
@@ -277,8 +288,15 @@ class ScryfallServer:
         # Wait for any ongoing refresh to complete
         async with self._refresh_lock:
             store = self._get_store()
-            cards = store.execute_query(parsed, limit=limit, offset=offset)
-            total_count = store.count_matches(parsed)
+            try:
+                cards, total_count = store.execute_query_with_count(
+                    parsed, limit=limit, offset=offset, columns=fields
+                )
+            except ValueError as e:
+                return {
+                    "error": str(e),
+                    "hint": f"Valid fields: {', '.join(CARD_FIELDS)}",
+                }
 
         elapsed_ms = int((time.time() - start_time) * 1000)
 
@@ -434,11 +452,12 @@ class ScryfallServer:
 
         return result
 
-    def _import_cards_blocking(self, file_path: Path) -> int:
+    def _import_cards_blocking(self, file_path: Path, db_path: Path) -> int:
         """Import cards from JSON file (blocking I/O, runs in thread).
 
         Args:
             file_path: Path to the JSON file
+            db_path: Database file to import into
 
         Returns:
             Number of cards imported
@@ -446,15 +465,10 @@ class ScryfallServer:
         Raises:
             ImportError: If ijson is not installed (required for streaming JSON parsing)
         """
-        # Note: Store connection closing and database deletion is handled by
-        # _do_refresh() in the main thread BEFORE calling this method.
-        # This is necessary because SQLite connections can only be used in the
-        # thread where they were created.
-
         # Create a LOCAL store connection for this thread - do NOT use _get_store()
         # which would set self._store and cause threading issues when the main
         # thread later tries to use it.
-        store = CardStore(self.db_path)
+        store = CardStore(db_path)
 
         try:
             return import_cards_streaming(file_path, store)
@@ -462,41 +476,67 @@ class ScryfallServer:
             # Close the worker thread's connection
             store.close()
 
+    @staticmethod
+    def _remove_database(db_path: Path) -> None:
+        """Delete a database file along with any WAL and shared-memory files."""
+        for path in (db_path, Path(f"{db_path}-wal"), Path(f"{db_path}-shm")):
+            path.unlink(missing_ok=True)
+
     async def _do_refresh(self) -> None:
-        """Perform the actual download and import (runs in background)."""
+        """Perform the actual download and import (runs in background).
+
+        Cards are imported into a staging database while the file downloads,
+        so queries keep using the current database until the new one is
+        complete; only the final swap holds the refresh lock.
+        """
+        staging_path = self.db_path.with_name(f"{self.db_path.name}.refresh")
         try:
             self._refresh_status = "downloading"
+            self._remove_database(staging_path)
 
-            # Download bulk data
-            file_path = await self._data_manager.download_bulk_data("all_cards")
+            try:
+                _, card_count = await download_and_import(
+                    self._data_manager, "all_cards", staging_path
+                )
+            except DOWNLOAD_ERRORS:
+                # A streamed download cannot be retried mid-way; fall back to
+                # a download with retries, then import the finished file.
+                # Import errors skip this: they would only fail again.
+                self._remove_database(staging_path)
+                file_path = await self._data_manager.download_bulk_data(
+                    "all_cards", defer_metadata=True
+                )
 
-            self._refresh_status = "importing"
+                self._refresh_status = "importing"
+                # Run blocking I/O in thread pool to avoid blocking event loop
+                card_count = await asyncio.to_thread(
+                    self._import_cards_blocking, file_path, staging_path
+                )
 
             # Acquire lock to prevent queries during database replacement
             async with self._refresh_lock:
-                # Close existing store connection in THIS thread (main/async thread)
-                # before running import in worker thread. SQLite connections can only
-                # be used in the thread where they were created.
+                # Close existing store connection in THIS thread (main/async thread).
+                # SQLite connections can only be used in the thread where they
+                # were created.
                 if self._store is not None:
                     self._store.close()
                     self._store = None
 
-                # Remove old database
-                if self.db_path.exists():
-                    self.db_path.unlink()
-
-                # Run blocking I/O in thread pool to avoid blocking event loop
-                card_count = await asyncio.to_thread(
-                    self._import_cards_blocking, file_path
-                )
+                # Drop the old WAL first so it is never replayed onto the new
+                # file; the staging store was closed cleanly, so it is a
+                # single file and the rename atomically replaces the old one
+                for suffix in ("-wal", "-shm"):
+                    Path(f"{self.db_path}{suffix}").unlink(missing_ok=True)
+                staging_path.replace(self.db_path)
 
-            # Update metadata with card count
+            # Record the download's metadata now that its cards are live
             self._data_manager.update_card_count(card_count)
 
             self._refresh_status = "completed"
 
         except Exception as e:
             self._refresh_status = f"error: {str(e)}"
+            self._remove_database(staging_path)
 
         finally:
             self._refresh_task = None
@@ -592,7 +632,7 @@ def create_server(data_dir: Path) -> tuple[Server, ScryfallServer]:
         return [
             types.TextContent(
                 type="text",
-                text=json.dumps(result, default=str),
+                text=orjson.dumps(result, default=str, option=orjson.OPT_NON_STR_KEYS).decode(),
             )
         ]
 
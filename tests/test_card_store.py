@@ -7,7 +7,7 @@ from pathlib import Path
 from typing import Any
 
 from src.card_store import CardStore
-from src.query_parser import ParsedQuery
+from src.query_parser import ParsedQuery, QueryParser
 
 
 class TestCardStoreSchema:
@@ -34,6 +34,30 @@ class TestCardStoreSchema:
 
             store.close()
 
+    def test_mmap_enabled(self):
+        """Memory-mapped I/O should be enabled for read-heavy queries."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            result = store._conn.execute("PRAGMA mmap_size").fetchone()
+            assert result[0] > 0
+            assert store._conn.execute("PRAGMA page_size").fetchone()[0] == 8192
+            store.close()
+
+    def test_cards_table_is_strict(self):
+        """New databases should create the cards table with STRICT typing."""
+        import sqlite3
+
+        if sqlite3.sqlite_version_info < (3, 37, 0):
+            pytest.skip("STRICT tables require SQLite 3.37+")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            sql = store._conn.execute(
+                "SELECT sql FROM sqlite_master WHERE name = 'cards'"
+            ).fetchone()[0]
+            assert sql.rstrip().endswith("STRICT")
+            store.close()
+
     def test_wal_mode_enabled(self):
         """WAL mode should be enabled for better concurrent read performance."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -46,6 +70,82 @@ class TestCardStoreSchema:
 
             store.close()
 
+    def test_set_and_rarity_count_uses_covering_index(self, sample_cards: list[dict[str, Any]]):
+        """Counting set+rarity matches should be answered from an index alone."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            store.insert_cards(sample_cards)
+
+            conditions, params = store._build_conditions_for_filters({"set": "leb", "rarity": "rare"})
+            plan = store._conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT COUNT(*) FROM cards WHERE {' AND '.join(conditions)}",
+                params,
+            ).fetchall()
+            assert any("COVERING INDEX idx_set_rarity_cn" in row[3] for row in plan)
+
+            store.close()
+
+    def test_connection_tuned_for_reads(self):
+        """Connections should use a large page cache and in-memory temp storage."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / "cards.db"
+            store = CardStore(db_path)
+
+            assert store._conn.execute("PRAGMA cache_size").fetchone()[0] == -64 * 1024
+            assert store._conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+            assert store._conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            store.close()
+
+            reader = CardStore.open_readonly(db_path)
+            assert reader._conn.execute("PRAGMA query_only").fetchone()[0] == 1
+            reader.close()
+
+    def test_insert_refreshes_planner_statistics(self, sample_cards: list[dict[str, Any]]):
+        """Bulk inserts should run ANALYZE so the planner has index statistics."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / "cards.db"
+            store = CardStore(db_path)
+            store.insert_cards(sample_cards)
+
+            rows = store._conn.execute(
+                "SELECT idx FROM sqlite_stat1 WHERE tbl = 'cards'"
+            ).fetchall()
+            assert "idx_set_cmc" in {row[0] for row in rows}
+            store.close()
+
+            # Reopening picks up the recorded row count
+            store = CardStore(db_path)
+            assert store._analyzed_count == len(sample_cards)
+            store.close()
+
+    def test_set_and_rarity_filters_use_nocase_index(self):
+        """Case-insensitive set/rarity/layout filters should seek the NOCASE indexes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+
+            set_indexes = ("idx_set_cmc", "idx_set_rarity_cn")
+            for filters, indexes in (
+                ({"set": "LEA"}, set_indexes),
+                ({"block": "alara"}, set_indexes),
+                ({"rarity": "Mythic"}, ("idx_rarity_cmc",)),
+                ({"layout": "Transform"}, ("idx_layout",)),
+                ({"name_exact": "Lightning Bolt"}, ("idx_name",)),
+            ):
+                conditions, params = store._build_conditions_for_filters(filters)
+                plan = store._conn.execute(
+                    f"EXPLAIN QUERY PLAN SELECT id FROM cards WHERE {' AND '.join(conditions)}",
+                    params,
+                ).fetchall()
+                assert any(f"INDEX {index}" in row[3] for row in plan for index in indexes)
+
+            indexes = {
+                row[0]
+                for row in store._conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+            }
+            assert "idx_name_lower" not in indexes
+
+            store.close()
+
 
 class TestCardStoreInsert:
     """Test card insertion."""
@@ -72,6 +172,46 @@ class TestCardStoreInsert:
 
             store.close()
 
+    def test_insert_cards_in_multi_row_batches(self, monkeypatch, sample_cards: list[dict[str, Any]]):
+        """Full batches and the remainder should insert the same rows as single inserts."""
+        import src.card_store as card_store_module
+
+        monkeypatch.setattr(card_store_module, "INSERT_BATCH_ROWS", 3)
+        cards = [dict(card, id=f"{card['id']}-{i}") for i in range(3) for card in sample_cards]
+        # A re-import of the same card inside one batch must upsert, not fail
+        cards.insert(1, dict(cards[0], name="Renamed"))
+        assert len(cards) % 3 != 0
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            assert len(store._card_to_params(sample_cards[0])) == card_store_module.INSERT_COLUMN_COUNT
+
+            store.insert_cards(cards)
+            assert store.get_card_count() == len(cards) - 1
+            assert store.get_card_by_id(cards[0]["id"])["name"] == "Renamed"
+            # Raises if the FTS index is out of sync with the cards table
+            store._conn.execute("INSERT INTO cards_fts(cards_fts) VALUES('integrity-check')")
+
+            store.close()
+
+    def test_insert_cards_rows_per_statement(self, sample_cards: list[dict[str, Any]]):
+        """rows_per_statement should be validated and capped by the variable limit."""
+        import sqlite3
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+
+            with pytest.raises(ValueError):
+                store.insert_cards(sample_cards, rows_per_statement=0)
+
+            store._conn.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 100)
+            # 100 variables only fit three 28-column rows per statement
+            store.insert_cards(sample_cards, rows_per_statement=1000)
+            assert store.get_card_count() == len(sample_cards)
+            store._conn.execute("INSERT INTO cards_fts(cards_fts) VALUES('integrity-check')")
+
+            store.close()
+
     def test_insert_preserves_all_fields(self, lightning_bolt: dict[str, Any]):
         """Inserted card should have all original fields."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -146,6 +286,48 @@ class TestCardStoreInsert:
 
             store.close()
 
+    def test_raw_data_stored_compressed(self, lightning_bolt: dict[str, Any]):
+        """Full card JSON should be stored compressed and round-trip intact."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            store.insert_card(lightning_bolt)
+
+            raw = store._conn.execute("SELECT raw_data FROM cards").fetchone()[0]
+            assert isinstance(raw, bytes)
+            assert len(raw) < len(json.dumps(lightning_bolt))
+
+            assert store.get_raw_card(lightning_bolt["id"]) == lightning_bolt
+            assert store.get_raw_card("missing-id") is None
+
+            store.close()
+
+    def test_raw_data_skips_column_copies(
+        self,
+        sample_cards: list[dict[str, Any]],
+        double_faced_cards: list[dict[str, Any]],
+    ):
+        """raw_data should not duplicate column values, but still round-trip."""
+        import zlib
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            # Empty and missing mapped keys must come back exactly as given
+            sparse = dict(sample_cards[0], id="sparse-id", keywords=[])
+            del sparse["legalities"]
+            cards = sample_cards + double_faced_cards + [sparse]
+            store.insert_cards(cards)
+
+            raw = store._conn.execute(
+                "SELECT raw_data FROM cards WHERE id = ?", (sample_cards[0]["id"],)
+            ).fetchone()[0]
+            stored = json.loads(zlib.decompress(raw))
+            assert "legalities" not in stored and "name" not in stored
+
+            for card in cards:
+                assert store.get_raw_card(card["id"]) == card
+
+            store.close()
+
     def test_upsert_preserves_rowid_and_fts_sync(self, lightning_bolt: dict[str, Any]):
         """Updating a card should preserve rowid and keep FTS in sync."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -223,6 +405,106 @@ class TestCardStoreInsert:
             store.close()
 
 
+class TestCardStoreBulkInsert:
+    """Test bulk_insert_transaction."""
+
+    def test_bulk_commits_once_at_end(self, sample_cards: list[dict[str, Any]]):
+        """Batches inside the block should only become visible on exit."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / "cards.db"
+            store = CardStore(db_path)
+            reader = CardStore.open_readonly(db_path)
+
+            with store.bulk_insert_transaction():
+                store.insert_cards(sample_cards[:2])
+                store.insert_cards(sample_cards[2:])
+                assert store._conn.in_transaction
+                assert reader.get_card_count() == 0
+
+            assert not store._conn.in_transaction
+            assert reader.get_card_count() == len(sample_cards)
+            # Planner statistics are refreshed once the transaction commits
+            assert store._analyzed_count == len(sample_cards)
+
+            reader.close()
+            store.close()
+
+    def test_bulk_rolls_back_on_error(self, sample_cards: list[dict[str, Any]]):
+        """An exception escaping the block should discard every batch."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+
+            with pytest.raises(KeyError):
+                with store.bulk_insert_transaction():
+                    store.insert_cards(sample_cards)
+                    raise KeyError("parse failed")
+
+            assert store.get_card_count() == 0
+            store.close()
+
+    def test_failed_batch_rolls_back_whole_bulk(self, sample_cards: list[dict[str, Any]]):
+        """A failing batch should discard earlier batches once it escapes the block."""
+        import sqlite3
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+
+            with pytest.raises(sqlite3.IntegrityError):
+                with store.bulk_insert_transaction():
+                    store.insert_cards(sample_cards[:2])
+                    store.insert_cards([sample_cards[2], {"name": "No Id"}])
+
+            assert store.get_card_count() == 0
+            store.insert_cards(sample_cards)
+            assert store.get_card_count() == len(sample_cards)
+            store.close()
+
+    def test_defer_indexes_rebuilds_on_commit(self, sample_cards: list[dict[str, Any]]):
+        """Secondary indexes should be absent during the load and back afterwards."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            index_sql = "SELECT name FROM sqlite_master WHERE type = 'index' ORDER BY name"
+            before = [row[0] for row in store._conn.execute(index_sql)]
+            assert "idx_cmc" in before
+
+            with store.bulk_insert_transaction(defer_indexes=True):
+                during = [row[0] for row in store._conn.execute(index_sql)]
+                # Only the primary key's unique autoindex is kept for the upsert
+                assert during == ["sqlite_autoindex_cards_1"]
+                store.insert_cards(sample_cards)
+
+            assert [row[0] for row in store._conn.execute(index_sql)] == before
+            assert store._conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+            store.close()
+
+    def test_defer_indexes_restored_on_rollback(self, sample_cards: list[dict[str, Any]]):
+        """A failed load should bring the dropped indexes back with the rollback."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            index_sql = "SELECT name FROM sqlite_master WHERE type = 'index' ORDER BY name"
+            before = [row[0] for row in store._conn.execute(index_sql)]
+
+            with pytest.raises(KeyError):
+                with store.bulk_insert_transaction(defer_indexes=True):
+                    store.insert_cards(sample_cards)
+                    raise KeyError("parse failed")
+
+            assert [row[0] for row in store._conn.execute(index_sql)] == before
+            store.close()
+
+    def test_bulk_cannot_nest(self):
+        """Opening a second bulk transaction should fail."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+
+            with store.bulk_insert_transaction():
+                with pytest.raises(RuntimeError):
+                    with store.bulk_insert_transaction():
+                        pass
+
+            store.close()
+
+
 class TestCardStoreQueryByName:
     """Test name-based queries."""
 
@@ -461,6 +743,56 @@ class TestCardStoreQueryByOracleText:
 
             store.close()
 
+    def test_query_oracle_symbols_through_fts(self, sample_cards: list[dict[str, Any]]):
+        """Mana symbols and stat modifiers should match literally via the trigram index."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            store.insert_cards(sample_cards)
+
+            for needle, expected in (
+                ("{T}: Add {G}", {"Llanowar Elves"}),
+                ("{C}{C}", {"Sol Ring"}),
+                ("+1/+0", {"Shivan Dragon"}),
+                ("{B}{B}{B}", {"Dark Ritual"}),
+            ):
+                parsed = ParsedQuery(filters={"oracle_text": needle}, raw_query=f'o:"{needle}"')
+                where, _ = store._build_where_clause(parsed)
+                assert "cards_fts" in where
+                results = store.execute_query(parsed, limit=100)
+                assert {c["name"] for c in results} == expected
+
+            store.close()
+
+    def test_query_short_oracle_needle_uses_like(self, sample_cards: list[dict[str, Any]]):
+        """Needles shorter than a trigram should use a direct LIKE instead of FTS."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            store.insert_cards(sample_cards)
+
+            parsed = ParsedQuery(filters={"oracle_text": "3"}, raw_query="o:3")
+            where, _ = store._build_where_clause(parsed)
+            assert "cards_fts" not in where
+
+            results = store.execute_query(parsed, limit=100)
+            assert any(c["name"] == "Lightning Bolt" for c in results)
+
+            store.close()
+
+    def test_query_oracle_uses_fts_index(self, sample_cards: list[dict[str, Any]]):
+        """Oracle text filters should be resolved through the FTS index."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            store.insert_cards(sample_cards)
+
+            parsed = ParsedQuery(filters={"oracle_text": "flying"}, raw_query="o:flying")
+            where, params = store._build_where_clause(parsed)
+            plan = store._conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT * FROM cards WHERE {where}", params
+            ).fetchall()
+            assert any("cards_fts" in row[3] for row in plan)
+
+            store.close()
+
 
 class TestCardStoreQueryBySet:
     """Test set-based queries."""
@@ -629,6 +961,53 @@ class TestCardStoreORQueries:
 
             store.close()
 
+    def test_or_group_accumulates_repeated_filters(self, sample_cards: list[dict[str, Any]]):
+        """Repeated multi-value filters within one OR group should all apply."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            store.insert_cards(sample_cards)
+
+            parsed = QueryParser().parse("t:elf t:creature OR t:instant")
+            names = {card["name"] for card in store.execute_query(parsed, limit=100)}
+
+            assert "Llanowar Elves" in names
+            assert "Lightning Bolt" in names
+            assert "Shivan Dragon" not in names
+
+            store.close()
+
+    def test_or_groups_use_index_per_group(self, sample_cards: list[dict[str, Any]]):
+        """Each OR group should be planned (and indexed) independently."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            store.insert_cards(sample_cards)
+
+            parsed = ParsedQuery(
+                or_groups=[[{"set": "leb"}], [{"rarity": "mythic"}]],
+                has_or_clause=True,
+                raw_query="s:leb OR r:mythic",
+            )
+            where_clause, params = store._build_where_clause(parsed)
+            plan = " ".join(
+                row[3]
+                for row in store._conn.execute(
+                    f"EXPLAIN QUERY PLAN SELECT id FROM cards WHERE {where_clause}", params
+                )
+            )
+            assert "idx_set_cmc" in plan
+            assert "idx_rarity_cmc" in plan
+
+            expected = {
+                c["id"] for c in sample_cards
+                if c.get("set") == "leb" or c.get("rarity") == "mythic"
+            }
+            results = store.execute_query(parsed, limit=100)
+            assert len(results) == len(expected)
+            assert {c["id"] for c in results} == expected
+            assert store.count_matches(parsed) == len(expected)
+
+            store.close()
+
     def test_or_query_empty_groups(self):
         """Should handle empty or_groups gracefully."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -739,6 +1118,37 @@ class TestCardStoreQueryByKeyword:
 
             store.close()
 
+    def test_query_by_keyword_list_dedupes_and_negates(self, sample_cards_with_keywords: list[dict[str, Any]]):
+        """Repeated keywords count once; negated lists exclude any match."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            store.insert_cards(sample_cards_with_keywords)
+
+            def has_all(card: dict[str, Any], keywords: list[str]) -> bool:
+                return all(kw in card.get("keywords", []) for kw in keywords)
+
+            parsed = ParsedQuery(
+                filters={"keyword": ["flying", "Vigilance", "FLYING"]},
+                raw_query="kw:flying kw:vigilance",
+            )
+            results = store.execute_query(parsed, limit=100)
+            expected = {c["id"] for c in sample_cards_with_keywords if has_all(c, ["Flying", "Vigilance"])}
+            assert len(expected) >= 2
+            assert {c["id"] for c in results} == expected
+
+            parsed = ParsedQuery(
+                filters={"keyword_not": ["Flying", "Deathtouch"]},
+                raw_query="-kw:flying -kw:deathtouch",
+            )
+            results = store.execute_query(parsed, limit=100)
+            expected = {
+                c["id"] for c in sample_cards_with_keywords
+                if not {"Flying", "Deathtouch"} & set(c.get("keywords", []))
+            }
+            assert {c["id"] for c in results} == expected
+
+            store.close()
+
     def test_query_by_keyword_combined_with_type(self, sample_cards_with_keywords: list[dict[str, Any]]):
         """Should combine keyword with type filter."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -820,6 +1230,48 @@ class TestCardStoreQueryByKeyword:
             store.close()
 
 
+    def test_keyword_index_follows_updates(self, sample_cards: list[dict[str, Any]]):
+        """card_keywords should be kept in sync when a card's keywords change."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            store.insert_cards(sample_cards)
+
+            flyer = next(c for c in sample_cards if "Flying" in c.get("keywords", []))
+            updated = dict(flyer, keywords=["Trample"])
+            store.insert_card(updated)
+
+            flying = store.execute_query(ParsedQuery(filters={"keyword": ["Flying"]}), limit=100)
+            assert flyer["id"] not in {c["id"] for c in flying}
+
+            trample = store.execute_query(ParsedQuery(filters={"keyword": ["trample"]}), limit=100)
+            assert flyer["id"] in {c["id"] for c in trample}
+
+            store.close()
+
+    def test_keyword_table_backfilled_for_existing_database(self, sample_cards: list[dict[str, Any]]):
+        """Opening a database without card_keywords should populate it from keywords JSON."""
+        import sqlite3
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / "cards.db"
+            store = CardStore(db_path)
+            store.insert_cards(sample_cards)
+            store.close()
+
+            conn = sqlite3.connect(str(db_path))
+            conn.execute("DROP TABLE card_keywords")
+            conn.execute("PRAGMA user_version = 0")
+            conn.commit()
+            conn.close()
+
+            store = CardStore(db_path)
+            results = store.execute_query(ParsedQuery(filters={"keyword": ["Flying"]}), limit=100)
+            expected = [c for c in sample_cards if "Flying" in c.get("keywords", [])]
+            assert len(results) == len(expected)
+
+            store.close()
+
+
 class TestCardStoreNegationFilters:
     """Test negation filter handling (-type, -color, etc.)."""
 
@@ -1083,6 +1535,27 @@ class TestCardStoreInvertedOperators:
 
             store.close()
 
+    def test_negated_comparisons_include_missing_values(self):
+        """-pow>3 should be the complement of pow>3, including cards without power."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            cards = [
+                {"id": "1", "name": "Small", "power": "2", "type_line": "Creature"},
+                {"id": "2", "name": "Large", "power": "5", "type_line": "Creature"},
+                {"id": "3", "name": "Spell", "type_line": "Instant"},
+            ]
+            store.insert_cards(cards)
+
+            for key, value in (("power", 3), ("loyalty", 3), ("cmc", 0)):
+                positive = ParsedQuery(filters={key: {"operator": ">", "value": value}}, raw_query="")
+                negative = ParsedQuery(filters={f"{key}_not": {"operator": ">", "value": value}}, raw_query="")
+                matched = {c["id"] for c in store.execute_query(positive)}
+                excluded = {c["id"] for c in store.execute_query(negative)}
+                assert matched | excluded == {"1", "2", "3"}
+                assert not matched & excluded
+
+            store.close()
+
     def test_year_not_filter(self):
         """-year:2023 should exclude cards from 2023."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -1131,6 +1604,38 @@ class TestCardStoreInvalidFormat:
 
             store.close()
 
+    def test_impossible_queries_skip_database(self):
+        """Queries that can't match should return without running SQL."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            store.insert_cards([{"id": "1", "name": "Card 1", "set": "lea", "rarity": "rare"}])
+
+            statements: list[str] = []
+            store._conn.set_trace_callback(statements.append)
+
+            for filters in (
+                {"format": "notaformat", "rarity": "rare"},
+                {"set": "lea", "set_not": "LEA"},
+                {"block": "notablock"},
+            ):
+                parsed = ParsedQuery(filters=filters, raw_query="")
+                assert store.execute_query(parsed) == []
+                assert store.count_matches(parsed) == 0
+                assert store.get_random_card(parsed) is None
+                assert store.execute_query_with_count(parsed) == ([], 0)
+            assert statements == []
+
+            # Impossible OR groups drop out of the union
+            parsed = ParsedQuery(
+                or_groups=[[{"format": "notaformat"}], [{"rarity": "rare"}]],
+                has_or_clause=True,
+                raw_query="f:notaformat OR r:rare",
+            )
+            assert [c["id"] for c in store.execute_query(parsed)] == ["1"]
+
+            store._conn.set_trace_callback(None)
+            store.close()
+
 
 class TestCardStoreNewFilters:
     """Test new filter types: banned, produces, watermark, block."""
@@ -1350,33 +1855,405 @@ class TestCardStoreNewFilters:
             store.close()
 
 
-class TestCardStoreSecurity:
-    """Test security measures."""
+class TestCardStoreConditionsCache:
+    """Test memoization of SQL conditions per filters dict."""
 
-    def test_sql_injection_name(self, sample_cards: list[dict[str, Any]]):
-        """Name query should be safe from SQL injection."""
+    def test_repeated_filters_hit_cache(self, sample_cards: list[dict[str, Any]]):
+        """Same filters should reuse cached conditions without sharing param lists."""
         with tempfile.TemporaryDirectory() as tmpdir:
             store = CardStore(Path(tmpdir) / "cards.db")
             store.insert_cards(sample_cards)
 
-            # Attempt SQL injection
-            malicious_name = "'; DROP TABLE cards; --"
-            result = store.get_card_by_name(malicious_name)
+            filters = {"type": ["instant"], "cmc": {"operator": "<=", "value": 2}}
+            first = store._build_conditions_for_filters(filters)
+            first[1].append("mutated")
+            second = store._build_conditions_for_filters(dict(filters))
 
-            # Table should still exist
-            assert result is None
-            assert store.get_card_count() == len(sample_cards)
+            assert len(store._conditions_cache) == 1
+            assert "mutated" not in second[1]
+            assert first[0] == second[0]
+
+            # Paging through the same query returns consistent results
+            parsed = ParsedQuery(filters=filters, raw_query="t:instant cmc<=2")
+            page1 = store.execute_query(parsed, limit=1, offset=0)
+            page2 = store.execute_query(parsed, limit=1, offset=1)
+            assert page1 and page2
+            assert page1[0]["id"] != page2[0]["id"]
 
             store.close()
 
-    def test_sql_injection_search(self, sample_cards: list[dict[str, Any]]):
-        """Search queries should be safe from SQL injection."""
+    def test_cache_evicts_least_recently_used(self, monkeypatch):
+        """A full cache should drop the least recently used filters only."""
+        import src.card_store as card_store_module
+
+        monkeypatch.setattr(card_store_module, "CONDITIONS_CACHE_SIZE", 2)
         with tempfile.TemporaryDirectory() as tmpdir:
             store = CardStore(Path(tmpdir) / "cards.db")
-            store.insert_cards(sample_cards)
 
-            # Attempt SQL injection
-            malicious_query = "' OR '1'='1"
+            store._build_conditions_for_filters({"set": "a"})
+            store._build_conditions_for_filters({"set": "b"})
+            store._build_conditions_for_filters({"set": "a"})  # refresh "a"
+            store._build_conditions_for_filters({"set": "c"})  # evicts "b"
+
+            cached_sets = [dict(key)["set"] for key in store._conditions_cache]
+            assert cached_sets == ["a", "c"]
+
+            store.close()
+
+    def test_unknown_filter_keys_ignored(self):
+        """Keys without a filter handler should not produce conditions."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+
+            conditions, params = store._build_conditions_for_filters(
+                {"not_a_filter": "x", "rarity": "rare"}
+            )
+            assert conditions == ["rarity = ? COLLATE NOCASE"]
+            assert params == ["rare"]
+
+            store.close()
+
+    def test_same_shape_produces_same_sql(self):
+        """Filters differing only in values should produce identical SQL text."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+
+            bolt = ParsedQuery(
+                filters={"name_partial": "bolt", "cmc": {"operator": "<=", "value": 2}},
+                raw_query="bolt cmc<=2",
+            )
+            wrath = ParsedQuery(
+                filters={"name_partial": "wrath", "cmc": {"operator": "<=", "value": 4}},
+                raw_query="wrath cmc<=4",
+            )
+            bolt_sql, bolt_params = store._build_where_clause(bolt)
+            wrath_sql, wrath_params = store._build_where_clause(wrath)
+
+            # Only bound parameters differ, so SQLite reuses the prepared statement
+            assert bolt_sql == wrath_sql
+            assert bolt_params != wrath_params
+
+            store.close()
+
+
+class TestCardStoreCardCache:
+    """Test the LRU cache behind get_card_by_id/get_card_by_name."""
+
+    def test_repeated_lookups_hit_cache(self, sample_cards: list[dict[str, Any]]):
+        """Repeat lookups should be served from the cache as independent copies."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            store.insert_cards(sample_cards)
+
+            first = store.get_card_by_name("Lightning Bolt")
+            first["name"] = "mutated"
+            first["colors"].append("U")
+            first["legalities"]["modern"] = "banned"
+            again = store.get_card_by_name("Lightning Bolt")
+            assert again["name"] == "Lightning Bolt"
+            assert again["colors"] == ["R"]
+            assert again["legalities"]["modern"] == "legal"
+            assert store.get_card_by_name("No Such Card") is None
+            assert store.get_card_by_id(sample_cards[1]["id"])["name"] == "Counterspell"
+            assert set(store._card_cache) == {
+                ("name", "Lightning Bolt"),
+                ("name", "No Such Card"),
+                ("id", sample_cards[1]["id"]),
+            }
+
+            store.close()
+
+    def test_cache_invalidated_by_writes(self, lightning_bolt: dict[str, Any]):
+        """Inserts through this store or another connection should not serve stale cards."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / "cards.db"
+            store = CardStore(db_path)
+            assert store.get_card_by_id(lightning_bolt["id"]) is None
+
+            store.insert_card(lightning_bolt)
+            assert store.get_card_by_id(lightning_bolt["id"])["cmc"] == lightning_bolt["cmc"]
+
+            writer = CardStore(db_path)
+            writer.insert_card(dict(lightning_bolt, cmc=7))
+            writer.close()
+            assert store.get_card_by_id(lightning_bolt["id"])["cmc"] == 7
+
+            store.close()
+
+    def test_cache_evicts_least_recently_used(self, monkeypatch, sample_cards: list[dict[str, Any]]):
+        """A full cache should drop the least recently used card only."""
+        import src.card_store as card_store_module
+
+        monkeypatch.setattr(card_store_module, "CARD_CACHE_SIZE", 2)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            store.insert_cards(sample_cards)
+
+            store.get_card_by_name("Lightning Bolt")
+            store.get_card_by_name("Counterspell")
+            store.get_card_by_name("Lightning Bolt")  # refresh
+            store.get_card_by_name("Shivan Dragon")  # evicts Counterspell
+
+            assert [key[1] for key in store._card_cache] == ["Lightning Bolt", "Shivan Dragon"]
+
+            store.close()
+
+
+class TestCardStoreConditionOrder:
+    """Test cost-based ordering of AND conditions."""
+
+    def test_cheap_conditions_first(self, sample_cards: list[dict[str, Any]]):
+        """Equality checks should precede LIKE and JSON conditions, params aligned."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            store.insert_cards(sample_cards)
+
+            filters = {
+                "format": "modern",
+                "flavor_text": "fire",
+                "power": {"operator": ">=", "value": 2},
+                "set": "LEA",
+            }
+            conditions, params = store._build_conditions_for_filters(filters)
+
+            assert conditions[0] == "set_code = ? COLLATE NOCASE"
+            assert conditions[-1] == "flavor_text LIKE ?"
+            assert params == ["LEA", 2, "modern", "%fire%"]
+
+            parsed = ParsedQuery(filters={"set": "LEB", "type": "instant"}, raw_query="s:LEB t:instant")
+            results = store.execute_query(parsed)
+            assert results
+            assert all(card["set"] == "leb" and "Instant" in card["type_line"] for card in results)
+
+            store.close()
+
+
+class TestCardStoreDerivedColumns:
+    """Test typed columns and tables derived from JSON at write time."""
+
+    def test_legalities_table_tracks_updates(self, lightning_bolt: dict[str, Any]):
+        """Format filters should follow legality changes on re-import."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            card = dict(lightning_bolt, legalities={"modern": "legal", "standard": "not_legal"})
+            store.insert_card(card)
+
+            modern = ParsedQuery(filters={"format": "modern"}, raw_query="f:modern")
+            banned = ParsedQuery(filters={"banned": "modern"}, raw_query="banned:modern")
+            not_standard = ParsedQuery(filters={"format_not": "standard"}, raw_query="-f:standard")
+            assert store.count_matches(modern) == 1
+            assert store.count_matches(banned) == 0
+            assert store.count_matches(not_standard) == 1
+
+            store.insert_card(dict(card, legalities={"modern": "banned", "standard": "not_legal"}))
+            assert store.count_matches(modern) == 0
+            assert store.count_matches(banned) == 1
+
+            rows = store._conn.execute("SELECT format, status FROM card_legalities").fetchall()
+            assert [tuple(row) for row in rows] == [("modern", "banned")]
+
+            store.close()
+
+    def test_legality_filters_use_index(self, sample_cards: list[dict[str, Any]]):
+        """Format and banned filters should probe card_legalities, not parse JSON."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            store.insert_cards(sample_cards)
+
+            for key in ("format", "format_not", "banned", "banned_not"):
+                conditions, params = store._build_conditions_for_filters({key: "modern"})
+                assert "json_extract" not in conditions[0]
+                plan = store._conn.execute(
+                    f"EXPLAIN QUERY PLAN SELECT id FROM cards WHERE {' AND '.join(conditions)}",
+                    params,
+                ).fetchall()
+                assert any("idx_card_legalities_format" in row[3] for row in plan)
+
+            store.close()
+
+    def test_color_masks_match_json_colors(self, sample_cards: list[dict[str, Any]]):
+        """colors_mask/color_identity_mask should encode WUBRG as bits 0-4."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            store.insert_cards(sample_cards)
+
+            bits = {"W": 1, "U": 2, "B": 4, "R": 8, "G": 16}
+            rows = store._conn.execute(
+                "SELECT colors, colors_mask, color_identity, color_identity_mask FROM cards"
+            ).fetchall()
+            for colors, colors_mask, identity, identity_mask in rows:
+                assert colors_mask == sum(bits[c] for c in json.loads(colors))
+                assert identity_mask == sum(bits[c] for c in json.loads(identity))
+
+            store.close()
+
+    def test_color_filters_use_mask_index(self):
+        """Color filters should be IN lists over the mask indexes, not LIKE scans."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            # No rows (so no ANALYZE stats): a handful of sample cards would
+            # make a full scan the cheaper plan
+            store = CardStore(Path(tmpdir) / "cards.db")
+
+            for filters, index in (
+                ({"colors": {"operator": ":", "value": ["R"]}}, "idx_colors_mask"),
+                ({"colors": {"operator": ":", "value": []}}, "idx_colors_mask"),
+                ({"color_identity": {"operator": "<=", "value": ["W", "U"]}}, "idx_color_identity_mask"),
+                ({"colors_not": {"operator": ":", "value": ["U"]}}, "idx_colors_mask"),
+            ):
+                conditions, params = store._build_conditions_for_filters(filters)
+                assert "LIKE" not in conditions[0]
+                plan = store._conn.execute(
+                    f"EXPLAIN QUERY PLAN SELECT id FROM cards WHERE {' AND '.join(conditions)}",
+                    params,
+                ).fetchall()
+                assert any(index in row[3] for row in plan)
+
+            # Color plus mana value seeks both columns of the composite index
+            for key, index in (
+                ("colors", "idx_colors_mask_cmc"),
+                ("color_identity", "idx_color_identity_mask_cmc"),
+            ):
+                conditions, params = store._build_conditions_for_filters({
+                    key: {"operator": "<=", "value": ["W", "U"]},
+                    "cmc": {"operator": "<=", "value": 2},
+                })
+                plan = store._conn.execute(
+                    f"EXPLAIN QUERY PLAN SELECT id FROM cards WHERE {' AND '.join(conditions)}",
+                    params,
+                ).fetchall()
+                assert any(index in row[3] and "cmc<?" in row[3] for row in plan)
+
+            store.close()
+
+    def test_color_strict_subset_of_single_color_is_colorless(
+        self, sample_cards: list[dict[str, Any]]
+    ):
+        """c<r should only match colorless cards, not mono-red ones."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            store.insert_cards(sample_cards)
+
+            parsed = ParsedQuery(
+                filters={"colors": {"operator": "<", "value": ["R"]}}, raw_query="c<r"
+            )
+            results = store.execute_query(parsed, limit=100)
+            assert results
+            assert all(card["colors"] == [] for card in results)
+
+            impossible = ParsedQuery(
+                filters={"colors": {"operator": ">", "value": list("WUBRG")}}, raw_query="c>wubrg"
+            )
+            assert store.count_matches(impossible) == 0
+
+            store.close()
+
+    def test_stat_filters_use_numeric_columns(self, sample_cards: list[dict[str, Any]]):
+        """Power/toughness/loyalty/collector number ranges should use indexed columns."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            store.insert_cards(sample_cards)
+
+            for filters, index in (
+                ({"power": {"operator": ">=", "value": 4}}, "idx_power_num"),
+                ({"toughness": {"operator": "<", "value": 2}}, "idx_toughness_num"),
+                ({"loyalty": {"operator": ">", "value": 3}}, "idx_loyalty_num"),
+                ({"collector_number": {"operator": ">", "value": "100a"}}, "idx_collector_number_num"),
+            ):
+                conditions, params = store._build_conditions_for_filters(filters)
+                assert "CAST" not in conditions[0]
+                plan = store._conn.execute(
+                    f"EXPLAIN QUERY PLAN SELECT id FROM cards WHERE {' AND '.join(conditions)}",
+                    params,
+                ).fetchall()
+                assert any(f"USING INDEX {index}" in row[3] for row in plan)
+
+            parsed = ParsedQuery(filters={"power": {"operator": ">=", "value": 4}}, raw_query="pow>=4")
+            expected = {
+                c["id"] for c in sample_cards
+                if c.get("power", "").isdigit() and int(c["power"]) >= 4
+            }
+            assert {c["id"] for c in store.execute_query(parsed, limit=100)} == expected
+
+            store.close()
+
+    def test_year_and_price_filters_use_indexes(self, sample_cards: list[dict[str, Any]]):
+        """Year and price filters should compare indexed typed columns."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            store.insert_cards(sample_cards)
+
+            for filters, index in (
+                ({"year": {"operator": ">=", "value": 2020}}, "idx_released_year"),
+                ({"price": {"currency": "usd", "operator": "<", "value": 2}}, "idx_price_usd"),
+            ):
+                conditions, params = store._build_conditions_for_filters(filters)
+                assert "json_extract" not in conditions[0]
+                plan = store._conn.execute(
+                    f"EXPLAIN QUERY PLAN SELECT id FROM cards WHERE {' AND '.join(conditions)}",
+                    params,
+                ).fetchall()
+                assert any(f"USING INDEX {index}" in row[3] for row in plan)
+
+            parsed = ParsedQuery(
+                filters={"price": {"currency": "usd", "operator": "<", "value": 2}},
+                raw_query="usd<2",
+            )
+            expected = {
+                c["id"] for c in sample_cards
+                if c.get("prices", {}).get("usd") and float(c["prices"]["usd"]) < 2
+            }
+            assert {c["id"] for c in store.execute_query(parsed, limit=100)} == expected
+
+            store.close()
+
+
+    def test_format_and_price_filters_never_call_json_functions(self):
+        """Format/price filters should not parse legalities or prices JSON per row."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+
+            filters = {
+                "format": "modern",
+                "banned_not": "legacy",
+                "price": {"currency": "usd", "operator": "<", "value": 2},
+                "price_not": {"currency": "eur", "operator": ">", "value": 10},
+            }
+            conditions, params = store._build_conditions_for_filters(filters)
+            program = store._conn.execute(
+                f"EXPLAIN SELECT id FROM cards WHERE {' AND '.join(conditions)}", params
+            ).fetchall()
+            # p4 names the SQL function for Function opcodes
+            assert not any("json" in str(row[5]) for row in program)
+
+            store.close()
+
+class TestCardStoreSecurity:
+    """Test security measures."""
+
+    def test_sql_injection_name(self, sample_cards: list[dict[str, Any]]):
+        """Name query should be safe from SQL injection."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            store.insert_cards(sample_cards)
+
+            # Attempt SQL injection
+            malicious_name = "'; DROP TABLE cards; --"
+            result = store.get_card_by_name(malicious_name)
+
+            # Table should still exist
+            assert result is None
+            assert store.get_card_count() == len(sample_cards)
+
+            store.close()
+
+    def test_sql_injection_search(self, sample_cards: list[dict[str, Any]]):
+        """Search queries should be safe from SQL injection."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            store.insert_cards(sample_cards)
+
+            # Attempt SQL injection
+            malicious_query = "' OR '1'='1"
             parsed = ParsedQuery(filters={"name_partial": malicious_query}, raw_query=malicious_query)
             results = store.execute_query(parsed)
 
@@ -1385,6 +2262,37 @@ class TestCardStoreSecurity:
 
             store.close()
 
+    def test_filter_operators_are_whitelisted(self, sample_cards: list[dict[str, Any]]):
+        """Operators are interpolated into SQL, so unknown ones must never reach it."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            store.insert_cards(sample_cards)
+
+            malicious = "= 0; DROP TABLE cards; --"
+            numeric = {"operator": malicious, "value": 1}
+            for key in (
+                "cmc", "cmc_not", "power", "toughness_not", "loyalty", "year",
+                "collector_number", "collector_number_not",
+            ):
+                filters = {key: numeric}
+                conditions, params = store._build_conditions_for_filters(filters)
+                assert not any("DROP" in condition for condition in conditions)
+                store.execute_query(ParsedQuery(filters=filters, raw_query=key))
+
+            for filters in (
+                {"price": {"currency": "usd", "operator": malicious, "value": 1}},
+                {"price": {"currency": "usd) OR (1", "operator": ">", "value": 1}},
+                {"colors": {"operator": malicious, "value": ["R"]}},
+                {"mana": {"operator": malicious, "value": "{R}"}},
+            ):
+                conditions, params = store._build_conditions_for_filters(filters)
+                assert not any("DROP" in c or "OR (1" in c for c in conditions)
+                store.execute_query(ParsedQuery(filters=filters, raw_query="x"))
+
+            assert store.get_card_count() == len(sample_cards)
+
+            store.close()
+
     def test_parameterized_queries(self, sample_cards: list[dict[str, Any]]):
         """All queries should use parameterized statements."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -1442,6 +2350,46 @@ class TestCardStoreResultFormat:
 
             store.close()
 
+    def test_json_fields_decoded(self, lightning_bolt: dict[str, Any]):
+        """JSON columns should be decoded back into Python objects."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            store.insert_card(lightning_bolt)
+
+            card = store.get_card_by_id(lightning_bolt["id"])
+            assert card["colors"] == ["R"]
+            assert isinstance(card["legalities"], dict)
+            assert isinstance(card["prices"], dict)
+            assert "raw_data" not in card
+
+            store.close()
+
+    def test_column_projection(self, sample_cards: list[dict[str, Any]]):
+        """Callers can limit results to a subset of columns."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            store.insert_cards(sample_cards)
+
+            parsed = ParsedQuery(filters={"type": "instant"}, raw_query="t:instant")
+            results = store.execute_query(parsed, columns=["id", "name", "set", "colors"])
+            assert results
+            for card in results:
+                assert set(card) == {"id", "name", "set", "colors"}
+                assert isinstance(card["colors"], list)
+
+            card = store.get_random_card(parsed, columns=["name"])
+            assert card is not None and set(card) == {"name"}
+
+            with pytest.raises(ValueError):
+                store.execute_query(parsed, columns=["name; DROP TABLE cards"])
+            with pytest.raises(ValueError):
+                store.get_random_card(columns=["raw_data"])
+            # Invalid projections keep raising on repeat calls (nothing cached)
+            with pytest.raises(ValueError):
+                store.execute_query(parsed, columns=["name; DROP TABLE cards"])
+
+            store.close()
+
 
 class TestCardStoreRandomCard:
     """Test random card selection."""
@@ -1476,6 +2424,31 @@ class TestCardStoreRandomCard:
 
             store.close()
 
+    def test_get_random_card_samples_all_matches(self, sample_cards: list[dict[str, Any]]):
+        """Random picks should reach every card, filtered or not."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            assert store.get_random_card() is None
+
+            store.insert_cards(sample_cards)
+            seen = {store.get_random_card(columns=["id"])["id"] for _ in range(300)}
+            assert seen == {card["id"] for card in sample_cards}
+
+            parsed = ParsedQuery(filters={"type": "instant"}, raw_query="t:instant")
+            instants = {card["id"] for card in store.execute_query(parsed, limit=100)}
+            seen = {store.get_random_card(parsed)["id"] for _ in range(100)}
+            assert seen == instants
+
+            parsed = QueryParser().parse("t:instant OR t:dragon")
+            matches = {card["id"] for card in store.execute_query(parsed, limit=100)}
+            seen = {store.get_random_card(parsed)["id"] for _ in range(100)}
+            assert seen == matches
+
+            parsed = ParsedQuery(filters={"name_exact": "No Such Card"}, raw_query='!"No Such Card"')
+            assert store.get_random_card(parsed) is None
+
+            store.close()
+
 
 class TestCardStoreManaCost:
     """Test mana cost queries."""
@@ -1694,6 +2667,80 @@ class TestCardStorePagination:
             store.close()
 
 
+    def test_iter_execute_query_streams_results(self, sample_cards: list[dict[str, Any]]):
+        """iter_execute_query should yield the same cards as execute_query."""
+        import types
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            store.insert_cards(sample_cards)
+
+            parsed = ParsedQuery(raw_query="")
+            stream = store.iter_execute_query(parsed, limit=5, offset=1)
+            assert isinstance(stream, types.GeneratorType)
+            assert list(stream) == store.execute_query(parsed, limit=5, offset=1)
+
+            store.close()
+
+    def test_closing_stream_ends_read_transaction(self, sample_cards: list[dict[str, Any]]):
+        """A partly read stream should stop pinning the WAL once closed."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / "cards.db"
+            writer = CardStore(db_path)
+            writer.insert_cards(sample_cards)
+            reader = CardStore.open_readonly(db_path)
+
+            stream = reader.iter_execute_query(ParsedQuery(raw_query=""), limit=5)
+            next(stream)
+            writer.insert_card(dict(sample_cards[0], id="new-id"))
+            # PASSIVE never waits; it reports (busy, log frames, checkpointed frames)
+            checkpoint = "PRAGMA wal_checkpoint(PASSIVE)"
+            _, log_frames, done = writer._conn.execute(checkpoint).fetchone()
+            assert done < log_frames
+
+            stream.close()
+            _, log_frames, done = writer._conn.execute(checkpoint).fetchone()
+            assert done == log_frames
+
+            reader.close()
+            writer.close()
+
+
+class TestCardStoreQueryWithCount:
+    """Test fetching a page and the total match count together."""
+
+    def test_matches_separate_queries(self, sample_cards: list[dict[str, Any]]):
+        """Page and total should equal execute_query plus count_matches."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            store.insert_cards(sample_cards)
+
+            queries = [
+                ParsedQuery(raw_query=""),
+                ParsedQuery(filters={"type": "creature"}, raw_query="t:creature"),
+                ParsedQuery(
+                    or_groups=[[{"name_exact": "Lightning Bolt"}], [{"type": "creature"}]],
+                    has_or_clause=True,
+                    raw_query='!"Lightning Bolt" OR t:creature',
+                ),
+                ParsedQuery(filters={"name_exact": "No Such Card"}, raw_query='!"No Such Card"'),
+            ]
+            for parsed in queries:
+                expected = store.execute_query(parsed, limit=1000)
+                total_expected = store.count_matches(parsed)
+
+                # Row order without ORDER BY is up to the planner, so compare
+                # the union of all pages rather than individual pages
+                seen = []
+                for offset in range(0, total_expected + 2, 2):
+                    cards, total = store.execute_query_with_count(parsed, limit=2, offset=offset)
+                    assert total == total_expected
+                    seen.extend(cards)
+                assert sorted(seen, key=lambda c: c["id"]) == sorted(expected, key=lambda c: c["id"])
+
+            store.close()
+
+
 class TestCardStoreConcurrentAccess:
     """Test concurrent database access."""
 
@@ -1776,6 +2823,157 @@ class TestCardStoreConcurrentAccess:
             assert len(errors) == 0, f"Errors: {errors}"
 
 
+class TestCardStoreReadOnly:
+    """Test read-only store connections."""
+
+    def test_open_readonly_queries(self, sample_cards: list[dict[str, Any]]):
+        """Read-only stores should query an existing database."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / "cards.db"
+            with CardStore(db_path) as store:
+                store.insert_cards(sample_cards)
+
+            with CardStore.open_readonly(db_path) as reader:
+                assert reader.get_card_count() == len(sample_cards)
+                parsed = ParsedQuery(filters={"oracle_text": "flying"}, raw_query="o:flying")
+                assert reader.execute_query(parsed, limit=100)
+                assert reader.get_card_by_name("Lightning Bolt") is not None
+
+    def test_open_readonly_rejects_inserts(self, sample_cards: list[dict[str, Any]]):
+        """Insert methods should fail on a read-only store."""
+        import sqlite3
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / "cards.db"
+            CardStore(db_path).close()
+
+            with CardStore.open_readonly(db_path) as reader:
+                with pytest.raises(sqlite3.OperationalError):
+                    reader.insert_cards(sample_cards)
+                with pytest.raises(sqlite3.OperationalError):
+                    reader.insert_card(sample_cards[0])
+
+    def test_open_readonly_missing_database(self):
+        """Read-only open should not create a missing database."""
+        import sqlite3
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / "missing.db"
+            with pytest.raises(sqlite3.OperationalError):
+                CardStore.open_readonly(db_path)
+            assert not db_path.exists()
+
+    def test_open_readonly_rejects_old_schema(self, sample_cards: list[dict[str, Any]]):
+        """Read-only open should ask for a writable open to migrate old databases."""
+        import sqlite3
+        from src.card_store import SCHEMA_VERSION
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / "cards.db"
+            # A baseline-era database: no generated columns, old user_version
+            conn = sqlite3.connect(str(db_path))
+            conn.execute("""
+                CREATE TABLE cards (
+                    id TEXT PRIMARY KEY, oracle_id TEXT, name TEXT NOT NULL,
+                    mana_cost TEXT, cmc REAL, type_line TEXT, oracle_text TEXT,
+                    power TEXT, toughness TEXT, colors TEXT, color_identity TEXT,
+                    set_code TEXT, set_name TEXT, rarity TEXT, image_uris TEXT,
+                    legalities TEXT, prices TEXT, raw_data TEXT
+                )
+            """)
+            conn.execute("PRAGMA user_version = 3")
+            conn.commit()
+            conn.close()
+
+            with pytest.raises(sqlite3.OperationalError, match="open it writable first"):
+                CardStore.open_readonly(db_path)
+
+            # Opening writable migrates it, after which read-only works
+            with CardStore(db_path) as store:
+                store.insert_cards(sample_cards)
+            with CardStore.open_readonly(db_path) as reader:
+                assert reader._conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+                from src.query_parser import QueryParser
+                assert reader.execute_query(QueryParser().parse("c:r"), limit=100)
+
+    def test_open_readonly_connection_per_thread(self, sample_cards: list[dict[str, Any]]):
+        """Each thread should query through its own connection."""
+        import sqlite3
+        from concurrent.futures import ThreadPoolExecutor
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / "cards.db"
+            with CardStore(db_path) as store:
+                store.insert_cards(sample_cards)
+
+            reader = CardStore.open_readonly(db_path)
+            parsed = QueryParser().parse("t:instant")
+            expected = reader.count_matches(parsed)
+
+            def query(_: int) -> tuple[int, int]:
+                return id(reader._conn), reader.count_matches(parsed)
+
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                results = list(pool.map(query, range(4)))
+            assert all(count == expected for _, count in results)
+            assert len(reader._connections) > 1
+            assert reader.get_card_by_name("Lightning Bolt") is not None
+
+            connections = list(reader._connections)
+            reader.close()
+            for conn in connections:
+                with pytest.raises(sqlite3.ProgrammingError):
+                    conn.execute("SELECT 1")
+
+
+    def test_open_readonly_caches_are_thread_safe(
+        self, sample_cards: list[dict[str, Any]], monkeypatch: pytest.MonkeyPatch
+    ):
+        """Threads sharing a read-only store should not race on the LRU caches."""
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+
+        import src.card_store as card_store_module
+
+        class SlowDeleteDict(dict):
+            # Widen the window between picking the LRU key and deleting it
+            def __delitem__(self, key):
+                time.sleep(0.0005)
+                super().__delitem__(key)
+
+        monkeypatch.setattr(card_store_module, "CARD_CACHE_SIZE", 4)
+        monkeypatch.setattr(card_store_module, "CONDITIONS_CACHE_SIZE", 4)
+        cards = [
+            {**sample_cards[0], "id": f"id{i}", "name": f"Card {i}"} for i in range(32)
+        ]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / "cards.db"
+            with CardStore(db_path) as store:
+                store.insert_cards(cards)
+
+            with CardStore.open_readonly(db_path) as reader:
+                reader._card_cache = SlowDeleteDict()
+                reader._conditions_cache = SlowDeleteDict()
+
+                def lookup(worker: int) -> int:
+                    found = 0
+                    for i in range(40):
+                        # Stride through all ids so nearly every lookup misses and evicts
+                        n = (worker * 7 + i * 5) % 32
+                        found += reader.get_card_by_id(f"id{n}") is not None
+                        reader._build_conditions_for_filters(
+                            {"cmc": {"value": n, "operator": "="}}
+                        )
+                    return found
+
+                with ThreadPoolExecutor(max_workers=16) as pool:
+                    results = list(pool.map(lookup, range(16)))
+
+                assert results == [40] * 16
+                assert len(reader._card_cache) <= 4
+                assert len(reader._conditions_cache) <= 4
+
 class TestCardStoreMigration:
     """Test database schema migration."""
 
@@ -1841,6 +3039,10 @@ class TestCardStoreMigration:
             assert card.get("flavor_text") == "Test flavor"
             assert card.get("collector_number") == "123"
 
+            # Generated columns are added to the old table too
+            parsed = ParsedQuery(filters={"year": {"operator": "=", "value": 2024}}, raw_query="year=2024")
+            assert [c["id"] for c in store.execute_query(parsed)] == ["test-id"]
+
             store.close()
 
     def test_migration_preserves_existing_data(self, sample_cards: list[dict[str, Any]]):
@@ -1916,6 +3118,134 @@ class TestCardStoreMigration:
 
             store.close()
 
+    def test_current_schema_skips_migration(self, sample_cards: list[dict[str, Any]], monkeypatch):
+        """Reopening an up-to-date database should not re-run schema DDL."""
+        import sqlite3
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / "cards.db"
+            store = CardStore(db_path)
+            store.insert_cards(sample_cards)
+            store.close()
+
+            statements: list[str] = []
+            original_connect = sqlite3.connect
+
+            def tracing_connect(*args, **kwargs):
+                conn = original_connect(*args, **kwargs)
+                conn.set_trace_callback(statements.append)
+                return conn
+
+            monkeypatch.setattr(sqlite3, "connect", tracing_connect)
+            store = CardStore(db_path)
+            monkeypatch.undo()
+
+            assert not any("table_info" in s or "CREATE" in s for s in statements)
+            assert store.get_card_count() == len(sample_cards)
+            store.close()
+
+    def test_migration_rebuilds_fts_with_trigram_tokenizer(self, sample_cards: list[dict[str, Any]]):
+        """An FTS table using the old tokenizer should be rebuilt and reindexed."""
+        import sqlite3
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / "cards.db"
+            store = CardStore(db_path)
+            store.insert_cards(sample_cards)
+            store.close()
+
+            # Simulate an older database with the default unicode61 tokenizer
+            conn = sqlite3.connect(str(db_path))
+            conn.execute("DROP TABLE cards_fts")
+            conn.execute("""
+                CREATE VIRTUAL TABLE cards_fts USING fts5(
+                    id, name, oracle_text, type_line,
+                    content='cards', content_rowid='rowid'
+                )
+            """)
+            conn.commit()
+            conn.close()
+
+            store = CardStore(db_path)
+            sql = store._conn.execute(
+                "SELECT sql FROM sqlite_master WHERE name = 'cards_fts'"
+            ).fetchone()[0]
+            assert "trigram" in sql
+
+            # Substring search should work against the rebuilt index
+            parsed = ParsedQuery(filters={"oracle_text": "ounter target"}, raw_query="o:ounter")
+            results = store.execute_query(parsed, limit=100)
+            assert any(c["name"] == "Counterspell" for c in results)
+
+            store.close()
+
+    def test_migration_drops_id_from_fts_index(self, sample_cards: list[dict[str, Any]]):
+        """An FTS table that still indexes card ids should be rebuilt without them."""
+        import sqlite3
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / "cards.db"
+            store = CardStore(db_path)
+            store.insert_cards(sample_cards[:2])
+            store.close()
+
+            # Simulate an older database whose FTS index and triggers include id
+            conn = sqlite3.connect(str(db_path))
+            conn.executescript("""
+                DROP TRIGGER cards_ai;
+                DROP TABLE cards_fts;
+                CREATE VIRTUAL TABLE cards_fts USING fts5(
+                    id, name, oracle_text, type_line,
+                    content='cards', content_rowid='rowid', tokenize='trigram'
+                );
+                CREATE TRIGGER cards_ai AFTER INSERT ON cards BEGIN
+                    INSERT INTO cards_fts(rowid, id, name, oracle_text, type_line)
+                    VALUES (NEW.rowid, NEW.id, NEW.name, NEW.oracle_text, NEW.type_line);
+                END;
+                PRAGMA user_version = 0;
+            """)
+            conn.close()
+
+            store = CardStore(db_path)
+            columns = [row[1] for row in store._conn.execute("PRAGMA table_info(cards_fts)")]
+            assert columns == ["name", "oracle_text", "type_line"]
+
+            # Recreated triggers keep the index in sync for new rows
+            store.insert_cards(sample_cards[2:])
+            parsed = ParsedQuery(filters={"name_partial": "ivan drag"}, raw_query="ivan drag")
+            results = store.execute_query(parsed, limit=100)
+            assert [c["name"] for c in results] == ["Shivan Dragon"]
+            parsed = ParsedQuery(filters={"oracle_text": "ounter target"}, raw_query="o:ounter")
+            results = store.execute_query(parsed, limit=100)
+            assert any(c["name"] == "Counterspell" for c in results)
+
+            store.close()
+
+    def test_reopen_current_store_skips_fts_rebuild(
+        self, sample_cards: list[dict[str, Any]], monkeypatch: pytest.MonkeyPatch
+    ):
+        """Reopening an up-to-date store should not touch the FTS table."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / "cards.db"
+            store = CardStore(db_path)
+            store.insert_cards(sample_cards)
+            store.close()
+
+            calls = []
+            original = CardStore._create_fts_table
+            monkeypatch.setattr(
+                CardStore,
+                "_create_fts_table",
+                lambda self, cursor: calls.append(cursor) or original(self, cursor),
+            )
+
+            store = CardStore(db_path)
+            assert calls == []
+            parsed = ParsedQuery(filters={"name_partial": "bolt"}, raw_query="bolt")
+            assert [c["name"] for c in store.execute_query(parsed)] == ["Lightning Bolt"]
+
+            store.close()
+
 
 class TestDoubleFacedCards:
     """Test handling of double-faced cards (transform, modal_dfc, split, adventure)."""
@@ -2598,6 +3928,23 @@ class TestUnicodeCardNames:
 
             store.close()
 
+    def test_search_uppercase_accented_name(self, unicode_cards: list[dict[str, Any]]):
+        """Uppercase accented needles should match (LIKE only folds ASCII)."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / "cards.db"
+            store = CardStore(db_path)
+
+            store.insert_cards(unicode_cards)
+
+            from src.query_parser import QueryParser
+            parser = QueryParser()
+
+            for query, name in (("SÉANCE", "Séance"), ("MÁRTON", "Márton Stromgald")):
+                results = store.execute_query(parser.parse(query))
+                assert [card["name"] for card in results] == [name]
+
+            store.close()
+
     def test_search_middle_eastern_name(self, unicode_cards: list[dict[str, Any]]):
         """Names with â character should be searchable."""
         with tempfile.TemporaryDirectory() as tmpdir:
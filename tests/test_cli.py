@@ -1,5 +1,6 @@
 """Tests for CLI module."""
 
+import gzip
 import json
 import pytest
 import tempfile
@@ -76,6 +77,14 @@ class TestPrintProgressBar:
 
             assert "100.0%" in output
 
+    def test_progress_bar_overshoot_stays_full(self):
+        """More bytes than the total should draw a full-width bar."""
+        with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            print_progress_bar(150, 100)
+            output = mock_stdout.getvalue()
+
+            assert "[" + "█" * 40 + "]" in output
+
 
 class TestShowStatus:
     """Test show_status command."""
@@ -187,6 +196,26 @@ class TestImportData:
             db_path = tmpdir_path / "cards.db"
             assert db_path.exists()
 
+    @pytest.mark.asyncio
+    async def test_import_data_auto_detect_gzip_file(self):
+        """Should auto-detect a gzip-compressed download."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+
+            sample_cards = [
+                {"id": "789", "name": "Giant Growth", "cmc": 1, "colors": ["G"]},
+            ]
+            json_file = tmpdir_path / "all-cards.json.gz"
+            json_file.write_bytes(gzip.compress(json.dumps(sample_cards).encode()))
+
+            with patch("builtins.print"):
+                with patch("sys.stdout.write"):
+                    await import_data(tmpdir_path)
+
+            from src.card_store import CardStore
+            with CardStore(tmpdir_path / "cards.db") as store:
+                assert store.get_card_by_name("Giant Growth") is not None
+
 
 class TestDownloadData:
     """Test download_data command."""
@@ -234,6 +263,208 @@ class TestDownloadData:
                     assert any("Unknown data type" in str(c) for c in calls)
 
 
+class TestDownloadAndImport:
+    """Test importing while the bulk file downloads."""
+
+    CATALOG = {
+        "data": [
+            {
+                "type": "oracle_cards",
+                "updated_at": "2025-01-09T12:00:00.000+00:00",
+                "download_uri": "https://data.scryfall.io/oracle-cards/oracle-cards-20250109.json",
+            }
+        ]
+    }
+    DOWNLOAD_URL = "https://data.scryfall.io/oracle-cards/oracle-cards-20250109.json"
+
+    @staticmethod
+    def _bulk_file(count: int) -> bytes:
+        cards = [
+            {"id": str(i), "name": f"Card {i}", "cmc": i % 5, "colors": []} for i in range(count)
+        ]
+        lines = ",\n".join(json.dumps(card) for card in cards)
+        return f"[\n{lines}\n]\n".encode()
+
+    @pytest.mark.asyncio
+    async def test_download_and_import_streams_into_store(self):
+        """Cards should be imported and the file cached in one pass."""
+        import httpx
+        import respx
+        from src.card_store import CardStore
+        from src.cli import download_and_import
+        from src.data_manager import DataManager
+
+        content = self._bulk_file(500)
+        with respx.mock:
+            respx.get("https://api.scryfall.com/bulk-data").mock(
+                return_value=httpx.Response(200, json=self.CATALOG)
+            )
+            respx.get(self.DOWNLOAD_URL).mock(return_value=httpx.Response(200, content=content))
+
+            with tempfile.TemporaryDirectory() as tmpdir:
+                tmpdir_path = Path(tmpdir)
+                db_path = tmpdir_path / "cards.db"
+                async with DataManager(tmpdir_path) as manager:
+                    with patch("sys.stdout", new_callable=StringIO):
+                        file_path, count = await download_and_import(
+                            manager, "oracle_cards", db_path, batch_size=100
+                        )
+
+                assert count == 500
+                assert file_path.read_bytes() == content
+                with CardStore(db_path) as store:
+                    assert store.get_card_count() == 500
+
+    @pytest.mark.asyncio
+    async def test_download_and_import_without_keeping_json(self):
+        """keep_json=False should import everything and leave no JSON file."""
+        import httpx
+        import respx
+        from src.card_store import CardStore
+        from src.cli import download_and_import
+        from src.data_manager import DataManager
+
+        content = self._bulk_file(300)
+        with respx.mock:
+            respx.get("https://api.scryfall.com/bulk-data").mock(
+                return_value=httpx.Response(200, json=self.CATALOG)
+            )
+            respx.get(self.DOWNLOAD_URL).mock(return_value=httpx.Response(200, content=content))
+
+            with tempfile.TemporaryDirectory() as tmpdir:
+                tmpdir_path = Path(tmpdir)
+                db_path = tmpdir_path / "cards.db"
+                async with DataManager(tmpdir_path) as manager:
+                    with patch("sys.stdout", new_callable=StringIO):
+                        file_path, count = await download_and_import(
+                            manager, "oracle_cards", db_path, batch_size=100, keep_json=False
+                        )
+
+                    assert file_path is None
+                    assert count == 300
+                    # Metadata waits for the caller to confirm the import
+                    assert not list(tmpdir_path.glob("*.json*"))
+                    manager.update_card_count(count)
+
+                metadata = json.loads((tmpdir_path / "metadata.json").read_text())
+                assert metadata["card_count"] == 300
+                assert metadata["filename"] is None
+                with CardStore(db_path) as store:
+                    assert store.get_card_count() == 300
+
+    @pytest.mark.asyncio
+    async def test_import_failure_stops_download(self):
+        """An import that fails on its first batch should abort the download at once."""
+        import httpx
+        import orjson
+        import respx
+        from src.cli import download_and_import
+        from src.data_manager import DataManager
+
+        total_chunks = 2000
+        served = []
+
+        async def body():
+            yield b'[\n{"id": "1", "name": "Fine"},\n{"id": "2", "name": broken},\n'
+            for _ in range(total_chunks):
+                served.append(1)
+                yield b" " * 1023 + b"\n"
+
+        with respx.mock:
+            respx.get("https://api.scryfall.com/bulk-data").mock(
+                return_value=httpx.Response(200, json=self.CATALOG)
+            )
+            respx.get(self.DOWNLOAD_URL).mock(return_value=httpx.Response(200, content=body()))
+
+            with tempfile.TemporaryDirectory() as tmpdir:
+                tmpdir_path = Path(tmpdir)
+                async with DataManager(tmpdir_path, chunk_size=1024) as manager:
+                    # The import's own error surfaces, not the pipe the download hit
+                    with pytest.raises(orjson.JSONDecodeError):
+                        await download_and_import(manager, "oracle_cards", tmpdir_path / "cards.db")
+
+                assert len(served) < total_chunks // 10
+
+    @pytest.mark.asyncio
+    async def test_download_failure_rolls_back_import(self):
+        """A failed download should raise and leave the store empty."""
+        import httpx
+        import respx
+        from src.card_store import CardStore
+        from src.cli import download_and_import
+        from src.data_manager import DataManager
+
+        with respx.mock:
+            respx.get("https://api.scryfall.com/bulk-data").mock(
+                return_value=httpx.Response(200, json=self.CATALOG)
+            )
+            respx.get(self.DOWNLOAD_URL).mock(side_effect=httpx.ConnectError("reset"))
+
+            with tempfile.TemporaryDirectory() as tmpdir:
+                tmpdir_path = Path(tmpdir)
+                db_path = tmpdir_path / "cards.db"
+                async with DataManager(tmpdir_path) as manager:
+                    with pytest.raises(httpx.ConnectError):
+                        await download_and_import(manager, "oracle_cards", db_path)
+
+                with CardStore(db_path) as store:
+                    assert store.get_card_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_download_data_falls_back_to_file_import(self):
+        """download_data should retry as download-then-import if the download fails."""
+        import httpx
+        from src.card_store import CardStore
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            json_file = tmpdir_path / "cards.json"
+            json_file.write_bytes(self._bulk_file(20))
+
+            with patch("src.cli.DataManager") as MockDataManager:
+                mock_manager = AsyncMock()
+                mock_manager.get_bulk_data_info = AsyncMock(return_value=self.CATALOG["data"][0])
+                mock_manager.download_bulk_data = AsyncMock(return_value=json_file)
+                mock_manager.update_card_count = MagicMock()
+                MockDataManager.return_value = mock_manager
+
+                streaming = AsyncMock(side_effect=httpx.ReadError("connection reset"))
+                with patch("src.cli.download_and_import", streaming):
+                    with patch("builtins.print") as mock_print:
+                        await download_data(tmpdir_path, "oracle_cards", force=True)
+
+                calls = [str(c) for c in mock_print.call_args_list]
+                assert any("Streaming download failed" in c for c in calls)
+                mock_manager.update_card_count.assert_called_once_with(20)
+
+            with CardStore(tmpdir_path / "cards.db") as store:
+                assert store.get_card_count() == 20
+
+    @pytest.mark.asyncio
+    async def test_download_data_import_error_does_not_download_again(self):
+        """Import errors should propagate instead of re-downloading the data."""
+        import sqlite3
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+
+            with patch("src.cli.DataManager") as MockDataManager:
+                mock_manager = AsyncMock()
+                mock_manager.get_bulk_data_info = AsyncMock(return_value=self.CATALOG["data"][0])
+                mock_manager.download_bulk_data = AsyncMock()
+                mock_manager.update_card_count = MagicMock()
+                MockDataManager.return_value = mock_manager
+
+                streaming = AsyncMock(side_effect=sqlite3.OperationalError("disk is full"))
+                with patch("src.cli.download_and_import", streaming):
+                    with patch("builtins.print"):
+                        with pytest.raises(sqlite3.OperationalError):
+                            await download_data(tmpdir_path, "oracle_cards", force=True)
+
+                mock_manager.download_bulk_data.assert_not_called()
+                mock_manager.update_card_count.assert_not_called()
+
+
 class TestMain:
     """Test main CLI entry point."""
 
@@ -299,6 +530,47 @@ class TestMain:
                     mock_run.assert_called_once()
                     mock_run.call_args[0][0].close()  # Close unawaited coroutine
 
+    def test_main_batch_size_passed_through(self):
+        """Should pass --batch-size to import_data."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch("sys.argv", ["cli", "--data-dir", tmpdir, "import", "--batch-size", "500"]):
+                with patch("src.cli.import_data") as mock_import:
+                    with patch("src.cli.asyncio.run") as mock_run:
+                        main()
+                        mock_run.call_args[0][0].close()  # Close unawaited coroutine
+                    mock_import.assert_called_once_with(Path(tmpdir), None, 500)
+
+    def test_main_batch_size_defaults_to_import_batch_size(self):
+        """Download should default to the shared import batch size."""
+        from src.import_utils import IMPORT_BATCH_SIZE
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch("sys.argv", ["cli", "--data-dir", tmpdir, "download"]):
+                with patch("src.cli.download_data") as mock_download:
+                    with patch("src.cli.asyncio.run") as mock_run:
+                        main()
+                        mock_run.call_args[0][0].close()  # Close unawaited coroutine
+                    mock_download.assert_called_once_with(
+                        Path(tmpdir), "oracle_cards", False, IMPORT_BATCH_SIZE, True
+                    )
+
+    def test_main_download_no_keep_json(self):
+        """Should pass --no-keep-json to download_data."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch("sys.argv", ["cli", "--data-dir", tmpdir, "download", "--no-keep-json"]):
+                with patch("src.cli.download_data") as mock_download:
+                    with patch("src.cli.asyncio.run") as mock_run:
+                        main()
+                        mock_run.call_args[0][0].close()  # Close unawaited coroutine
+                    assert mock_download.call_args[0][4] is False
+
+    def test_main_rejects_non_positive_batch_size(self):
+        """Should reject a batch size below 1."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch("sys.argv", ["cli", "--data-dir", tmpdir, "import", "--batch-size", "0"]):
+                with pytest.raises(SystemExit):
+                    main()
+
     def test_main_import_with_file(self):
         """Should pass file argument to import_data."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -353,7 +625,7 @@ class TestStreamingImport:
             # Create sample JSON file with enough cards to trigger progress
             sample_cards = [
                 {"id": str(i), "name": f"Card {i}", "cmc": i % 5, "colors": []}
-                for i in range(1500)  # More than batch_size of 1000
+                for i in range(1500)  # More than the batch_size of 1000 below
             ]
             json_file = tmpdir_path / "cards.json"
             with open(json_file, "w") as f:
@@ -367,7 +639,9 @@ class TestStreamingImport:
             def progress_callback(imported: int) -> None:
                 progress_calls.append(imported)
 
-            count = import_cards_streaming(json_file, store, progress_callback=progress_callback)
+            count = import_cards_streaming(
+                json_file, store, batch_size=1000, progress_callback=progress_callback
+            )
 
             assert count == 1500
             # Should have been called at least twice (after first batch and final)
@@ -1,8 +1,10 @@
 """Tests for data manager (bulk data download) - TDD approach."""
 
+import gzip
 import json
 import pytest
 import tempfile
+import zlib
 from pathlib import Path
 from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock
@@ -10,7 +12,14 @@ from unittest.mock import AsyncMock, MagicMock
 import httpx
 import respx
 
-from src.data_manager import DataManager, DataStatus
+from src.data_manager import (
+    DOWNLOAD_CHUNK_MAX,
+    DOWNLOAD_CHUNK_MIN,
+    PROGRESS_MIN_BYTES,
+    DataManager,
+    DataStatus,
+    download_chunk_size,
+)
 
 
 # Sample bulk data catalog response
@@ -82,6 +91,40 @@ class TestDataManagerCatalog:
                 assert "download_uri" in info
                 assert "updated_at" in info
 
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_get_unknown_type_info(self):
+        """Should return None for a type missing from the catalog."""
+        respx.get("https://api.scryfall.com/bulk-data").mock(
+            return_value=httpx.Response(200, json=SAMPLE_CATALOG)
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            async with DataManager(Path(tmpdir)) as manager:
+                assert await manager.get_bulk_data_info("rulings") is None
+                assert (await manager.get_bulk_data_info("oracle_cards"))["id"] == "def456"
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_catalog_reused_within_ttl(self, monkeypatch: pytest.MonkeyPatch):
+        """Repeated lookups should share one catalog request until it expires."""
+        import src.data_manager as data_manager_module
+
+        route = respx.get("https://api.scryfall.com/bulk-data").mock(
+            return_value=httpx.Response(200, json=SAMPLE_CATALOG)
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            async with DataManager(Path(tmpdir)) as manager:
+                manager._write_metadata_atomic({"type": "all_cards", "updated_at": "old"})
+                # download_data checks staleness, then looks up the download
+                assert await manager.is_cache_stale()
+                assert await manager.get_bulk_data_info("all_cards") is not None
+                assert route.call_count == 1
+
+                monkeypatch.setattr(data_manager_module, "CATALOG_CACHE_TTL", 0.0)
+                await manager.fetch_catalog()
+                assert route.call_count == 2
+
 
 class TestDataManagerUrlValidation:
     """Test URL validation for security."""
@@ -105,6 +148,16 @@ class TestDataManagerUrlValidation:
             assert not manager.is_valid_download_url("https://scryfall.evil.com/file.json")
             assert not manager.is_valid_download_url("http://data.scryfall.io/file.json")  # HTTP
 
+    def test_reject_lookalike_hosts(self):
+        """The unparsed fast path must not accept hosts that merely start like Scryfall's."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manager = DataManager(Path(tmpdir))
+
+            assert not manager.is_valid_download_url("https://data.scryfall.io.evil.com/f.json")
+            assert not manager.is_valid_download_url("https://data.scryfall.io@evil.com/f.json")
+            assert not manager.is_valid_download_url("https://data.scryfall.io:8443/f.json")
+            assert manager.is_valid_download_url("https://data.scryfall.io")
+
     def test_reject_malformed_url(self):
         """Should reject malformed URLs."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -218,6 +271,179 @@ class TestDataManagerDownload:
                 # Progress should have been called
                 assert len(progress_calls) >= 1
 
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_download_progress_is_throttled(self):
+        """Progress should be reported per PROGRESS_MIN_BYTES, ending at the total."""
+        respx.get("https://api.scryfall.com/bulk-data").mock(
+            return_value=httpx.Response(200, json=SAMPLE_CATALOG)
+        )
+
+        sample_data = b" " * (5 * PROGRESS_MIN_BYTES + 123)
+        respx.get("https://data.scryfall.io/all-cards/all-cards-20250109.json").mock(
+            return_value=httpx.Response(
+                200,
+                content=sample_data,
+                headers={"Content-Length": str(len(sample_data))},
+            )
+        )
+
+        progress_calls = []
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            async with DataManager(Path(tmpdir)) as manager:
+                await manager.download_bulk_data(
+                    "all_cards",
+                    progress_callback=lambda downloaded, total: progress_calls.append(downloaded),
+                )
+
+        # One update per MiB rather than one per 64 KiB chunk, plus the final size
+        assert len(progress_calls) == 6
+        assert progress_calls[-1] == len(sample_data)
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_download_keeps_gzip_encoding(self):
+        """A gzip-encoded body should be stored compressed, with decoded chunks for chunk_callback."""
+        respx.get("https://api.scryfall.com/bulk-data").mock(
+            return_value=httpx.Response(200, json=SAMPLE_CATALOG)
+        )
+
+        sample_data = json.dumps([{"id": "123", "name": "Lightning Bolt"}]).encode()
+        compressed = gzip.compress(sample_data)
+        respx.get("https://data.scryfall.io/all-cards/all-cards-20250109.json").mock(
+            return_value=httpx.Response(
+                200,
+                content=compressed,
+                headers={
+                    "Content-Encoding": "gzip",
+                    "Content-Length": str(len(compressed)),
+                },
+            )
+        )
+
+        chunks = []
+
+        async def on_chunk(chunk: bytes) -> None:
+            chunks.append(chunk)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            async with DataManager(Path(tmpdir)) as manager:
+                file_path = await manager.download_bulk_data("all_cards", chunk_callback=on_chunk)
+
+                assert file_path.name == "all-cards-20250109.json.gz"
+                assert file_path.read_bytes() == compressed
+                download_request = respx.calls.last.request
+                assert download_request.headers["Accept-Encoding"] == "gzip"
+                assert b"".join(chunks) == sample_data
+                metadata = json.loads((Path(tmpdir) / "metadata.json").read_text())
+                assert metadata["filename"] == "all-cards-20250109.json.gz"
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_deferred_metadata_written_with_card_count(self):
+        """defer_metadata should keep the old metadata until update_card_count."""
+        respx.get("https://api.scryfall.com/bulk-data").mock(
+            return_value=httpx.Response(200, json=SAMPLE_CATALOG)
+        )
+        respx.get("https://data.scryfall.io/all-cards/all-cards-20250109.json").mock(
+            return_value=httpx.Response(200, content=b"[]")
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            metadata_path = Path(tmpdir) / "metadata.json"
+            async with DataManager(Path(tmpdir)) as manager:
+                manager._write_metadata_atomic({"type": "all_cards", "updated_at": "old"})
+                await manager.download_bulk_data("all_cards", defer_metadata=True)
+
+                # An import failing here would leave the data correctly stale
+                assert json.loads(metadata_path.read_text())["updated_at"] == "old"
+
+                manager.update_card_count(42)
+
+            metadata = json.loads(metadata_path.read_text())
+            assert metadata["updated_at"] == "2025-01-09T12:00:00.000+00:00"
+            assert metadata["card_count"] == 42
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_truncated_gzip_download_fails(self):
+        """A gzip body missing its trailer should fail instead of importing partial data."""
+        respx.get("https://api.scryfall.com/bulk-data").mock(
+            return_value=httpx.Response(200, json=SAMPLE_CATALOG)
+        )
+        compressed = gzip.compress(json.dumps([{"id": "1", "name": "Bolt"}]).encode())
+        respx.get("https://data.scryfall.io/all-cards/all-cards-20250109.json").mock(
+            return_value=httpx.Response(
+                200, content=compressed[:-8], headers={"Content-Encoding": "gzip"}
+            )
+        )
+
+        async def on_chunk(chunk: bytes) -> None:
+            pass
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            async with DataManager(Path(tmpdir)) as manager:
+                with pytest.raises(zlib.error, match="trailer"):
+                    await manager.download_bulk_data(
+                        "all_cards", max_retries=0, chunk_callback=on_chunk
+                    )
+
+            assert not (Path(tmpdir) / "all-cards-20250109.json.gz").exists()
+
+    @pytest.mark.asyncio
+    async def test_download_without_file_requires_chunk_callback(self):
+        """keep_file=False without a consumer would discard the download."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            async with DataManager(Path(tmpdir)) as manager:
+                with pytest.raises(ValueError, match="chunk_callback"):
+                    await manager.download_bulk_data("all_cards", keep_file=False)
+
+
+class TestDownloadChunkSize:
+    """Test download read size selection."""
+
+    def test_unknown_size_uses_minimum(self):
+        """Missing Content-Length should fall back to the minimum chunk."""
+        assert download_chunk_size(0) == DOWNLOAD_CHUNK_MIN
+
+    def test_scales_with_size(self):
+        """Mid-sized files should read about 1/1024 of the file at a time."""
+        assert download_chunk_size(256 * 1024 * 1024) == 256 * 1024
+
+    def test_capped_for_large_files(self):
+        """Multi-GB files should not exceed the maximum chunk."""
+        assert download_chunk_size(3 * 1024**3) == DOWNLOAD_CHUNK_MAX
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_fixed_chunk_size_overrides(self):
+        """A chunk_size passed to DataManager should be used for every read."""
+        respx.get("https://api.scryfall.com/bulk-data").mock(
+            return_value=httpx.Response(200, json=SAMPLE_CATALOG)
+        )
+        sample_data = b"x" * 10_000
+        respx.get("https://data.scryfall.io/all-cards/all-cards-20250109.json").mock(
+            return_value=httpx.Response(200, content=sample_data)
+        )
+
+        chunks = []
+
+        async def on_chunk(chunk: bytes) -> None:
+            chunks.append(len(chunk))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            async with DataManager(Path(tmpdir), chunk_size=4096) as manager:
+                await manager.download_bulk_data("all_cards", chunk_callback=on_chunk)
+
+        assert chunks == [4096, 4096, 1808]
+
+    def test_rejects_non_positive_chunk_size(self):
+        """chunk_size must be positive."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with pytest.raises(ValueError):
+                DataManager(Path(tmpdir), chunk_size=0)
+
 
 class TestDataManagerCache:
     """Test cache freshness checking."""
@@ -272,6 +498,84 @@ class TestDataManagerCache:
                 # Cache should be stale since server has newer data
                 assert is_stale
 
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_download_records_catalog_validators(self):
+        """Metadata should keep the catalog's ETag and Last-Modified."""
+        respx.get("https://api.scryfall.com/bulk-data").mock(
+            return_value=httpx.Response(
+                200,
+                json=SAMPLE_CATALOG,
+                headers={"ETag": '"v1"', "Last-Modified": "Thu, 09 Jan 2025 12:00:00 GMT"},
+            )
+        )
+        respx.get("https://data.scryfall.io/all-cards/all-cards-20250109.json").mock(
+            return_value=httpx.Response(200, content=b"[]")
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            async with DataManager(Path(tmpdir)) as manager:
+                await manager.download_bulk_data("all_cards")
+
+            metadata = json.loads((Path(tmpdir) / "metadata.json").read_text())
+            assert metadata["catalog_etag"] == '"v1"'
+            assert metadata["catalog_last_modified"] == "Thu, 09 Jan 2025 12:00:00 GMT"
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_not_modified_catalog_is_fresh(self):
+        """A 304 to the conditional catalog request should mean fresh data."""
+        route = respx.get("https://api.scryfall.com/bulk-data").mock(
+            return_value=httpx.Response(304)
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            metadata = {
+                "type": "all_cards",
+                "updated_at": "2025-01-09T12:00:00.000+00:00",
+                "catalog_etag": '"v1"',
+            }
+            with open(Path(tmpdir) / "metadata.json", "w") as f:
+                json.dump(metadata, f)
+
+            async with DataManager(Path(tmpdir)) as manager:
+                assert not await manager.is_cache_stale()
+
+            assert route.call_count == 1
+            assert route.calls[0].request.headers["If-None-Match"] == '"v1"'
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_modified_catalog_is_compared_once(self):
+        """A 200 to the conditional request should be compared without refetching."""
+        route = respx.get("https://api.scryfall.com/bulk-data").mock(
+            return_value=httpx.Response(200, json=SAMPLE_CATALOG, headers={"ETag": '"v2"'})
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            metadata = {
+                "type": "all_cards",
+                "updated_at": "2025-01-01T00:00:00+00:00",
+                "catalog_etag": '"v1"',
+            }
+            with open(Path(tmpdir) / "metadata.json", "w") as f:
+                json.dump(metadata, f)
+
+            async with DataManager(Path(tmpdir)) as manager:
+                assert await manager.is_cache_stale()
+
+            assert route.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_corrupt_metadata_is_stale(self):
+        """Unparseable metadata should be treated as missing."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / "metadata.json").write_bytes(b"{not json")
+
+            async with DataManager(Path(tmpdir)) as manager:
+                assert manager._load_metadata() is None
+                assert await manager.is_cache_stale()
+
     @pytest.mark.asyncio
     async def test_no_cache_is_stale(self):
         """Should report stale if no cache exists."""
@@ -281,6 +585,53 @@ class TestDataManagerCache:
                 assert is_stale
 
 
+class TestMetadataWrite:
+    """Test atomic metadata writes."""
+
+    def test_metadata_is_fsynced_before_rename(self, monkeypatch: pytest.MonkeyPatch):
+        """The temp file should be fsynced before it replaces metadata.json."""
+        import src.data_manager as data_manager
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manager = DataManager(Path(tmpdir))
+            metadata_path = Path(tmpdir) / "metadata.json"
+            synced = []
+
+            def fake_fsync(fd: int) -> None:
+                synced.append(metadata_path.exists())
+
+            monkeypatch.setattr(data_manager.os, "fsync", fake_fsync)
+            manager._write_metadata_atomic({"type": "all_cards"})
+
+            assert synced == [False]
+            assert json.loads(metadata_path.read_text()) == {"type": "all_cards"}
+
+    def test_fdopen_failure_closes_descriptor(self, monkeypatch: pytest.MonkeyPatch):
+        """A failing fdopen should not leak the temp descriptor or file."""
+        import src.data_manager as data_manager
+
+        closed = []
+        real_close = data_manager.os.close
+
+        def failing_fdopen(fd: int, mode: str):
+            raise OSError("fdopen failed")
+
+        def tracking_close(fd: int) -> None:
+            closed.append(fd)
+            real_close(fd)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manager = DataManager(Path(tmpdir))
+            monkeypatch.setattr(data_manager.os, "fdopen", failing_fdopen)
+            monkeypatch.setattr(data_manager.os, "close", tracking_close)
+
+            with pytest.raises(OSError, match="fdopen failed"):
+                manager._write_metadata_atomic({"type": "all_cards"})
+
+            assert len(closed) == 1
+            assert list(Path(tmpdir).iterdir()) == []
+
+
 class TestDataManagerPathSecurity:
     """Test path traversal prevention."""
 
@@ -304,6 +655,15 @@ class TestDataManagerPathSecurity:
             assert manager.is_safe_filename("oracle_cards.json")
             assert manager.is_safe_filename("cards.db")
 
+    def test_reject_trailing_newline_and_overlong(self):
+        """Should reject names the character class alone would let through."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manager = DataManager(Path(tmpdir))
+
+            assert not manager.is_safe_filename("cards.json\n")
+            assert not manager.is_safe_filename("a" * 256)
+            assert manager.is_safe_filename("a" * 255)
+
 
 class TestDataManagerStatus:
     """Test data status reporting."""
@@ -339,3 +699,46 @@ class TestDataManagerStatus:
 
                 assert status.card_count == 50000
                 assert status.last_updated is not None
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_get_status_reads_metadata_once(self, monkeypatch: pytest.MonkeyPatch):
+        """Status should load metadata once and fetch the catalog once."""
+        route = respx.get("https://api.scryfall.com/bulk-data").mock(
+            return_value=httpx.Response(200, json=SAMPLE_CATALOG)
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            metadata = {
+                "type": "all_cards",
+                "downloaded_at": "2025-01-09T12:00:00+00:00",
+                "updated_at": "2025-01-09T12:00:00.000+00:00",
+                "card_count": 50000,
+            }
+            with open(Path(tmpdir) / "metadata.json", "w") as f:
+                json.dump(metadata, f)
+
+            async with DataManager(Path(tmpdir)) as manager:
+                loads = []
+                real_load = manager._load_metadata
+
+                def counting_load():
+                    loads.append(1)
+                    return real_load()
+
+                monkeypatch.setattr(manager, "_load_metadata", counting_load)
+                status = await manager.get_status()
+
+                assert not status.is_stale
+                assert len(loads) == 1
+                assert route.call_count == 1
+
+    def test_is_stale_from_info(self):
+        """Staleness should compare updated_at, treating missing values as stale."""
+        metadata = {"updated_at": "2025-01-09"}
+
+        assert not DataManager._is_stale_from_info(metadata, {"updated_at": "2025-01-09"})
+        assert DataManager._is_stale_from_info(metadata, {"updated_at": "2025-01-10"})
+        assert DataManager._is_stale_from_info(metadata, {})
+        assert DataManager._is_stale_from_info(metadata, None)
+        assert DataManager._is_stale_from_info({}, {"updated_at": "2025-01-09"})
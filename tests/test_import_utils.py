@@ -1,12 +1,13 @@
 """Tests for import_utils module."""
 
+import gzip
 import json
 import tempfile
 from pathlib import Path
 
 import pytest
 
-from src.import_utils import import_cards_streaming
+from src.import_utils import ChunkPipe, import_cards_streaming
 from src.card_store import CardStore
 
 
@@ -63,7 +64,7 @@ class TestImportCardsStreaming:
 
             try:
                 count = import_cards_streaming(
-                    json_file, store, progress_callback=progress_callback
+                    json_file, store, batch_size=1000, progress_callback=progress_callback
                 )
 
                 assert count == 1500
@@ -191,3 +192,262 @@ class TestImportCardsStreaming:
             assert card is not None
 
             store.close()
+
+    def test_import_warns_on_pure_python_backend(
+        self, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+    ):
+        """Should warn when ijson falls back to its slow pure-Python parser."""
+        import ijson
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+
+            json_file = tmpdir_path / "cards.json"
+            with open(json_file, "w") as f:
+                json.dump([{"id": "1", "name": "Test", "cmc": 1, "colors": []}], f)
+
+            store = CardStore(tmpdir_path / "cards.db")
+            monkeypatch.setattr(ijson, "backend", "python")
+
+            try:
+                with caplog.at_level("WARNING", logger="src.import_utils"):
+                    assert import_cards_streaming(json_file, store) == 1
+                assert "pure-Python backend" in caplog.text
+            finally:
+                store.close()
+
+
+class TestImportCardPerLine:
+    """Test the orjson path for Scryfall's one-card-per-line layout."""
+
+    @staticmethod
+    def _write_card_per_line(path: Path, cards: list[dict]) -> None:
+        lines = ",\n".join(json.dumps(card) for card in cards)
+        path.write_text(f"[\n{lines}\n]\n")
+
+    def test_card_per_line_skips_ijson(self, monkeypatch: pytest.MonkeyPatch):
+        """Scryfall-layout files should be decoded line by line without ijson."""
+        import ijson
+
+        def fail_items(*args, **kwargs):
+            raise AssertionError("ijson should not be used for card-per-line files")
+
+        monkeypatch.setattr(ijson, "items", fail_items)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            json_file = tmpdir_path / "cards.json"
+            self._write_card_per_line(
+                json_file,
+                [
+                    {"id": str(i), "name": f"Card {i}", "cmc": 1.5, "colors": ["R"]}
+                    for i in range(250)
+                ],
+            )
+
+            store = CardStore(tmpdir_path / "cards.db")
+            progress_calls = []
+
+            try:
+                count = import_cards_streaming(
+                    json_file, store, batch_size=100, progress_callback=progress_calls.append
+                )
+
+                assert count == 250
+                assert progress_calls == [100, 200, 250]
+                card = store.get_card_by_name("Card 7")
+                assert card["cmc"] == 1.5
+                assert card["colors"] == ["R"]
+            finally:
+                store.close()
+
+    def test_gzip_file_is_decompressed(self, monkeypatch: pytest.MonkeyPatch):
+        """A .gz file should be decompressed on the fly and still take the orjson path."""
+        import ijson
+
+        def fail_items(*args, **kwargs):
+            raise AssertionError("ijson should not be used for card-per-line files")
+
+        monkeypatch.setattr(ijson, "items", fail_items)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            plain = tmpdir_path / "cards.json"
+            self._write_card_per_line(
+                plain, [{"id": str(i), "name": f"Card {i}"} for i in range(50)]
+            )
+            json_file = tmpdir_path / "cards.json.gz"
+            json_file.write_bytes(gzip.compress(plain.read_bytes()))
+
+            store = CardStore(tmpdir_path / "cards.db")
+
+            try:
+                assert import_cards_streaming(json_file, store) == 50
+                assert store.get_card_by_name("Card 49") is not None
+            finally:
+                store.close()
+
+    def test_pretty_printed_file_uses_ijson(self):
+        """Multi-line card objects should fall back to the ijson parser."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            json_file = tmpdir_path / "cards.json"
+            with open(json_file, "w") as f:
+                json.dump([{"id": "1", "name": "Test", "cmc": 1, "colors": []}], f, indent=2)
+
+            store = CardStore(tmpdir_path / "cards.db")
+
+            try:
+                assert import_cards_streaming(json_file, store) == 1
+                assert store.get_card_by_name("Test") is not None
+            finally:
+                store.close()
+
+    def test_pretty_printed_numbers_are_not_decimal(self):
+        """The ijson path should yield plain floats and ints, not Decimal."""
+        import io
+
+        from src.import_utils import _iter_ijson_cards
+
+        data = json.dumps([{"id": "1", "cmc": 2.5, "edhrec_rank": 12}], indent=2).encode()
+        with io.BufferedReader(io.BytesIO(data)) as f:
+            (card,) = list(_iter_ijson_cards(f, Path("cards.json")))
+
+        assert type(card["cmc"]) is float and card["cmc"] == 2.5
+        assert type(card["edhrec_rank"]) is int
+
+    def test_invalid_card_line_raises(self):
+        """A corrupt card line should raise instead of being skipped."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            json_file = tmpdir_path / "cards.json"
+            json_file.write_text('[\n{"id": "1", "name": "Card"},\n{"id": "2", truncated\n]\n')
+
+            store = CardStore(tmpdir_path / "cards.db")
+
+            try:
+                with pytest.raises(ValueError):
+                    import_cards_streaming(json_file, store)
+            finally:
+                store.close()
+
+    def test_invalid_card_line_leaves_store_unchanged(self):
+        """A failed import should roll back cards from earlier batches too."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            json_file = tmpdir_path / "cards.json"
+            lines = ",\n".join(
+                json.dumps({"id": str(i), "name": f"Card {i}", "cmc": 1, "colors": []})
+                for i in range(10)
+            )
+            json_file.write_text(f"[\n{lines},\n{{truncated\n]\n")
+
+            store = CardStore(tmpdir_path / "cards.db")
+
+            try:
+                with pytest.raises(ValueError):
+                    import_cards_streaming(json_file, store, batch_size=3)
+                assert store.get_card_count() == 0
+            finally:
+                store.close()
+
+    def test_insert_error_stops_parser_thread(self):
+        """A failed insert should raise and leave no parser thread running."""
+        import sqlite3
+        import threading
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            json_file = tmpdir_path / "cards.json"
+            # The first batch fails (no id); the rest would fill the queue
+            cards = [{"name": "No Id"}] + [
+                {"id": str(i), "name": f"Card {i}", "cmc": 1, "colors": []} for i in range(50)
+            ]
+            self._write_card_per_line(json_file, cards)
+
+            store = CardStore(tmpdir_path / "cards.db")
+
+            try:
+                with pytest.raises(sqlite3.IntegrityError):
+                    import_cards_streaming(json_file, store, batch_size=2)
+                assert store.get_card_count() == 0
+                assert not any(
+                    thread.name == "card-import-parser" for thread in threading.enumerate()
+                )
+            finally:
+                store.close()
+
+
+class TestChunkPipe:
+    """Test feeding an import from chunks produced on another thread."""
+
+    @staticmethod
+    def _feed_in_thread(pipe: ChunkPipe, data: bytes, chunk_size: int, error=None):
+        import threading
+
+        def produce():
+            for start in range(0, len(data), chunk_size):
+                pipe.feed(data[start:start + chunk_size])
+            if error is None:
+                pipe.finish()
+            else:
+                pipe.fail(error)
+
+        thread = threading.Thread(target=produce)
+        thread.start()
+        return thread
+
+    def test_reads_chunks_in_order(self):
+        """Reading should return the fed bytes across chunk boundaries."""
+        import io
+
+        data = bytes(range(256)) * 40
+        pipe = ChunkPipe(max_chunks=2)
+        thread = self._feed_in_thread(pipe, data, 333)
+
+        with io.BufferedReader(pipe, 100) as stream:
+            assert stream.read() == data
+        thread.join()
+
+    def test_fail_raises_in_reader(self):
+        """An error passed to fail should surface from read after the data."""
+        import io
+
+        pipe = ChunkPipe()
+        thread = self._feed_in_thread(pipe, b"partial", 4, error=ConnectionError("reset"))
+
+        with io.BufferedReader(pipe) as stream:
+            with pytest.raises(ConnectionError):
+                stream.read()
+        thread.join()
+
+    def test_feed_after_close_raises(self):
+        """A closed reader should stop the writer instead of leaving it blocked."""
+        pipe = ChunkPipe(max_chunks=1)
+        pipe.feed(b"first")
+        pipe.close()
+        with pytest.raises(BrokenPipeError):
+            pipe.feed(b"second")  # Would block forever if still queued
+        pipe.finish()
+        pipe.fail(ValueError("ignored"))
+
+    def test_import_from_pipe(self):
+        """import_cards_streaming should read a Scryfall-layout stream from a pipe."""
+        import io
+
+        cards = [{"id": str(i), "name": f"Card {i}", "cmc": 1, "colors": []} for i in range(30)]
+        lines = ",\n".join(json.dumps(card) for card in cards)
+        data = f"[\n{lines}\n]\n".encode()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CardStore(Path(tmpdir) / "cards.db")
+            pipe = ChunkPipe()
+            thread = self._feed_in_thread(pipe, data, 50)
+
+            try:
+                with io.BufferedReader(pipe, 1 << 20) as stream:
+                    assert import_cards_streaming(stream, store, batch_size=7) == 30
+                thread.join()
+                assert store.get_card_by_name("Card 29") is not None
+            finally:
+                store.close()
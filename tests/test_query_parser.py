@@ -434,6 +434,24 @@ class TestQueryParserBooleanOperators:
         assert "type" in result.filters
         assert result.has_or_clause
 
+    def test_or_group_multi_value_filters_are_lists(self):
+        """Multi-value filters inside OR groups should be lists like in filters."""
+        parser = QueryParser()
+        result = parser.parse("t:elf t:warrior OR c:red")
+
+        assert result.or_groups[0] == [{"type": ["elf"]}, {"type": ["warrior"]}]
+
+    def test_or_merged_groups(self):
+        """Each OR group should merge into one filter dict, computed once."""
+        parser = QueryParser()
+        result = parser.parse("t:elf t:warrior c:g OR r:rare")
+
+        merged = result.or_merged_groups
+        assert merged[0]["type"] == ["elf", "warrior"]
+        assert merged[0]["colors"] == {"operator": ":", "value": ["G"]}
+        assert merged[1] == {"rarity": "rare"}
+        assert result.or_merged_groups is merged
+
     def test_parse_parenthesized_or_with_outer_filter_after(self):
         """(t:elf OR t:goblin) c:green - outer filter should distribute to each OR group."""
         parser = QueryParser()
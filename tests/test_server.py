@@ -175,6 +175,26 @@ class TestServerSearchCards:
                 assert len(result["cards"]) == 2
                 assert result["total_count"] > len(result["cards"])
 
+    @pytest.mark.asyncio
+    async def test_search_cards_with_fields(self, sample_cards: list[dict[str, Any]]):
+        """Should return only the requested fields."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with ScryfallServer(Path(tmpdir)) as server:
+                server._init_db(sample_cards)
+
+                result = await server.call_tool(
+                    "search_cards", {"query": "c:red", "fields": ["name", "colors", "set"]}
+                )
+                assert result["cards"]
+                assert all(set(c) == {"name", "colors", "set"} for c in result["cards"])
+                assert all("R" in c["colors"] for c in result["cards"])
+
+                result = await server.call_tool(
+                    "search_cards", {"query": "c:red", "fields": ["raw_data"]}
+                )
+                assert "error" in result
+                assert "hint" in result
+
     @pytest.mark.asyncio
     async def test_search_cards_error_handling(self, sample_cards: list[dict[str, Any]]):
         """Should return error for invalid queries."""
@@ -522,6 +542,46 @@ class TestServerBackgroundRefresh:
             assert server._refresh_task is None
             assert cancelled or task.cancelled()
 
+    @pytest.mark.asyncio
+    async def test_refresh_import_error_does_not_download_again(
+        self, sample_cards: list[dict[str, Any]]
+    ):
+        """An import error should fail the refresh without a second download."""
+        import sqlite3
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with ScryfallServer(Path(tmpdir)) as server:
+                server._init_db(sample_cards)
+                server._data_manager.download_bulk_data = AsyncMock()
+
+                streaming = AsyncMock(side_effect=sqlite3.OperationalError("disk is full"))
+                with patch("src.server.download_and_import", streaming):
+                    await server._do_refresh()
+
+                server._data_manager.download_bulk_data.assert_not_called()
+                assert server._refresh_status == "error: disk is full"
+                assert not (Path(tmpdir) / "cards.db.refresh").exists()
+
+    @pytest.mark.asyncio
+    async def test_refresh_download_error_falls_back(self, sample_cards: list[dict[str, Any]]):
+        """A failed streamed download should be retried as download-then-import."""
+        import httpx
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            json_file = Path(tmpdir) / "all-cards.json"
+            json_file.write_bytes(json.dumps(sample_cards).encode())
+            with ScryfallServer(Path(tmpdir)) as server:
+                server._init_db(sample_cards[:1])
+                server._data_manager.download_bulk_data = AsyncMock(return_value=json_file)
+                server._data_manager.update_card_count = MagicMock()
+
+                streaming = AsyncMock(side_effect=httpx.ReadError("connection reset"))
+                with patch("src.server.download_and_import", streaming):
+                    await server._do_refresh()
+
+                assert server._refresh_status == "completed"
+                server._data_manager.update_card_count.assert_called_once_with(len(sample_cards))
+
     @pytest.mark.asyncio
     async def test_data_status_includes_refresh_status(self, sample_cards: list[dict[str, Any]]):
         """data_status should include refresh_status when not idle."""
@@ -606,9 +666,15 @@ class TestServerBackgroundRefresh:
                 initial_status = await server.call_tool("data_status", {})
                 assert initial_status["card_count"] == 0
 
+                async def fake_download(data_type, chunk_callback=None, **kwargs):
+                    # Stream the file to the importer like a real download
+                    if chunk_callback is not None:
+                        await chunk_callback(bulk_data_path.read_bytes())
+                    return bulk_data_path
+
                 # Mock the data manager to:
                 # 1. Return stale=True so refresh proceeds
-                # 2. Return our test file path for download
+                # 2. Stream our test file for download
                 with patch.object(
                     server._data_manager,
                     "is_cache_stale",
@@ -616,7 +682,7 @@ class TestServerBackgroundRefresh:
                 ), patch.object(
                     server._data_manager,
                     "download_bulk_data",
-                    new=AsyncMock(return_value=bulk_data_path)
+                    new=AsyncMock(side_effect=fake_download)
                 ):
                     # Trigger refresh
                     result = await server.call_tool("refresh_data", {})
@@ -689,3 +755,48 @@ class TestServerBackgroundRefresh:
 
                 bolt = await server.call_tool("get_card", {"name": "Lightning Bolt"})
                 assert bolt["name"] == "Lightning Bolt"
+
+    @pytest.mark.asyncio
+    async def test_refresh_streams_into_staging_database(self, sample_cards: list[dict[str, Any]]):
+        """Refresh should import while downloading and then swap the database in."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            new_cards = [
+                {"id": f"stream-{i}", "name": f"Streamed Card {i}", "cmc": 1, "colors": []}
+                for i in range(3)
+            ]
+            lines = ",\n".join(json.dumps(card) for card in new_cards)
+            content = f"[\n{lines}\n]\n".encode()
+
+            with ScryfallServer(tmpdir_path) as server:
+                server._init_db(sample_cards)
+                seen_during_download = []
+
+                async def fake_download(data_type, chunk_callback=None, **kwargs):
+                    # The live database still answers while the refresh streams
+                    bolt = await server.call_tool("get_card", {"name": "Lightning Bolt"})
+                    seen_during_download.append(bolt["name"])
+                    await chunk_callback(content)
+                    return None
+
+                download = AsyncMock(side_effect=fake_download)
+                with patch.object(
+                    server._data_manager, "is_cache_stale", new=AsyncMock(return_value=True)
+                ), patch.object(server._data_manager, "download_bulk_data", new=download):
+                    await server.call_tool("refresh_data", {})
+                    for _ in range(50):
+                        await asyncio.sleep(0.1)
+                        if server._refresh_status == "completed" or \
+                           server._refresh_status.startswith("error:"):
+                            break
+
+                    assert server._refresh_status == "completed", \
+                        f"Refresh failed with status: {server._refresh_status}"
+
+                assert download.call_count == 1
+                assert seen_during_download == ["Lightning Bolt"]
+                assert not (tmpdir_path / "cards.db.refresh").exists()
+                status = await server.call_tool("data_status", {})
+                assert status["card_count"] == len(new_cards)
+                card = await server.call_tool("get_card", {"name": "Streamed Card 2"})
+                assert card["name"] == "Streamed Card 2"